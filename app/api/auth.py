@@ -7,10 +7,9 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from app.config import get_settings
 from app.core.session_cache import set_session
-from app.infrastructure.bonita.client import (
-    BonitaAuthenticationError,
-    BonitaClient,
-)
+from app.dependencies import get_task_completion_queue
+from app.infrastructure.bonita.async_client import AsyncBonitaClient
+from app.infrastructure.bonita.client import BonitaAuthenticationError
 from app.security import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Autenticación"])
@@ -21,14 +20,14 @@ async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
 ):
     settings = get_settings()
-    client = BonitaClient(
+    client = AsyncBonitaClient(
         base_url=settings.bonita_url,
         username=form_data.username,
         password=form_data.password,
     )
 
     try:
-        client.login()
+        await client.login()
     except BonitaAuthenticationError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -36,7 +35,11 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
 
-    set_session(form_data.username, client)
+    await set_session(form_data.username, client)
+    completion_queue = get_task_completion_queue()
+    if completion_queue is not None:
+        # Los completados que esperaban una sesión del usuario pueden seguir.
+        await completion_queue.reanudar(form_data.username)
 
     access_token = create_access_token(
         form_data.username,
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response, status
+
+from ..config import get_settings
+from ..core.monitoring import register_stats_provider
+from ..core.ttl_cache import TTLCache
+
+# Los clientes pueden guardar la respuesta pero deben revalidarla siempre con
+# `If-None-Match`; `private` porque cada usuario ve sus propios datos de Bonita.
+_CACHE_CONTROL = "private, no-cache"
+
+# Cabeceras que describen el cuerpo y que `Response` vuelve a calcular.
+_BODY_HEADERS = frozenset({"content-length", "content-type"})
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedResponse:
+    etag: str
+    body: bytes
+    media_type: Optional[str]
+    headers: Dict[str, str]
+
+
+@lru_cache
+def get_response_cache() -> Optional[TTLCache[RenderedResponse]]:
+    """
+    Caché de frescura de las respuestas ya serializadas por usuario y URL.
+    Mientras una entrada está vigente no se llama a Bonita ni se vuelve a
+    serializar. Devuelve `None` si `API_RESPONSE_CACHE_TTL_SECONDS` es 0.
+    """
+    settings = get_settings()
+    if settings.api_response_cache_ttl_seconds <= 0:
+        return None
+    return TTLCache(
+        max_entries=settings.api_response_cache_max_entries,
+        ttl_seconds=settings.api_response_cache_ttl_seconds,
+    )
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Comparación débil de `If-None-Match` (RFC 9110): ignora el prefijo `W/` que
+    añade la compresión y admite listas y `*`.
+    """
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in {
+        value.removeprefix("W/") for value in candidates
+    }
+
+
+def _cache_key(request: Request, scope: str) -> Hashable:
+    query = tuple(sorted(request.query_params.multi_items()))
+    return (scope, request.url.path, query)
+
+
+async def conditional_response(
+    request: Request,
+    scope: str,
+    render: Callable[[], Awaitable[Response]],
+) -> Response:
+    """
+    Sirve una respuesta GET con `ETag` y responde 304 si coincide con
+    `If-None-Match`. `render` sólo se invoca si no hay en caché una respuesta
+    vigente para `scope` (el usuario) y la misma URL.
+    """
+    cache = get_response_cache()
+    key = _cache_key(request, scope)
+    rendered = cache.get(key) if cache is not None else None
+    if rendered is None:
+        response = await render()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        rendered = RenderedResponse(
+            etag=compute_etag(response.body),
+            body=response.body,
+            media_type=response.media_type,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name not in _BODY_HEADERS
+            },
+        )
+        if cache is not None:
+            cache.set(key, rendered)
+
+    headers = {
+        **rendered.headers,
+        "ETag": rendered.etag,
+        "Cache-Control": _CACHE_CONTROL,
+    }
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=rendered.body, media_type=rendered.media_type, headers=headers
+    )
+
+
+def invalidate_responses(scope: str) -> None:
+    """
+    Descarta las respuestas en caché de un usuario tras una operación que
+    modifica datos en Bonita, para que su siguiente consulta no quede desfasada.
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(lambda key: key[0] == scope)
+
+
+def invalidate_path_responses(path: str) -> None:
+    """
+    Descarta las respuestas en caché de `path` de todos los usuarios, para datos
+    compartidos como las definiciones de procesos.
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(lambda key: key[1] == path)
+
+
+def _response_cache_stats() -> dict:
+    cache = get_response_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+register_stats_provider("response_cache", _response_cache_stats)
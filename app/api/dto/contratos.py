@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Type
 
 from pydantic import BaseModel, ConfigDict, Field, RootModel
 
@@ -11,7 +12,11 @@ from ...domain.contratos.entities import (
     ContractProcess,
     ContractTask,
     StartProcessResult,
+    TaskAssignment,
+    TaskCompletion,
 )
+from ...domain.contratos.importacion import ImportJobSummary, ImportRunReport
+from ...domain.contratos.operaciones import TaskOperation
 
 
 class ContractProcessDTO(BaseModel):
@@ -46,6 +51,10 @@ class ContractTaskDTO(BaseModel):
     display_name: str = Field(alias="displayName")
     state: str
     assigned_id: Optional[str] = Field(default=None, alias="assignedId")
+    last_update_date: Optional[str] = Field(default=None, alias="lastUpdateDate")
+    case_id: Optional[str] = Field(default=None, alias="caseId")
+    process_id: Optional[str] = Field(default=None, alias="processId")
+    due_date: Optional[str] = Field(default=None, alias="dueDate")
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -64,6 +73,35 @@ class CompleteTaskPayloadDTO(BaseModel):
     )
 
 
+class BulkAssignTaskItemDTO(BaseModel):
+    task_id: str
+    user_id: str = Field(..., description="Identificador del usuario que reclama la tarea")
+
+
+class BulkAssignTasksPayloadDTO(BaseModel):
+    items: List[BulkAssignTaskItemDTO] = Field(..., min_length=1, max_length=500)
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=50,
+        description="Tareas procesadas en paralelo (por defecto BONITA_BULK_CONCURRENCY)",
+    )
+
+
+class BulkCompleteTaskItemDTO(CompleteTaskPayloadDTO):
+    task_id: str
+
+
+class BulkCompleteTasksPayloadDTO(BaseModel):
+    items: List[BulkCompleteTaskItemDTO] = Field(..., min_length=1, max_length=500)
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=50,
+        description="Tareas procesadas en paralelo (por defecto BONITA_BULK_CONCURRENCY)",
+    )
+
+
 class ContractCaseDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -91,6 +129,72 @@ class ContractCaseWithVariablesDTO(BaseModel):
     variables: List[ContractCaseVariableDTO] = Field(default_factory=list)
 
 
+class CaseBatchRequestDTO(BaseModel):
+    case_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Identificadores de los casos a consultar (los duplicados se ignoran)",
+    )
+    include_variables: bool = Field(
+        default=True, description="Incluir las variables de cada caso"
+    )
+
+
+class BonitaErrorDTO(BaseModel):
+    status_code: int = Field(alias="statusCode")
+    message: str
+    details: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BulkTaskResultDTO(BaseModel):
+    task_id: str = Field(alias="taskId")
+    ok: bool
+    elapsed_ms: float = Field(default=0.0, alias="elapsedMs")
+    error: Optional[BonitaErrorDTO] = None
+
+
+class CaseBatchItemDTO(BaseModel):
+    case_id: str = Field(alias="caseId")
+    result: Optional[ContractCaseWithVariablesDTO] = None
+    error: Optional[BonitaErrorDTO] = None
+
+
+class CaseBatchResponseDTO(BaseModel):
+    items: List[CaseBatchItemDTO] = Field(default_factory=list)
+    succeeded: int = 0
+    failed: int = 0
+
+
+class BulkStartReportDTO(BaseModel):
+    job_id: str = Field(alias="jobId")
+    process_id: str = Field(alias="processId")
+    received: int
+    started: int
+    skipped: int
+    failed: int
+    case_ids: List[str] = Field(default_factory=list, alias="caseIds")
+
+
+class ImportJobSummaryDTO(BaseModel):
+    job_id: str = Field(alias="jobId")
+    process_id: str = Field(alias="processId")
+    succeeded: int
+    failed: int
+    case_ids: List[str] = Field(default_factory=list, alias="caseIds")
+
+
+class TaskOperationDTO(BaseModel):
+    operation_id: str = Field(alias="operationId")
+    kind: str
+    task_id: str = Field(alias="taskId")
+    status: str = Field(description="pending, running, succeeded o failed")
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime = Field(alias="createdAt")
+    updated_at: datetime = Field(alias="updatedAt")
+
+
 def to_contract_process_dto(entity: ContractProcess) -> ContractProcessDTO:
     return ContractProcessDTO.model_validate(
         {
@@ -121,6 +225,10 @@ def to_contract_task_dto(entity: ContractTask) -> ContractTaskDTO:
             "displayName": entity.display_name,
             "state": entity.state,
             "assignedId": entity.assigned_id,
+            "lastUpdateDate": entity.last_update_date,
+            "caseId": entity.case_id,
+            "processId": entity.process_id,
+            "dueDate": entity.due_date,
             "metadata": entity.metadata,
         }
     )
@@ -165,3 +273,175 @@ def to_contract_case_with_variables_dto(
     )
 
 
+# Equivalentes de los `to_*_dto` que construyen directamente el JSON con los alias
+# camelCase, sin volver a validar entidades que ya vienen tipadas del dominio. El
+# orden de las claves coincide con el de los DTO para que la salida sea idéntica.
+
+
+def to_contract_process_payload(entity: ContractProcess) -> Dict[str, Any]:
+    return {
+        "id": entity.id,
+        "name": entity.name,
+        "displayName": entity.display_name,
+        "version": entity.version,
+        "metadata": entity.metadata,
+    }
+
+
+def to_contract_task_payload(entity: ContractTask) -> Dict[str, Any]:
+    return {
+        "id": entity.id,
+        "name": entity.name,
+        "displayName": entity.display_name,
+        "state": entity.state,
+        "assignedId": entity.assigned_id,
+        "lastUpdateDate": entity.last_update_date,
+        "caseId": entity.case_id,
+        "processId": entity.process_id,
+        "dueDate": entity.due_date,
+        "metadata": entity.metadata,
+    }
+
+
+def to_contract_case_payload(entity: ContractCase) -> Dict[str, Any]:
+    return {
+        "id": entity.id,
+        "processDefinitionId": entity.process_definition_id,
+        "state": entity.state,
+        "startedBy": entity.started_by,
+        "metadata": entity.metadata,
+    }
+
+
+def to_contract_case_variable_payload(entity: ContractCaseVariable) -> Dict[str, Any]:
+    return {
+        "name": entity.name,
+        "value": entity.value,
+        "id": entity.id,
+        "caseId": entity.case_id,
+        "metadata": entity.metadata,
+    }
+
+
+def to_contract_case_with_variables_payload(
+    entity: ContractCaseWithVariables,
+) -> Dict[str, Any]:
+    return {
+        "case": to_contract_case_payload(entity.case),
+        "variables": [
+            to_contract_case_variable_payload(variable) for variable in entity.variables
+        ],
+    }
+
+
+def _field_aliases(*models: Type[BaseModel]) -> FrozenSet[str]:
+    return frozenset(
+        field.alias or name
+        for model in models
+        for name, field in model.model_fields.items()
+    )
+
+
+# Campos admitidos en `fields=`. En el detalle de caso la proyección se aplica
+# tanto al caso como a cada variable.
+CONTRACT_PROCESS_FIELDS = _field_aliases(ContractProcessDTO)
+CONTRACT_TASK_FIELDS = _field_aliases(ContractTaskDTO)
+CONTRACT_CASE_FIELDS = _field_aliases(ContractCaseDTO, ContractCaseVariableDTO)
+
+
+def parse_fields(
+    raw: Optional[str], allowed: FrozenSet[str]
+) -> Optional[FrozenSet[str]]:
+    """
+    Interpreta `fields=id,displayName,...` (alias camelCase separados por comas).
+    Devuelve `None` si no se pidió proyección y lanza `ValueError` si algún campo
+    no existe.
+    """
+    if raw is None:
+        return None
+    fields = frozenset(name.strip() for name in raw.split(",") if name.strip())
+    if not fields:
+        return None
+    unknown = fields - allowed
+    if unknown:
+        raise ValueError(
+            f"Campos desconocidos: {', '.join(sorted(unknown))}. "
+            f"Disponibles: {', '.join(sorted(allowed))}."
+        )
+    return fields
+
+
+def project_payload(
+    payload: Dict[str, Any], fields: Optional[FrozenSet[str]]
+) -> Dict[str, Any]:
+    if fields is None:
+        return payload
+    return {key: value for key, value in payload.items() if key in fields}
+
+
+def project_case_with_variables_payload(
+    payload: Dict[str, Any], fields: Optional[FrozenSet[str]]
+) -> Dict[str, Any]:
+    if fields is None:
+        return payload
+    return {
+        "case": project_payload(payload["case"], fields),
+        "variables": [
+            project_payload(variable, fields) for variable in payload["variables"]
+        ],
+    }
+
+
+def to_task_assignment(item: BulkAssignTaskItemDTO) -> TaskAssignment:
+    return TaskAssignment(task_id=item.task_id, user_id=item.user_id)
+
+
+def to_task_completion(item: BulkCompleteTaskItemDTO) -> TaskCompletion:
+    return TaskCompletion(
+        task_id=item.task_id,
+        contract_inputs=item.contract_inputs or None,
+        variables=item.variables or None,
+    )
+
+
+def to_bulk_start_report_dto(
+    report: ImportRunReport, summary: ImportJobSummary
+) -> BulkStartReportDTO:
+    return BulkStartReportDTO.model_validate(
+        {
+            "jobId": report.job_id,
+            "processId": report.process_id,
+            "received": report.received,
+            "started": report.started,
+            "skipped": report.skipped,
+            "failed": report.failed,
+            "caseIds": summary.case_ids,
+        }
+    )
+
+
+def to_import_job_summary_dto(summary: ImportJobSummary) -> ImportJobSummaryDTO:
+    return ImportJobSummaryDTO.model_validate(
+        {
+            "jobId": summary.job_id,
+            "processId": summary.process_id,
+            "succeeded": summary.succeeded,
+            "failed": summary.failed,
+            "caseIds": summary.case_ids,
+        }
+    )
+
+
+def to_task_operation_dto(operation: TaskOperation) -> TaskOperationDTO:
+    return TaskOperationDTO.model_validate(
+        {
+            "operationId": operation.operation_id,
+            "kind": operation.kind,
+            "taskId": operation.task_id,
+            "status": operation.status,
+            "attempts": operation.attempts,
+            "error": operation.error,
+            "createdAt": datetime.fromtimestamp(operation.created_at, timezone.utc),
+            "updatedAt": datetime.fromtimestamp(operation.updated_at, timezone.utc),
+        }
+    )
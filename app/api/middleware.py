@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import time
+import zlib
+from typing import FrozenSet, Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+from ..core.metrics import histogram
+from ..core.tracing import parse_traceparent, start_span
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él sólo se ofrece gzip.
+    brotli = None
+
+REQUEST_LATENCY = histogram(
+    "http_request_duration_seconds",
+    "Duración de las peticiones HTTP atendidas por la API, por ruta y código.",
+    ("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide cada petición hasta que termina de enviarse la
+    respuesta (incluidas las de streaming). Se etiqueta con la plantilla de la
+    ruta (`/api/bonita/tasks/{task_id}/assign`) y no con la URL concreta.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
+
+
+class TracingMiddleware:
+    """
+    Abre el tramo raíz de cada petición, continuando la traza recibida en la
+    cabecera W3C `traceparent` si la hay, y devuelve su identificador en
+    `X-Trace-Id`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope["method"]
+        with start_span(
+            f"{method} {scope['path']}",
+            kind="server",
+            parent=parent,
+            attributes={"http.method": method, "http.target": scope["path"]},
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-trace-id", span.trace_id.encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        ...
+
+    def finish(self) -> bytes:
+        ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int = 6) -> None:
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int = 4) -> None:
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush()
+
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+
+def _accepted_encodings(header: str) -> FrozenSet[str]:
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name)
+    return frozenset(accepted)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Elige la codificación para la cabecera `Accept-Encoding` recibida: brotli si
+    el cliente la acepta y el paquete está instalado, si no gzip.
+    """
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _new_compressor(encoding: str) -> _Compressor:
+    return _BrotliCompressor() if encoding == "br" else _GzipCompressor()
+
+
+class CompressionMiddleware:
+    """
+    Comprime con brotli o gzip las respuestas de al menos
+    `API_COMPRESSION_MIN_BYTES`. Las respuestas en streaming (NDJSON) se
+    comprimen por fragmentos, vaciando el compresor en cada uno para que el
+    cliente siga recibiendo las líneas según se generan. Un `ETag` fuerte pasa a
+    débil, porque el cuerpo transmitido ya no es idéntico byte a byte.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        settings = get_settings()
+        if scope["type"] != "http" or not settings.api_compression_enabled:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        minimum_size = settings.api_compression_min_bytes
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                headers = Headers(raw=message.get("headers", []))
+                passthrough = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith("text/event-stream")
+                    or message["status"] in (204, 304)
+                )
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                pending, start = start, None
+                headers = MutableHeaders(raw=pending.setdefault("headers", []))
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < minimum_size:
+                    passthrough = True
+                    await send(pending)
+                    await send(message)
+                    return
+                compressor = _new_compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if not more_body:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(pending)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                await send(pending)
+
+            assert compressor is not None
+            if more_body:
+                chunk = compressor.compress(body) + compressor.flush()
+            else:
+                chunk = compressor.compress(body) + compressor.finish()
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,59 +1,259 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+import json
+import logging
+import math
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from ...dependencies import get_contratos_service
-from ...domain.contratos.services import ContratosService
-from ...infrastructure.bonita.client import BonitaClientError
-from ...security import get_current_user
+from ...config import get_settings
+from ...core.record_streams import iter_csv_records, iter_jsonl_records
+from ...core.tracing import start_span
+from ...dependencies import (
+    get_bonita_client,
+    get_contratos_service,
+    get_contratos_service_for,
+    get_importacion_service,
+    get_task_completion_queue,
+    get_task_inbox_hub,
+    get_task_index_registry,
+)
+from ...domain.contratos.bandeja import (
+    CHANGES_EVENT,
+    ERROR_EVENT,
+    TaskFetcher,
+    TaskInboxEvent,
+)
+from ...domain.contratos.entities import (
+    ContractCaseWithVariables,
+    ContractTask,
+    TaskCompletion,
+    TaskOperationResult,
+)
+from ...domain.contratos.importacion import (
+    ImportacionMasivaService,
+    ImportJobConflictError,
+)
+from ...domain.contratos.indice import (
+    DEFAULT_TASK_SORT,
+    TaskQuery,
+    parse_task_sort,
+)
+from ...domain.contratos.operaciones import TaskOperation
+from ...domain.contratos.services import AsyncContratosService
+from ...infrastructure.bonita.caches import get_process_cache
+from ...infrastructure.bonita.client import BonitaClientError, is_bonita_session_error
+from ...security import get_admin_user, get_current_user, get_token_expiry
+from ..conditional import (
+    conditional_response,
+    invalidate_path_responses,
+    invalidate_responses,
+)
 from ..dto.contratos import (
+    CONTRACT_CASE_FIELDS,
+    CONTRACT_PROCESS_FIELDS,
+    CONTRACT_TASK_FIELDS,
     AssignTaskPayloadDTO,
+    BonitaErrorDTO,
+    BulkStartReportDTO,
+    BulkAssignTasksPayloadDTO,
+    BulkCompleteTasksPayloadDTO,
+    BulkTaskResultDTO,
+    CaseBatchItemDTO,
+    CaseBatchRequestDTO,
+    CaseBatchResponseDTO,
     CompleteTaskPayloadDTO,
     ContractCaseWithVariablesDTO,
     ContractProcessDTO,
     ContractTaskDTO,
+    ImportJobSummaryDTO,
     StartProcessPayloadDTO,
     StartProcessResponseDTO,
+    TaskOperationDTO,
+    to_bulk_start_report_dto,
     to_contract_case_with_variables_dto,
+    to_contract_case_with_variables_payload,
     to_contract_process_dto,
+    to_contract_process_payload,
     to_contract_task_dto,
+    to_contract_task_payload,
+    to_import_job_summary_dto,
     to_start_process_response_dto,
+    to_task_operation_dto,
+    to_task_assignment,
+    parse_fields,
+    project_case_with_variables_payload,
+    project_payload,
+    to_task_completion,
 )
+from ..serialization import FastJSONResponse, dumps
+from ..task_sync import sync_tasks
+
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bonita", tags=["Bonita"])
 
+_NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_SSE_MEDIA_TYPE = "text/event-stream"
+_TOKEN_EXPIRED_ERROR = {
+    "statusCode": status.HTTP_401_UNAUTHORIZED,
+    "message": "El token ha expirado. Por favor, autentícate nuevamente.",
+    "details": None,
+}
+
+
+def _bonita_error_status(exc: BonitaClientError) -> int:
+    raw_status = exc.details.get("status_code") if exc.details else None
+    if isinstance(raw_status, int) and 100 <= raw_status < 600:
+        return raw_status
+    return status.HTTP_502_BAD_GATEWAY
+
 
 def _handle_bonita_error(exc: BonitaClientError) -> None:
     detail = {"message": str(exc)}
-    status_code = status.HTTP_502_BAD_GATEWAY
     if hasattr(exc, "details") and exc.details:
         detail["details"] = exc.details
-        raw_status = exc.details.get("status_code")
-        if isinstance(raw_status, int) and 100 <= raw_status < 600:
-            status_code = raw_status
-    raise HTTPException(status_code=status_code, detail=detail) from exc
+    headers = None
+    retry_after = exc.details.get("retry_after_seconds") if exc.details else None
+    if retry_after is not None:
+        headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+    raise HTTPException(
+        status_code=_bonita_error_status(exc), detail=detail, headers=headers
+    ) from exc
+
+
+_FIELDS_DESCRIPTION = (
+    "Campos a devolver, separados por comas y con su alias (p.ej. id,displayName). "
+    "Si no incluye metadata, tampoco se conserva el JSON original de Bonita."
+)
+_INCLUDE_METADATA_DESCRIPTION = "Si es false, `metadata` se devuelve vacío"
+
+
+def _parse_fields(
+    raw: Optional[str], allowed: FrozenSet[str]
+) -> Optional[FrozenSet[str]]:
+    try:
+        return parse_fields(raw, allowed)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+
+
+def _dto_response(
+    content: Any, headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    """
+    Serializa los DTO como lo haría `response_model` (alias incluidos) para poder
+    calcular su `ETag` antes de responder.
+    """
+    return JSONResponse(jsonable_encoder(content, by_alias=True), headers=headers)
+
+
+def _notify_changes(scope: str) -> None:
+    """
+    Tras modificar datos en Bonita, descarta las respuestas en caché del usuario,
+    adelanta la consulta de sus bandejas de tareas abiertas y marca su índice
+    local para refrescarlo.
+    """
+    invalidate_responses(scope)
+    get_task_inbox_hub().refresh(scope)
+    registry = get_task_index_registry()
+    if registry is not None:
+        registry.mark_stale(scope)
+
+
+def _forget_completed_task(scope: str, task_id: str) -> None:
+    registry = get_task_index_registry()
+    if registry is not None:
+        registry.forget_task(scope, task_id)
+
+
+def _to_bonita_error_dto(exc: BonitaClientError) -> BonitaErrorDTO:
+    return BonitaErrorDTO.model_validate(
+        {
+            "statusCode": _bonita_error_status(exc),
+            "message": str(exc),
+            "details": exc.details,
+        }
+    )
 
 
 @router.get("/processes", response_model=List[ContractProcessDTO])
 async def list_processes(
+    request: Request,
     page: int = Query(default=0, ge=0),
     count: int = Query(default=10, ge=1, le=100),
     sort: Optional[str] = Query(
         default=None, description="Formato esperado: campo ASC|DESC"
     ),
+    fields: Optional[str] = Query(default=None, description=_FIELDS_DESCRIPTION),
+    include_metadata: bool = Query(
+        default=True, description=_INCLUDE_METADATA_DESCRIPTION
+    ),
     current_user: str = Depends(get_current_user),
-    service: ContratosService = Depends(get_contratos_service),
-) -> List[ContractProcessDTO]:
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> Response:
+    projection = _parse_fields(fields, CONTRACT_PROCESS_FIELDS)
+    if projection is not None and "metadata" not in projection:
+        include_metadata = False
+
+    async def render() -> Response:
+        processes = await service.listar_procesos(
+            page=page, count=count, sort=sort, include_metadata=include_metadata
+        )
+        with start_span("dto.to_contract_process_dto"):
+            if projection is not None or get_settings().api_fast_serialization:
+                return FastJSONResponse(
+                    [
+                        project_payload(to_contract_process_payload(proc), projection)
+                        for proc in processes
+                    ]
+                )
+            return _dto_response([to_contract_process_dto(proc) for proc in processes])
+
     try:
-        processes = service.listar_procesos(page=page, count=count, sort=sort)
-        return [to_contract_process_dto(proc) for proc in processes]
+        return await conditional_response(request, current_user, render)
     except BonitaClientError as exc:
         _handle_bonita_error(exc)
 
 
+@router.post(
+    "/processes/cache/invalidate",
+    response_class=Response,
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def invalidate_processes_cache(
+    request: Request,
+    current_user: str = Depends(get_admin_user),
+) -> Response:
+    """
+    Vacía la caché de definiciones de procesos y las respuestas de
+    `GET /processes` de todos los usuarios; pensado para invocarse tras desplegar
+    o actualizar procesos en Bonita. Sólo para los usuarios de `ADMIN_USERS`.
+    """
+    cache = get_process_cache()
+    if cache is not None:
+        cache.invalidate()
+    invalidate_path_responses(request.app.url_path_for("list_processes"))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.post(
     "/processes/{process_id}/start",
     response_model=StartProcessResponseDTO,
@@ -63,20 +263,80 @@ async def start_process_instance(
     process_id: str,
     payload: StartProcessPayloadDTO,
     current_user: str = Depends(get_current_user),
-    service: ContratosService = Depends(get_contratos_service),
+    service: AsyncContratosService = Depends(get_contratos_service),
 ) -> StartProcessResponseDTO:
     try:
         contract_inputs = payload.root or None
-        response = service.iniciar_proceso(
+        response = await service.iniciar_proceso(
             process_id=process_id, contract_inputs=contract_inputs
         )
+        _notify_changes(current_user)
         return to_start_process_response_dto(response)
     except BonitaClientError as exc:
         _handle_bonita_error(exc)
 
 
+@router.post("/processes/{process_id}/start:bulk", response_model=BulkStartReportDTO)
+async def start_process_instances_bulk(
+    process_id: str,
+    request: Request,
+    job_id: Optional[str] = Query(
+        default=None,
+        max_length=100,
+        description="Identificador de la importación; repetirlo reanuda una carga interrumpida",
+    ),
+    input_format: Optional[str] = Query(
+        default=None,
+        alias="format",
+        pattern="^(jsonl|csv)$",
+        description="Formato del cuerpo; por defecto se deduce del Content-Type",
+    ),
+    current_user: str = Depends(get_current_user),
+    importacion: ImportacionMasivaService = Depends(get_importacion_service),
+) -> BulkStartReportDTO:
+    """
+    Inicia una instancia del proceso por cada registro del cuerpo (JSONL, o CSV con
+    cabecera). El cuerpo se procesa en streaming y cada línea queda registrada, de
+    modo que reenviar el mismo fichero con el mismo `job_id` sólo inicia las líneas
+    que no se completaron. Mientras una carga con ese `job_id` sigue en curso se
+    responde 409.
+    """
+    job_id = job_id or uuid.uuid4().hex
+    content_type = request.headers.get("content-type", "")
+    if input_format is None:
+        input_format = "csv" if content_type.startswith("text/csv") else "jsonl"
+    parse = iter_csv_records if input_format == "csv" else iter_jsonl_records
+
+    try:
+        report = await importacion.importar(
+            job_id, process_id, current_user, parse(request.stream())
+        )
+    except ImportJobConflictError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    finally:
+        _notify_changes(current_user)
+    summary = await importacion.obtener_resumen(job_id)
+    return to_bulk_start_report_dto(report, summary)
+
+
+@router.get("/processes/imports/{job_id}", response_model=ImportJobSummaryDTO)
+async def get_import_job(
+    job_id: str,
+    current_user: str = Depends(get_current_user),
+    importacion: ImportacionMasivaService = Depends(get_importacion_service),
+) -> ImportJobSummaryDTO:
+    summary = await importacion.obtener_resumen(job_id)
+    if summary is None or summary.owner != current_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Importación no encontrada.",
+        )
+    return to_import_job_summary_dto(summary)
+
+
 @router.get("/tasks", response_model=List[ContractTaskDTO])
 async def list_tasks(
+    request: Request,
     state: Optional[str] = Query(default="ready"),
     page: int = Query(default=0, ge=0),
     count: int = Query(default=10, ge=1, le=100),
@@ -86,21 +346,308 @@ async def list_tasks(
         default=None,
         description="Formato: campo ASC|DESC",
     ),
+    fields: Optional[str] = Query(default=None, description=_FIELDS_DESCRIPTION),
+    include_metadata: bool = Query(
+        default=True, description=_INCLUDE_METADATA_DESCRIPTION
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        max_length=64,
+        description=(
+            "Token `X-Sync-Token` de una respuesta anterior: sólo se devuelven las "
+            "tareas añadidas o modificadas desde entonces y en `X-Sync-Removed` "
+            "los ids que ya no aparecen"
+        ),
+    ),
     current_user: str = Depends(get_current_user),
-    service: ContratosService = Depends(get_contratos_service),
-) -> List[ContractTaskDTO]:
-    try:
-        tasks = service.listar_tareas(
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> Response:
+    projection = _parse_fields(fields, CONTRACT_TASK_FIELDS)
+    if projection is not None and "metadata" not in projection:
+        include_metadata = False
+    # Un token sólo es válido para la misma consulta y la misma forma de las tareas.
+    query = (
+        state,
+        page,
+        count,
+        user_id,
+        process_id,
+        sort,
+        include_metadata,
+        tuple(sorted(projection)) if projection is not None else None,
+    )
+
+    async def render() -> Response:
+        tasks = await service.listar_tareas(
             state=state,
             page=page,
             count=count,
             user_id=user_id,
             process_id=process_id,
             sort=sort,
+            include_metadata=include_metadata,
+        )
+        sync = sync_tasks(current_user, query, since, list(tasks))
+        with start_span("dto.to_contract_task_dto"):
+            if projection is not None or get_settings().api_fast_serialization:
+                return FastJSONResponse(
+                    [
+                        project_payload(to_contract_task_payload(task), projection)
+                        for task in sync.tasks
+                    ],
+                    headers=sync.headers,
+                )
+            return _dto_response(
+                [to_contract_task_dto(task) for task in sync.tasks], sync.headers
+            )
+
+    try:
+        return await conditional_response(request, current_user, render)
+    except BonitaClientError as exc:
+        _handle_bonita_error(exc)
+
+
+def _task_ndjson_line(task: ContractTask, fast: bool) -> bytes:
+    if fast:
+        return dumps(to_contract_task_payload(task)) + b"\n"
+    return to_contract_task_dto(task).model_dump_json(by_alias=True).encode() + b"\n"
+
+
+async def _stream_tasks(
+    first: ContractTask, rest: AsyncIterator[ContractTask]
+) -> AsyncIterator[bytes]:
+    fast = get_settings().api_fast_serialization
+    yield _task_ndjson_line(first, fast)
+    try:
+        async for task in rest:
+            yield _task_ndjson_line(task, fast)
+    except BonitaClientError as exc:
+        # La respuesta ya comenzó: el error se informa como última línea.
+        error = _to_bonita_error_dto(exc).model_dump(by_alias=True)
+        yield json.dumps({"error": error}).encode() + b"\n"
+
+
+@router.get("/tasks:stream", response_class=StreamingResponse)
+async def stream_tasks(
+    state: Optional[str] = Query(default="ready"),
+    user_id: Optional[str] = Query(default=None),
+    process_id: Optional[str] = Query(default=None),
+    sort: Optional[str] = Query(
+        default=None,
+        description="Formato: campo ASC|DESC",
+    ),
+    page_size: Optional[int] = Query(
+        default=None,
+        ge=1,
+        le=500,
+        description="Tareas pedidas a Bonita por página (BONITA_STREAM_PAGE_SIZE por defecto)",
+    ),
+    current_user: str = Depends(get_current_user),
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> StreamingResponse:
+    """
+    Devuelve todas las tareas que cumplen los filtros como NDJSON, recorriendo las
+    páginas de Bonita a medida que se envían en lugar de acumularlas en memoria.
+    """
+    tasks = service.iterar_tareas(
+        state=state,
+        user_id=user_id,
+        process_id=process_id,
+        sort=sort,
+        page_size=page_size or get_settings().bonita_stream_page_size,
+    )
+    # La primera página se pide antes de responder para que los errores iniciales
+    # de Bonita lleguen con su código HTTP.
+    try:
+        first = await tasks.__anext__()
+    except StopAsyncIteration:
+        return StreamingResponse(iter(()), media_type=_NDJSON_MEDIA_TYPE)
+    except BonitaClientError as exc:
+        _handle_bonita_error(exc)
+    return StreamingResponse(_stream_tasks(first, tasks), media_type=_NDJSON_MEDIA_TYPE)
+
+
+@router.get("/tasks:search", response_model=List[ContractTaskDTO])
+async def search_tasks(
+    state: Optional[str] = Query(
+        default=None, description="Uno o varios estados separados por comas"
+    ),
+    process_id: Optional[str] = Query(default=None),
+    user_id: Optional[str] = Query(default=None, description="Usuario asignado"),
+    case_id: Optional[str] = Query(default=None),
+    q: Optional[str] = Query(
+        default=None,
+        min_length=1,
+        max_length=100,
+        description="Texto contenido en el nombre, sin distinguir mayúsculas",
+    ),
+    due_after: Optional[str] = Query(
+        default=None, description="Vencimiento desde (incluido), p.ej. 2024-05-01"
+    ),
+    due_before: Optional[str] = Query(
+        default=None, description="Vencimiento hasta (excluido), p.ej. 2024-06-01"
+    ),
+    sort: Optional[str] = Query(
+        default=None, description="Formato: campo ASC|DESC (dueDate ASC por defecto)"
+    ),
+    page: int = Query(default=0, ge=0),
+    count: int = Query(default=10, ge=1, le=100),
+    fields: Optional[str] = Query(default=None, description=_FIELDS_DESCRIPTION),
+    current_user: str = Depends(get_current_user),
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> Response:
+    """
+    Filtra y ordena las tareas del usuario sobre su índice local
+    (`TASK_INDEX_ENABLED`), que se refresca de forma incremental desde Bonita. Las
+    tareas del índice no conservan `metadata`. El total va en `X-Total-Count`.
+    """
+    registry = get_task_index_registry()
+    if registry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="El índice local de tareas está desactivado (TASK_INDEX_ENABLED).",
         )
-        return [to_contract_task_dto(task) for task in tasks]
+    projection = _parse_fields(fields, CONTRACT_TASK_FIELDS)
+    try:
+        parse_task_sort(sort)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+    states = frozenset(
+        value.strip() for value in (state or "").split(",") if value.strip()
+    )
+    query = TaskQuery(
+        states=states,
+        process_id=process_id,
+        assigned_id=user_id,
+        case_id=case_id,
+        text=q,
+        due_after=due_after,
+        due_before=due_before,
+        sort=sort or DEFAULT_TASK_SORT,
+        page=page,
+        count=count,
+    )
+
+    try:
+        index = await registry.get(current_user, service)
     except BonitaClientError as exc:
         _handle_bonita_error(exc)
+    with start_span("task_index.query"):
+        total, tasks = index.query(query)
+    return FastJSONResponse(
+        [project_payload(to_contract_task_payload(task), projection) for task in tasks],
+        headers={"X-Total-Count": str(total)},
+    )
+
+
+def _sse_message(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def _task_inbox_message(event: TaskInboxEvent) -> bytes:
+    if event.kind == CHANGES_EVENT:
+        diff = event.diff
+        return _sse_message(
+            event.kind,
+            {
+                "added": [to_contract_task_payload(task) for task in diff.added],
+                "changed": [to_contract_task_payload(task) for task in diff.changed],
+                "removed": diff.removed,
+            },
+        )
+    if event.kind == ERROR_EVENT:
+        if isinstance(event.error, BonitaClientError):
+            error = _to_bonita_error_dto(event.error).model_dump(by_alias=True)
+        else:
+            error = {
+                "statusCode": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": str(event.error),
+                "details": None,
+            }
+        return _sse_message(event.kind, {"error": error})
+    return _sse_message(
+        event.kind, {"tasks": [to_contract_task_payload(task) for task in event.tasks]}
+    )
+
+
+async def _watch_tasks(
+    key: tuple,
+    fetch: TaskFetcher,
+    heartbeat_seconds: float,
+    expires_at: Optional[float],
+) -> AsyncIterator[bytes]:
+    """
+    Emite los eventos de la bandeja hasta que el cliente se desconecta, caduca su
+    token o deja de existir su sesión de Bonita.
+    """
+    async with get_task_inbox_hub().subscribe(key, fetch) as queue:
+        while True:
+            timeout = heartbeat_seconds
+            if expires_at is not None:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    yield _sse_message(ERROR_EVENT, {"error": _TOKEN_EXPIRED_ERROR})
+                    return
+                timeout = min(timeout, remaining)
+            try:
+                async with asyncio.timeout(timeout):
+                    event = await queue.get()
+            except asyncio.TimeoutError:
+                # Comentario SSE: mantiene viva la conexión a través de proxies.
+                yield b": keepalive\n\n"
+                continue
+            yield _task_inbox_message(event)
+            if event.kind == ERROR_EVENT and is_bonita_session_error(event.error):
+                return
+
+
+@router.get(
+    "/tasks:watch",
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_bonita_client)],
+)
+async def watch_tasks(
+    state: Optional[str] = Query(default="ready"),
+    user_id: Optional[str] = Query(default=None),
+    process_id: Optional[str] = Query(default=None),
+    include_metadata: bool = Query(
+        default=True, description=_INCLUDE_METADATA_DESCRIPTION
+    ),
+    current_user: str = Depends(get_current_user),
+    expires_at: Optional[float] = Depends(get_token_expiry),
+) -> StreamingResponse:
+    """
+    Bandeja de tareas en vivo como Server-Sent Events: un evento `snapshot` con
+    las tareas actuales y después `changes` con las añadidas, modificadas y
+    eliminadas. Los clientes del mismo usuario con los mismos filtros comparten
+    una única consulta periódica a Bonita (`TASK_INBOX_POLL_SECONDS`).
+
+    La consulta no retiene el cliente de esta petición, que el reaper de
+    sesiones puede cerrar: cada sondeo busca la sesión vigente del usuario. El
+    flujo termina con un evento `error` cuando caduca el token o la sesión.
+    """
+    settings = get_settings()
+
+    async def fetch() -> List[ContractTask]:
+        service = await get_contratos_service_for(current_user)
+        return await service.listar_tareas(
+            state=state,
+            count=settings.task_inbox_max_tasks,
+            user_id=user_id,
+            process_id=process_id,
+            include_metadata=include_metadata,
+        )
+
+    key = (current_user, state, user_id, process_id, include_metadata)
+    return StreamingResponse(
+        _watch_tasks(
+            key, fetch, settings.task_inbox_heartbeat_seconds, expires_at
+        ),
+        media_type=_SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/tasks/{task_id}/assign", response_class=Response)
@@ -108,46 +655,277 @@ async def assign_task(
     task_id: str,
     payload: AssignTaskPayloadDTO,
     current_user: str = Depends(get_current_user),
-    service: ContratosService = Depends(get_contratos_service),
+    service: AsyncContratosService = Depends(get_contratos_service),
 ) -> None:
     try:
-        service.asignar_tarea(task_id=task_id, user_id=payload.user_id)
+        await service.asignar_tarea(task_id=task_id, user_id=payload.user_id)
+        _notify_changes(current_user)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     except BonitaClientError as exc:
         _handle_bonita_error(exc)
 
 
-@router.post("/tasks/{task_id}/complete", response_class=Response)
+def _prefers_async(request: Request) -> bool:
+    return "respond-async" in request.headers.get("prefer", "").lower()
+
+
+def _wants_async_completion(request: Request) -> bool:
+    mode = get_settings().task_completion_mode
+    return mode == "async" or (mode == "prefer" and _prefers_async(request))
+
+
+@router.post(
+    "/tasks/{task_id}/complete",
+    response_class=Response,
+    responses={status.HTTP_202_ACCEPTED: {"model": TaskOperationDTO}},
+)
 async def complete_task(
     task_id: str,
     payload: CompleteTaskPayloadDTO,
+    request: Request,
     current_user: str = Depends(get_current_user),
-    service: ContratosService = Depends(get_contratos_service),
+    service: AsyncContratosService = Depends(get_contratos_service),
 ) -> None:
+    """
+    Completa la tarea y responde 204. Con `TASK_COMPLETION_MODE=async` (o
+    `prefer` y la cabecera `Prefer: respond-async`) la encola y responde 202 con
+    la operación, cuyo estado se consulta en `Location`.
+    """
+    queue = get_task_completion_queue()
+    if queue is not None and _wants_async_completion(request):
+        operation = await queue.encolar(
+            current_user,
+            TaskCompletion(
+                task_id=task_id,
+                contract_inputs=payload.contract_inputs or None,
+                variables=payload.variables or None,
+            ),
+        )
+        headers = {
+            "Location": str(
+                request.url_for(
+                    "get_task_operation", operation_id=operation.operation_id
+                )
+            )
+        }
+        if _prefers_async(request):
+            headers["Preference-Applied"] = "respond-async"
+        return JSONResponse(
+            to_task_operation_dto(operation).model_dump(by_alias=True, mode="json"),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers=headers,
+        )
     try:
-        service.completar_tarea(
+        await service.completar_tarea(
             task_id=task_id,
             contract_inputs=payload.contract_inputs or None,
             variables=payload.variables or None,
         )
+        _forget_completed_task(current_user, task_id)
+        _notify_changes(current_user)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     except BonitaClientError as exc:
         _handle_bonita_error(exc)
 
 
+def notify_task_completed(operation: TaskOperation) -> None:
+    """
+    Aplica a las cachés e índices del usuario una tarea completada por la cola
+    en segundo plano, igual que tras `complete_task` síncrono.
+    """
+    _forget_completed_task(operation.owner, operation.task_id)
+    _notify_changes(operation.owner)
+
+
+@router.get("/operations/{operation_id}", response_model=TaskOperationDTO)
+async def get_task_operation(
+    operation_id: str,
+    current_user: str = Depends(get_current_user),
+) -> TaskOperationDTO:
+    # Con la cola desactivada no hay operaciones: no se abre (ni se crea) el
+    # fichero de la cola.
+    queue = get_task_completion_queue()
+    operation = await queue.obtener(operation_id) if queue is not None else None
+    if operation is None or operation.owner != current_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Operación no encontrada.",
+        )
+    return to_task_operation_dto(operation)
+
+
+def _to_bulk_task_result_dto(result: TaskOperationResult) -> BulkTaskResultDTO:
+    error: Optional[BonitaErrorDTO] = None
+    if isinstance(result.error, BonitaClientError):
+        error = _to_bonita_error_dto(result.error)
+    elif result.error is not None:
+        logger.error(
+            "Error inesperado procesando la tarea %s: %s", result.task_id, result.error
+        )
+        error = BonitaErrorDTO.model_validate(
+            {
+                "statusCode": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": str(result.error),
+            }
+        )
+    return BulkTaskResultDTO.model_validate(
+        {
+            "taskId": result.task_id,
+            "ok": result.ok,
+            "elapsedMs": round(result.elapsed_seconds * 1000, 3),
+            "error": error,
+        }
+    )
+
+
+async def _stream_task_results(
+    results: AsyncIterator[TaskOperationResult],
+    scope: str,
+    *,
+    completed: bool = False,
+) -> AsyncIterator[bytes]:
+    succeeded = failed = 0
+    try:
+        async for result in results:
+            if result.ok:
+                succeeded += 1
+                if completed:
+                    _forget_completed_task(scope, result.task_id)
+            else:
+                failed += 1
+            line = _to_bulk_task_result_dto(result).model_dump_json(by_alias=True)
+            yield line.encode() + b"\n"
+    finally:
+        _notify_changes(scope)
+    summary = {"summary": {"succeeded": succeeded, "failed": failed}}
+    yield json.dumps(summary).encode() + b"\n"
+
+
+@router.post("/tasks:bulk-assign", response_class=StreamingResponse)
+async def bulk_assign_tasks(
+    payload: BulkAssignTasksPayloadDTO,
+    current_user: str = Depends(get_current_user),
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> StreamingResponse:
+    """
+    Asigna varias tareas y devuelve un resultado NDJSON por tarea a medida que
+    terminan, seguido de una línea final con el resumen.
+    """
+    results = service.asignar_tareas(
+        [to_task_assignment(item) for item in payload.items],
+        max_concurrency=payload.max_concurrency
+        or get_settings().bonita_bulk_concurrency,
+    )
+    return StreamingResponse(
+        _stream_task_results(results, current_user), media_type=_NDJSON_MEDIA_TYPE
+    )
+
+
+@router.post("/tasks:bulk-complete", response_class=StreamingResponse)
+async def bulk_complete_tasks(
+    payload: BulkCompleteTasksPayloadDTO,
+    current_user: str = Depends(get_current_user),
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> StreamingResponse:
+    """
+    Completa varias tareas y devuelve un resultado NDJSON por tarea a medida que
+    terminan, seguido de una línea final con el resumen.
+    """
+    results = service.completar_tareas(
+        [to_task_completion(item) for item in payload.items],
+        max_concurrency=payload.max_concurrency
+        or get_settings().bonita_bulk_concurrency,
+    )
+    return StreamingResponse(
+        _stream_task_results(results, current_user, completed=True),
+        media_type=_NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.get("/cases/{case_id}", response_model=ContractCaseWithVariablesDTO)
 async def get_case(
+    request: Request,
     case_id: str,
     include_variables: bool = Query(default=True),
+    fields: Optional[str] = Query(default=None, description=_FIELDS_DESCRIPTION),
+    include_metadata: bool = Query(
+        default=True, description=_INCLUDE_METADATA_DESCRIPTION
+    ),
     current_user: str = Depends(get_current_user),
-    service: ContratosService = Depends(get_contratos_service),
-) -> ContractCaseWithVariablesDTO:
-    try:
-        case = service.obtener_caso_con_variables(
-            case_id=case_id, include_variables=include_variables
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> Response:
+    projection = _parse_fields(fields, CONTRACT_CASE_FIELDS)
+    if projection is not None and "metadata" not in projection:
+        include_metadata = False
+
+    async def render() -> Response:
+        case = await service.obtener_caso_con_variables(
+            case_id=case_id,
+            include_variables=include_variables,
+            include_metadata=include_metadata,
         )
-        return to_contract_case_with_variables_dto(case)
+        with start_span("dto.to_contract_case_with_variables_dto"):
+            if projection is not None or get_settings().api_fast_serialization:
+                payload = to_contract_case_with_variables_payload(case)
+                return FastJSONResponse(
+                    project_case_with_variables_payload(payload, projection)
+                )
+            return _dto_response(to_contract_case_with_variables_dto(case))
+
+    try:
+        return await conditional_response(request, current_user, render)
     except BonitaClientError as exc:
         _handle_bonita_error(exc)
 
 
+def _to_case_batch_response_dto(
+    results: Dict[str, Union[ContractCaseWithVariables, Exception]],
+) -> CaseBatchResponseDTO:
+    response = CaseBatchResponseDTO()
+    for case_id, result in results.items():
+        if isinstance(result, BonitaClientError):
+            item = CaseBatchItemDTO.model_validate(
+                {"caseId": case_id, "error": _to_bonita_error_dto(result)}
+            )
+            response.failed += 1
+        elif isinstance(result, Exception):
+            logger.error("Error inesperado obteniendo el caso %s: %s", case_id, result)
+            item = CaseBatchItemDTO.model_validate(
+                {
+                    "caseId": case_id,
+                    "error": {
+                        "statusCode": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        "message": str(result),
+                    },
+                }
+            )
+            response.failed += 1
+        else:
+            item = CaseBatchItemDTO.model_validate(
+                {
+                    "caseId": case_id,
+                    "result": to_contract_case_with_variables_dto(result),
+                }
+            )
+            response.succeeded += 1
+        response.items.append(item)
+    return response
+
+
+@router.post("/cases:batch", response_model=CaseBatchResponseDTO)
+async def get_cases_batch(
+    payload: CaseBatchRequestDTO,
+    current_user: str = Depends(get_current_user),
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> CaseBatchResponseDTO:
+    """
+    Devuelve el detalle de varios casos en una sola petición. Los fallos de Bonita
+    se informan por caso sin invalidar el resto de resultados.
+    """
+    results = await service.obtener_casos_con_variables(
+        payload.case_ids,
+        include_variables=payload.include_variables,
+        max_concurrency=get_settings().bonita_batch_concurrency,
+    )
+    with start_span("dto.to_case_batch_response_dto"):
+        return _to_case_batch_response_dto(results)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from ...core.metrics import CONTENT_TYPE, render_metrics
+from ...core.monitoring import collect_stats
+from ...core.tracing import InMemorySpanExporter, get_exporter
+from ...infrastructure.bonita.guards import bonita_health
+from ...security import get_current_user
+
+router = APIRouter(prefix="/monitoring", tags=["Monitorización"])
+# `/metrics` se publica en la raíz, donde Prometheus lo busca por defecto.
+metrics_router = APIRouter(tags=["Monitorización"])
+
+
+@router.get("/stats", dependencies=[Depends(get_current_user)])
+async def get_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Expone contadores internos (validación de sesiones, cachés, etc.) para monitorización.
+    """
+    return collect_stats()
+
+
+@router.get("/health")
+async def get_health() -> Dict[str, Any]:
+    """
+    Estado de los circuit breakers y del limitador de concurrencia hacia Bonita.
+    Responde 200 aunque Bonita esté degradado para que el balanceador no retire
+    esta instancia por un fallo ajeno.
+    """
+    return {"bonita": bonita_health()}
+
+
+@router.get("/traces", dependencies=[Depends(get_current_user)])
+async def get_traces(
+    limit: int = Query(default=20, ge=1, le=200),
+    min_duration_ms: float = Query(default=0.0, ge=0),
+) -> Dict[str, Any]:
+    """
+    Trazas recientes guardadas por el exportador en memoria (`TRACING_EXPORTER=memory`),
+    de la más reciente a la más antigua, con sus tramos ordenados por inicio para
+    atribuir la latencia a cada capa. Requiere autenticación: las rutas incluyen
+    ids de tareas y casos.
+    """
+    exporter = get_exporter()
+    if not isinstance(exporter, InMemorySpanExporter):
+        return {"enabled": False, "traces": []}
+
+    by_trace: Dict[str, List[Dict[str, Any]]] = {}
+    for span in exporter.spans():
+        by_trace.setdefault(span.trace_id, []).append(span.to_dict())
+
+    traces: List[Dict[str, Any]] = []
+    for trace_id, spans in reversed(by_trace.items()):
+        spans.sort(key=lambda span: span["start_time_ns"])
+        root = next((span for span in spans if span["kind"] == "server"), spans[0])
+        if (root["duration_ms"] or 0) < min_duration_ms:
+            continue
+        traces.append(
+            {
+                "trace_id": trace_id,
+                "name": root["name"],
+                "duration_ms": root["duration_ms"],
+                "spans": spans,
+            }
+        )
+        if len(traces) >= limit:
+            break
+    return {"enabled": True, "traces": traces}
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Métricas en formato de exposición de Prometheus: latencia de las rutas de la
+    API, latencia y errores de Bonita por plantilla de endpoint, logins y las
+    estadísticas internas de `/monitoring/stats` como gauges.
+    """
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
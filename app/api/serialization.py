@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el módulo json estándar.
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializa a JSON compacto en UTF-8 con orjson si está instalado. Los valores
+    que orjson no admite (p.ej. enteros de más de 64 bits) se delegan en `json`.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=str,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON para contenido ya construido con sus alias (ver los
+    `to_*_payload` de `dto.contratos`). Al devolverla desde una ruta, FastAPI no
+    vuelve a validar ni serializar con `response_model`, que se mantiene sólo para
+    documentar el esquema en OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional
+
+from ..config import get_settings
+from ..core.monitoring import register_stats_provider
+from ..core.ttl_cache import TTLCache
+from ..domain.contratos.entities import ContractTask
+from ..domain.contratos.sincronizacion import (
+    TaskSyncSnapshot,
+    take_task_snapshot,
+    tasks_changed_since,
+)
+
+SYNC_TOKEN_HEADER = "X-Sync-Token"
+SYNC_REMOVED_HEADER = "X-Sync-Removed"
+SYNC_RESET_HEADER = "X-Sync-Reset"
+
+
+@dataclass(slots=True)
+class TaskSyncResult:
+    tasks: List[ContractTask]
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@lru_cache
+def get_task_sync_store() -> Optional[TTLCache[TaskSyncSnapshot]]:
+    """
+    Instantáneas de los listados de tareas entregados, por usuario y token, para
+    responder a `since` sólo con las diferencias. Devuelve `None` si
+    `TASK_SYNC_TTL_SECONDS` es 0.
+    """
+    settings = get_settings()
+    if settings.task_sync_ttl_seconds <= 0:
+        return None
+    return TTLCache(
+        max_entries=settings.task_sync_max_entries,
+        ttl_seconds=settings.task_sync_ttl_seconds,
+    )
+
+
+def sync_tasks(
+    scope: str,
+    query: Hashable,
+    since: Optional[str],
+    tasks: List[ContractTask],
+) -> TaskSyncResult:
+    """
+    Registra la consulta actual y devuelve su token. Si `since` corresponde a
+    una instantánea vigente de la misma consulta, sólo se devuelven las tareas
+    añadidas o modificadas y los ids eliminados; si no (caducado o de otra
+    consulta), la lista completa marcada con `X-Sync-Reset`.
+    """
+    store = get_task_sync_store()
+    if store is None:
+        return TaskSyncResult(tasks)
+
+    snapshot = take_task_snapshot(query, tasks)
+    token = snapshot.token
+    store.set((scope, token), snapshot)
+    headers = {SYNC_TOKEN_HEADER: token}
+    if since is None:
+        return TaskSyncResult(tasks, headers)
+
+    previous = store.get((scope, since))
+    if previous is None or previous.query != query:
+        headers[SYNC_RESET_HEADER] = "true"
+        return TaskSyncResult(tasks, headers)
+
+    changed, removed = tasks_changed_since(previous, tasks)
+    if removed:
+        headers[SYNC_REMOVED_HEADER] = ",".join(removed)
+    return TaskSyncResult(changed, headers)
+
+
+def _task_sync_stats() -> dict:
+    store = get_task_sync_store()
+    return store.stats() if store is not None else {"enabled": False}
+
+
+register_stats_provider("task_sync", _task_sync_stats)
@@ -14,6 +14,72 @@ class Settings:
     secret_key: str
     jwt_algorithm: str
     access_token_expire_minutes: int
+    admin_users: frozenset[str] = frozenset()
+    bonita_session_validation: str = "trusted"
+    bonita_session_trust_seconds: int = 60
+    session_store_max_size: int = 1000
+    session_store_reap_interval_seconds: int = 60
+    session_store_close_grace_seconds: float = 120.0
+    session_backend: str = "memory"
+    session_backend_url: str | None = None
+    bonita_pool_max_connections: int = 100
+    bonita_pool_max_keepalive: int = 20
+    bonita_pool_keepalive_expiry_seconds: float = 30.0
+    bonita_pool_max_per_host: int = 50
+    bonita_pool_connect_retries: int = 1
+    bonita_connect_timeout_seconds: float = 5.0
+    bonita_read_timeout_seconds: float = 15.0
+    process_cache_ttl_seconds: int = 300
+    process_cache_max_entries: int = 256
+    process_cache_shared: bool = False
+    bonita_case_variables_page_size: int = 100
+    bonita_fanout_concurrency: int = 8
+    bonita_batch_concurrency: int = 10
+    bonita_bulk_concurrency: int = 10
+    bonita_stream_page_size: int = 100
+    bonita_single_flight: bool = True
+    bonita_login_max_attempts: int = 3
+    bonita_login_backoff_seconds: float = 0.5
+    bonita_breaker_failure_threshold: int = 5
+    bonita_breaker_recovery_seconds: float = 30.0
+    bonita_breaker_half_open_max_calls: int = 1
+    bonita_adaptive_limit_enabled: bool = True
+    bonita_adaptive_limit_min: int = 2
+    bonita_adaptive_limit_max: int = 100
+    bonita_adaptive_latency_target_seconds: float = 2.0
+    bonita_retry_max_attempts: int = 3
+    bonita_retry_base_delay_seconds: float = 0.2
+    bonita_retry_max_delay_seconds: float = 2.0
+    bonita_retry_budget_ratio: float = 0.2
+    bonita_retry_budget_min_per_second: float = 1.0
+    tracing_exporter: str = "none"
+    tracing_max_spans: int = 2000
+    api_fast_serialization: bool = True
+    api_compression_enabled: bool = True
+    api_compression_min_bytes: int = 1024
+    api_response_cache_ttl_seconds: float = 2.0
+    api_response_cache_max_entries: int = 1000
+    task_inbox_poll_seconds: float = 5.0
+    task_inbox_max_tasks: int = 100
+    task_inbox_heartbeat_seconds: float = 15.0
+    task_inbox_queue_size: int = 100
+    task_sync_ttl_seconds: float = 600.0
+    task_sync_max_entries: int = 1000
+    task_index_enabled: bool = False
+    task_index_refresh_seconds: float = 10.0
+    task_index_full_sync_seconds: float = 300.0
+    task_index_max_users: int = 100
+    task_completion_mode: str = "sync"
+    task_completion_queue_path: str = "task_operations.sqlite3"
+    task_completion_concurrency: int = 4
+    task_completion_max_attempts: int = 5
+    task_completion_retry_base_seconds: float = 1.0
+    task_completion_retry_max_seconds: float = 60.0
+    task_completion_lease_seconds: float = 60.0
+    bulk_start_concurrency: int = 10
+    bulk_start_rate_per_second: float = 20.0
+    bulk_start_lease_seconds: float = 60.0
+    bulk_checkpoint_path: str = "bulk_imports.sqlite3"
 
 
 def _get_env_variable(key: str, *, default: str | None = None) -> str:
@@ -23,27 +89,269 @@ def _get_env_variable(key: str, *, default: str | None = None) -> str:
     return value
 
 
+def _get_optional_env_variable(key: str) -> str | None:
+    value = os.getenv(key)
+    if value is None or value.strip() == "":
+        return None
+    return value
+
+
+def _get_set_env_variable(key: str) -> frozenset[str]:
+    value = _get_optional_env_variable(key) or ""
+    return frozenset(item.strip() for item in value.split(",") if item.strip())
+
+
+def _get_int_env_variable(key: str, *, default: str) -> int:
+    raw_value = _get_env_variable(key, default=default)
+    try:
+        return int(raw_value)
+    except ValueError as exc:
+        raise RuntimeError(f"La variable {key} debe ser un entero.") from exc
+
+
+def _get_float_env_variable(key: str, *, default: str) -> float:
+    raw_value = _get_env_variable(key, default=default)
+    try:
+        return float(raw_value)
+    except ValueError as exc:
+        raise RuntimeError(f"La variable {key} debe ser un número.") from exc
+
+
+def _get_bool_env_variable(key: str, *, default: str) -> bool:
+    value = _get_env_variable(key, default=default).strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise RuntimeError(f"La variable {key} debe ser un booleano (true/false).")
+
+
+def _get_choice_env_variable(
+    key: str, *, default: str, choices: tuple[str, ...]
+) -> str:
+    value = _get_env_variable(key, default=default).strip().lower()
+    if value not in choices:
+        raise RuntimeError(
+            f"La variable {key} debe ser uno de: {', '.join(choices)}."
+        )
+    return value
+
+
 @lru_cache
 def get_settings() -> Settings:
     """
     Lee la configuración necesaria para conectarse a Bonita desde variables
     de entorno y la retorna como un objeto inmutable.
     """
-    access_token_expire_minutes_raw = _get_env_variable(
+    access_token_expire_minutes = _get_int_env_variable(
         "ACCESS_TOKEN_EXPIRE_MINUTES", default="30"
     )
-    try:
-        access_token_expire_minutes = int(access_token_expire_minutes_raw)
-    except ValueError as exc:
-        raise RuntimeError(
-            "La variable ACCESS_TOKEN_EXPIRE_MINUTES debe ser un entero."
-        ) from exc
 
     return Settings(
         bonita_url=_get_env_variable("BONITA_URL"),
         secret_key=_get_env_variable("SECRET_KEY"),
         jwt_algorithm=_get_env_variable("JWT_ALGORITHM", default="HS256"),
         access_token_expire_minutes=access_token_expire_minutes,
+        admin_users=_get_set_env_variable("ADMIN_USERS"),
+        bonita_session_validation=_get_choice_env_variable(
+            "BONITA_SESSION_VALIDATION",
+            default="trusted",
+            choices=("always", "trusted", "background"),
+        ),
+        bonita_session_trust_seconds=_get_int_env_variable(
+            "BONITA_SESSION_TRUST_SECONDS", default="60"
+        ),
+        session_store_max_size=_get_int_env_variable(
+            "SESSION_STORE_MAX_SIZE", default="1000"
+        ),
+        session_store_reap_interval_seconds=_get_int_env_variable(
+            "SESSION_STORE_REAP_INTERVAL_SECONDS", default="60"
+        ),
+        session_store_close_grace_seconds=_get_float_env_variable(
+            "SESSION_STORE_CLOSE_GRACE_SECONDS", default="120"
+        ),
+        session_backend=_get_choice_env_variable(
+            "SESSION_BACKEND",
+            default="memory",
+            choices=("memory", "sqlite", "redis"),
+        ),
+        session_backend_url=_get_optional_env_variable("SESSION_BACKEND_URL"),
+        bonita_pool_max_connections=_get_int_env_variable(
+            "BONITA_POOL_MAX_CONNECTIONS", default="100"
+        ),
+        bonita_pool_max_keepalive=_get_int_env_variable(
+            "BONITA_POOL_MAX_KEEPALIVE", default="20"
+        ),
+        bonita_pool_keepalive_expiry_seconds=_get_float_env_variable(
+            "BONITA_POOL_KEEPALIVE_EXPIRY_SECONDS", default="30"
+        ),
+        bonita_pool_max_per_host=_get_int_env_variable(
+            "BONITA_POOL_MAX_PER_HOST", default="50"
+        ),
+        bonita_pool_connect_retries=_get_int_env_variable(
+            "BONITA_POOL_CONNECT_RETRIES", default="1"
+        ),
+        bonita_connect_timeout_seconds=_get_float_env_variable(
+            "BONITA_CONNECT_TIMEOUT_SECONDS", default="5"
+        ),
+        bonita_read_timeout_seconds=_get_float_env_variable(
+            "BONITA_READ_TIMEOUT_SECONDS", default="15"
+        ),
+        process_cache_ttl_seconds=_get_int_env_variable(
+            "PROCESS_CACHE_TTL_SECONDS", default="300"
+        ),
+        process_cache_max_entries=_get_int_env_variable(
+            "PROCESS_CACHE_MAX_ENTRIES", default="256"
+        ),
+        process_cache_shared=_get_bool_env_variable(
+            "PROCESS_CACHE_SHARED", default="false"
+        ),
+        bonita_case_variables_page_size=_get_int_env_variable(
+            "BONITA_CASE_VARIABLES_PAGE_SIZE", default="100"
+        ),
+        bonita_fanout_concurrency=_get_int_env_variable(
+            "BONITA_FANOUT_CONCURRENCY", default="8"
+        ),
+        bonita_batch_concurrency=_get_int_env_variable(
+            "BONITA_BATCH_CONCURRENCY", default="10"
+        ),
+        bonita_bulk_concurrency=_get_int_env_variable(
+            "BONITA_BULK_CONCURRENCY", default="10"
+        ),
+        bonita_stream_page_size=_get_int_env_variable(
+            "BONITA_STREAM_PAGE_SIZE", default="100"
+        ),
+        bonita_single_flight=_get_bool_env_variable(
+            "BONITA_SINGLE_FLIGHT", default="true"
+        ),
+        bonita_login_max_attempts=_get_int_env_variable(
+            "BONITA_LOGIN_MAX_ATTEMPTS", default="3"
+        ),
+        bonita_login_backoff_seconds=_get_float_env_variable(
+            "BONITA_LOGIN_BACKOFF_SECONDS", default="0.5"
+        ),
+        bonita_breaker_failure_threshold=_get_int_env_variable(
+            "BONITA_BREAKER_FAILURE_THRESHOLD", default="5"
+        ),
+        bonita_breaker_recovery_seconds=_get_float_env_variable(
+            "BONITA_BREAKER_RECOVERY_SECONDS", default="30"
+        ),
+        bonita_breaker_half_open_max_calls=_get_int_env_variable(
+            "BONITA_BREAKER_HALF_OPEN_MAX_CALLS", default="1"
+        ),
+        bonita_adaptive_limit_enabled=_get_bool_env_variable(
+            "BONITA_ADAPTIVE_LIMIT_ENABLED", default="true"
+        ),
+        bonita_adaptive_limit_min=_get_int_env_variable(
+            "BONITA_ADAPTIVE_LIMIT_MIN", default="2"
+        ),
+        bonita_adaptive_limit_max=_get_int_env_variable(
+            "BONITA_ADAPTIVE_LIMIT_MAX", default="100"
+        ),
+        bonita_adaptive_latency_target_seconds=_get_float_env_variable(
+            "BONITA_ADAPTIVE_LATENCY_TARGET_SECONDS", default="2"
+        ),
+        bonita_retry_max_attempts=_get_int_env_variable(
+            "BONITA_RETRY_MAX_ATTEMPTS", default="3"
+        ),
+        bonita_retry_base_delay_seconds=_get_float_env_variable(
+            "BONITA_RETRY_BASE_DELAY_SECONDS", default="0.2"
+        ),
+        bonita_retry_max_delay_seconds=_get_float_env_variable(
+            "BONITA_RETRY_MAX_DELAY_SECONDS", default="2"
+        ),
+        bonita_retry_budget_ratio=_get_float_env_variable(
+            "BONITA_RETRY_BUDGET_RATIO", default="0.2"
+        ),
+        bonita_retry_budget_min_per_second=_get_float_env_variable(
+            "BONITA_RETRY_BUDGET_MIN_PER_SECOND", default="1"
+        ),
+        tracing_exporter=_get_choice_env_variable(
+            "TRACING_EXPORTER",
+            default="none",
+            choices=("none", "memory", "console"),
+        ),
+        tracing_max_spans=_get_int_env_variable("TRACING_MAX_SPANS", default="2000"),
+        api_fast_serialization=_get_bool_env_variable(
+            "API_FAST_SERIALIZATION", default="true"
+        ),
+        api_compression_enabled=_get_bool_env_variable(
+            "API_COMPRESSION_ENABLED", default="true"
+        ),
+        api_compression_min_bytes=_get_int_env_variable(
+            "API_COMPRESSION_MIN_BYTES", default="1024"
+        ),
+        api_response_cache_ttl_seconds=_get_float_env_variable(
+            "API_RESPONSE_CACHE_TTL_SECONDS", default="2"
+        ),
+        api_response_cache_max_entries=_get_int_env_variable(
+            "API_RESPONSE_CACHE_MAX_ENTRIES", default="1000"
+        ),
+        task_inbox_poll_seconds=_get_float_env_variable(
+            "TASK_INBOX_POLL_SECONDS", default="5"
+        ),
+        task_inbox_max_tasks=_get_int_env_variable(
+            "TASK_INBOX_MAX_TASKS", default="100"
+        ),
+        task_inbox_heartbeat_seconds=_get_float_env_variable(
+            "TASK_INBOX_HEARTBEAT_SECONDS", default="15"
+        ),
+        task_inbox_queue_size=_get_int_env_variable(
+            "TASK_INBOX_QUEUE_SIZE", default="100"
+        ),
+        task_sync_ttl_seconds=_get_float_env_variable(
+            "TASK_SYNC_TTL_SECONDS", default="600"
+        ),
+        task_sync_max_entries=_get_int_env_variable(
+            "TASK_SYNC_MAX_ENTRIES", default="1000"
+        ),
+        task_index_enabled=_get_bool_env_variable(
+            "TASK_INDEX_ENABLED", default="false"
+        ),
+        task_index_refresh_seconds=_get_float_env_variable(
+            "TASK_INDEX_REFRESH_SECONDS", default="10"
+        ),
+        task_index_full_sync_seconds=_get_float_env_variable(
+            "TASK_INDEX_FULL_SYNC_SECONDS", default="300"
+        ),
+        task_index_max_users=_get_int_env_variable(
+            "TASK_INDEX_MAX_USERS", default="100"
+        ),
+        task_completion_mode=_get_choice_env_variable(
+            "TASK_COMPLETION_MODE",
+            default="sync",
+            choices=("sync", "async", "prefer"),
+        ),
+        task_completion_queue_path=_get_env_variable(
+            "TASK_COMPLETION_QUEUE_PATH", default="task_operations.sqlite3"
+        ),
+        task_completion_concurrency=_get_int_env_variable(
+            "TASK_COMPLETION_CONCURRENCY", default="4"
+        ),
+        task_completion_max_attempts=_get_int_env_variable(
+            "TASK_COMPLETION_MAX_ATTEMPTS", default="5"
+        ),
+        task_completion_retry_base_seconds=_get_float_env_variable(
+            "TASK_COMPLETION_RETRY_BASE_SECONDS", default="1"
+        ),
+        task_completion_retry_max_seconds=_get_float_env_variable(
+            "TASK_COMPLETION_RETRY_MAX_SECONDS", default="60"
+        ),
+        task_completion_lease_seconds=_get_float_env_variable(
+            "TASK_COMPLETION_LEASE_SECONDS", default="60"
+        ),
+        bulk_start_concurrency=_get_int_env_variable(
+            "BULK_START_CONCURRENCY", default="10"
+        ),
+        bulk_start_rate_per_second=_get_float_env_variable(
+            "BULK_START_RATE_PER_SECOND", default="20"
+        ),
+        bulk_start_lease_seconds=_get_float_env_variable(
+            "BULK_START_LEASE_SECONDS", default="60"
+        ),
+        bulk_checkpoint_path=_get_env_variable(
+            "BULK_CHECKPOINT_PATH", default="bulk_imports.sqlite3"
+        ),
     )
 
 
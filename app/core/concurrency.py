@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+
+
+async def gather_limited(
+    factories: Iterable[Callable[[], Awaitable[T]]], limit: int
+) -> List[T]:
+    """
+    Ejecuta las corrutinas creadas por `factories` con como máximo `limit` en vuelo
+    y devuelve sus resultados en el mismo orden. Si una falla, cancela el resto y
+    propaga la excepción.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    tasks = [asyncio.ensure_future(run(factory)) for factory in factories]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def gather_limited_settled(
+    factories: Iterable[Callable[[], Awaitable[T]]], limit: int
+) -> List[Union[T, Exception]]:
+    """
+    Como `gather_limited`, pero no se detiene ante fallos: devuelve la excepción
+    de cada corrutina fallida en su posición correspondiente.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> Union[T, Exception]:
+        async with semaphore:
+            try:
+                return await factory()
+            except Exception as exc:
+                return exc
+
+    return await asyncio.gather(*(run(factory) for factory in factories))
+
+
+async def iter_completed_limited(
+    factories: Iterable[Callable[[], Awaitable[T]]], limit: int
+) -> AsyncIterator[Tuple[int, Union[T, Exception]]]:
+    """
+    Ejecuta las corrutinas con como máximo `limit` en vuelo y produce
+    `(posición, resultado o excepción)` a medida que van terminando. Si el consumidor
+    deja de iterar, las pendientes se cancelan.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(
+        index: int, factory: Callable[[], Awaitable[T]]
+    ) -> Tuple[int, Union[T, Exception]]:
+        async with semaphore:
+            try:
+                return index, await factory()
+            except Exception as exc:
+                return index, exc
+
+    tasks = [
+        asyncio.ensure_future(run(index, factory))
+        for index, factory in enumerate(factories)
+    ]
+    try:
+        for next_completed in asyncio.as_completed(tasks):
+            yield await next_completed
+    finally:
+        for task in tasks:
+            task.cancel()
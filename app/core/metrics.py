@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import bisect
+import math
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+from .monitoring import collect_stats
+
+# Tiempos típicos de una API que delega en Bonita: de milisegundos a timeouts.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    15.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """
+    Contador monótono con etiquetas, en formato de exposición de Prometheus.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in values.items():
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Histograma con etiquetas. `observe` sólo incrementa un cubo; los acumulados
+    que exige Prometheus se calculan al exportar para no penalizar cada petición.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        # Por etiquetas: [conteo por cubo (+Inf al final), suma, total].
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = {
+                labels: (list(counts), total, count)
+                for labels, (counts, total, count) in self._series.items()
+            }
+        bucket_names = self.labelnames + ("le",)
+        for labelvalues, (counts, total, count) in series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    bucket_names, labelvalues + (_format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+_registry_lock = Lock()
+_registry: Dict[str, "Counter | Histogram"] = {}
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """
+    Registra (o devuelve el ya registrado) un contador con ese nombre.
+    """
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = Counter(name, documentation, labelnames)
+        return metric
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """
+    Registra (o devuelve el ya registrado) un histograma con ese nombre.
+    """
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = Histogram(
+                name, documentation, labelnames, buckets
+            )
+        return metric
+
+
+def _render_component_stats() -> List[str]:
+    """
+    Exporta como gauges los valores numéricos de los proveedores registrados en
+    `monitoring` (tamaño del almacén de sesiones, uso del pool HTTP, cachés...).
+    """
+    name = "app_component_stat"
+    lines = [
+        f"# HELP {name} Estadísticas internas de los componentes (GET /api/monitoring/stats).",
+        f"# TYPE {name} gauge",
+    ]
+
+    def walk(component: str, prefix: str, value: object) -> None:
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            labels = _format_labels(("component", "stat"), (component, prefix))
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        elif isinstance(value, dict):
+            for key, child in value.items():
+                walk(component, f"{prefix}.{key}" if prefix else str(key), child)
+
+    for component, stats in collect_stats().items():
+        walk(component, "", stats)
+    return lines
+
+
+def render_metrics() -> str:
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    lines.extend(_render_component_stats())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Any, Callable, Dict
+
+StatsProvider = Callable[[], Dict[str, Any]]
+
+_lock = Lock()
+_stats_providers: Dict[str, StatsProvider] = {}
+
+
+def register_stats_provider(name: str, provider: StatsProvider) -> None:
+    """
+    Registra (o reemplaza) una función que expone estadísticas de un componente.
+    """
+    with _lock:
+        _stats_providers[name] = provider
+
+
+def collect_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Devuelve una instantánea de las estadísticas de todos los componentes registrados.
+    """
+    with _lock:
+        providers = dict(_stats_providers)
+    return {name: provider() for name, provider in providers.items()}
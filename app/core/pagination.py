@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+async def iter_pages(
+    fetch_page: Callable[[int], Awaitable[List[T]]],
+    *,
+    page_size: int,
+    start_page: int = 0,
+    prefetch: bool = True,
+) -> AsyncIterator[T]:
+    """
+    Recorre de forma perezosa todas las páginas que devuelve `fetch_page(page)`.
+    Con `prefetch`, la página siguiente se pide mientras se consume la actual. Se
+    detiene en la primera página con menos de `page_size` elementos; si el
+    consumidor abandona la iteración, la petición adelantada se cancela.
+    """
+    page = start_page
+    pending: Optional[asyncio.Task] = None
+    try:
+        items = await fetch_page(page)
+        while True:
+            is_last = len(items) < page_size
+            if prefetch and not is_last:
+                pending = asyncio.ensure_future(fetch_page(page + 1))
+            for item in items:
+                yield item
+            if is_last:
+                return
+            page += 1
+            if pending is not None:
+                items, pending = await pending, None
+            else:
+                items = await fetch_page(page)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            if pending.done() and not pending.cancelled():
+                pending.exception()
+
+
+def iter_pages_sync(
+    fetch_page: Callable[[int], List[T]],
+    *,
+    page_size: int,
+    start_page: int = 0,
+) -> Iterator[T]:
+    """
+    Variante síncrona de `iter_pages`, sin prefetch: cada página se pide cuando
+    se termina de consumir la anterior.
+    """
+    page = start_page
+    while True:
+        items = fetch_page(page)
+        yield from items
+        if len(items) < page_size:
+            return
+        page += 1
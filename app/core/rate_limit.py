@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """
+    Limitador de tipo token bucket: permite `rate_per_second` operaciones por segundo
+    con ráfagas de hasta `burst`. Con `rate_per_second <= 0` no limita.
+    """
+
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None) -> None:
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst if burst is not None else int(rate_per_second) or 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate_per_second <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated_at) * self.rate_per_second,
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
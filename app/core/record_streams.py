@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# Cada registro es un diccionario o el error que impidió interpretar su línea.
+Record = Union[Dict[str, Any], ValueError]
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Convierte un flujo de bytes UTF-8 en `(número de línea, texto)` sin cargar el
+    contenido completo en memoria. Las líneas vacías se omiten.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield line_no + 1, buffer.rstrip("\r")
+
+
+async def iter_jsonl_records(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[Tuple[int, Record]]:
+    """
+    Lee un flujo JSONL (un objeto JSON por línea). Una línea inválida no detiene
+    la lectura: se entrega un `ValueError` en lugar del registro.
+    """
+    async for line_no, line in iter_lines(chunks):
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_no, ValueError(f"JSON inválido: {exc}")
+            continue
+        if not isinstance(record, dict):
+            yield line_no, ValueError("Se esperaba un objeto JSON.")
+            continue
+        yield line_no, record
+
+
+async def iter_csv_records(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[Tuple[int, Record]]:
+    """
+    Lee un flujo CSV cuya primera línea contiene los nombres de las columnas.
+    Los valores se entregan como texto; no se admiten saltos de línea dentro de
+    campos entrecomillados. Las filas inválidas se entregan como `ValueError`.
+    """
+    header: Optional[List[str]] = None
+    async for line_no, line in iter_lines(chunks):
+        row = next(csv.reader([line]))
+        if header is None:
+            header = [column.strip() for column in row]
+            continue
+        if len(row) != len(header):
+            yield line_no, ValueError(
+                f"Se esperaban {len(header)} columnas y hay {len(row)}."
+            )
+            continue
+        yield line_no, dict(zip(header, row))
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Any, Callable, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerStats:
+    successes: int = 0
+    failures: int = 0
+    rejections: int = 0
+    openings: int = 0
+
+
+class CircuitBreaker:
+    """
+    Corta las llamadas a un servicio tras `failure_threshold` fallos consecutivos.
+
+    Abierto, rechaza de inmediato durante `recovery_seconds`; después pasa a
+    semiabierto y deja pasar hasta `half_open_max_calls` llamadas de prueba: si
+    una tiene éxito se cierra y si falla vuelve a abrirse.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        recovery_seconds: float,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._lock = Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._stats = CircuitBreakerStats()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def retry_after(self) -> float:
+        """
+        Segundos que faltan para admitir llamadas de prueba (0 si ya se admiten).
+        """
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.recovery_seconds - self._clock())
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return True
+            self._stats.rejections += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats.successes += 1
+            # Una llamada lenta admitida antes de abrirse el circuito no lo cierra:
+            # sólo cuentan las de prueba en semiabierto.
+            if self._current_state() == OPEN:
+                return
+            self._consecutive_failures = 0
+            self._trial_calls = 0
+            self._state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats.failures += 1
+            self._consecutive_failures += 1
+            if (
+                self._current_state() == HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def record_ignored(self) -> None:
+        """
+        Libera una llamada admitida cuyo resultado no dice nada del servicio
+        (p.ej. cancelada por el propio solicitante).
+        """
+        with self._lock:
+            if self._trial_calls:
+                self._trial_calls -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **asdict(self._stats),
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+            }
+
+    def _current_state(self) -> str:
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self.recovery_seconds
+        ):
+            self._state = HALF_OPEN
+            self._trial_calls = 0
+        return self._state
+
+    def _open(self) -> None:
+        if self._state != OPEN:
+            self._stats.openings += 1
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._trial_calls = 0
+
+
+@dataclass
+class ConcurrencyLimiterStats:
+    admitted: int = 0
+    shed: int = 0
+    decreases: int = 0
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limita las llamadas simultáneas con un límite que se ajusta solo (AIMD): crece
+    en `1/limit` por cada llamada que responde antes de `latency_target_seconds` y
+    se multiplica por `decrease_factor` cuando una llamada supera ese objetivo.
+    Empieza en `max_limit`, de modo que sólo descarta llamadas cuando la latencia
+    de Bonita ya ha empeorado; las que superan el límite se rechazan de inmediato
+    en lugar de encolarse.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        decrease_factor: float = 0.9,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_target_seconds = latency_target_seconds
+        self.decrease_factor = decrease_factor
+        self._limit = float(self.max_limit)
+        self._in_flight = 0
+        self._lock = Lock()
+        self._stats = ConcurrencyLimiterStats()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                self._stats.shed += 1
+                return False
+            self._in_flight += 1
+            self._stats.admitted += 1
+            return True
+
+    def release(self, latency_seconds: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if latency_seconds > self.latency_target_seconds:
+                self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                self._stats.decreases += 1
+            else:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **asdict(self._stats),
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "latency_target_seconds": self.latency_target_seconds,
+            }
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, FrozenSet, Optional
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Política de reintentos: hasta `max_attempts` intentos en total, con espera
+    exponencial y jitter completo (`uniform(0, min(max_delay, base * 2^n))`).
+    """
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.2
+    max_delay_seconds: float = 2.0
+    retry_statuses: FrozenSet[int] = frozenset({502, 503, 504})
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Espera antes del intento `attempt + 1`. Si el servidor indicó `Retry-After`
+        se respeta, sin superar `max_delay_seconds`.
+        """
+        if retry_after is not None:
+            return min(self.max_delay_seconds, max(0.0, retry_after))
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    retries: int = 0
+    budget_rejections: int = 0
+    retries_by_reason: Dict[str, int] = field(default_factory=dict)
+
+
+class RetryBudget:
+    """
+    Limita los reintentos a una fracción de las peticiones recientes para que un
+    servicio caído no reciba varias veces la carga normal (tormenta de reintentos).
+
+    En la ventana de `window_seconds` se permiten
+    `min_retries_per_second * window_seconds + ratio * peticiones` reintentos.
+    """
+
+    def __init__(
+        self,
+        *,
+        ratio: float,
+        min_retries_per_second: float,
+        window_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._stats = RetryStats()
+
+    def record_request(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._trim(now)
+            self._requests.append(now)
+            self._stats.requests += 1
+
+    def try_withdraw(self, reason: str) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._trim(now)
+            allowed = (
+                self.min_retries_per_second * self.window_seconds
+                + self.ratio * len(self._requests)
+            )
+            if len(self._retries) >= allowed:
+                self._stats.budget_rejections += 1
+                return False
+            self._retries.append(now)
+            self._stats.retries += 1
+            by_reason = self._stats.retries_by_reason
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(self._clock())
+            snapshot = asdict(self._stats)
+            snapshot.update(
+                window_requests=len(self._requests),
+                window_retries=len(self._retries),
+            )
+            return snapshot
+
+    def _trim(self, now: float) -> None:
+        limit = now - self.window_seconds
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < limit:
+                timestamps.popleft()
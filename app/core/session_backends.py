@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, Optional, Protocol
+
+from app.config import Settings
+
+
+@dataclass
+class SessionRecord:
+    """
+    Estado serializable de una sesión de Bonita compartido entre workers.
+    No incluye la contraseña del usuario: sólo cookies y token CSRF.
+    """
+
+    username: str
+    base_url: str
+    state: Dict[str, Any] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "SessionRecord":
+        return cls(**json.loads(raw))
+
+
+class SessionBackend(Protocol):
+    """
+    Almacén compartido de sesiones. Las implementaciones son síncronas; el código
+    asíncrono las invoca mediante `asyncio.to_thread`.
+    """
+
+    def load(self, username: str) -> Optional[SessionRecord]:
+        ...
+
+    def save(self, record: SessionRecord, ttl_seconds: float) -> None:
+        ...
+
+    def delete(self, username: str) -> None:
+        ...
+
+
+class SqliteSessionBackend:
+    """
+    Backend basado en un fichero SQLite. Sirve para varios workers de uvicorn en el
+    mismo host o para contenedores que comparten un volumen.
+
+    El fichero guarda las cookies (JSESSIONID) y tokens CSRF vigentes: quien pueda
+    leerlo puede suplantar a los usuarios en Bonita. Si no existe se crea con
+    permisos sólo para el propietario (0600).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # SQLite crea los ficheros -wal y -shm con los permisos del principal.
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bonita_sessions (
+                    username TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Conexión en una transacción (commit al salir, rollback si falla) que se
+        cierra siempre al terminar.
+        """
+        connection = sqlite3.connect(self.path, timeout=5)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def load(self, username: str) -> Optional[SessionRecord]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT payload, expires_at FROM bonita_sessions WHERE username = ?",
+                (username,),
+            ).fetchone()
+        if row is None:
+            return None
+        payload, expires_at = row
+        if expires_at <= time.time():
+            self.delete(username)
+            return None
+        return SessionRecord.from_json(payload)
+
+    def save(self, record: SessionRecord, ttl_seconds: float) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                """
+                INSERT INTO bonita_sessions (username, payload, expires_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(username) DO UPDATE SET
+                    payload = excluded.payload,
+                    expires_at = excluded.expires_at
+                """,
+                (record.username, record.to_json(), time.time() + ttl_seconds),
+            )
+
+    def delete(self, username: str) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM bonita_sessions WHERE username = ?", (username,)
+            )
+
+
+class RedisSessionBackend:
+    """
+    Backend para Redis o cualquier servidor compatible. Acepta un cliente ya
+    construido con la interfaz de `redis.Redis` (`get`, `set(..., ex=)`, `delete`),
+    lo que permite usar sustitutos locales como `fakeredis`.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        url: str | None = None,
+        key_prefix: str = "bonita:session:",
+    ) -> None:
+        if client is None:
+            try:
+                import redis
+            except ImportError as exc:
+                raise RuntimeError(
+                    "SESSION_BACKEND=redis requiere el paquete 'redis' instalado."
+                ) from exc
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self._client = client
+        self.key_prefix = key_prefix
+
+    def _key(self, username: str) -> str:
+        return f"{self.key_prefix}{username}"
+
+    def load(self, username: str) -> Optional[SessionRecord]:
+        raw = self._client.get(self._key(username))
+        if raw is None:
+            return None
+        return SessionRecord.from_json(raw)
+
+    def save(self, record: SessionRecord, ttl_seconds: float) -> None:
+        self._client.set(
+            self._key(record.username),
+            record.to_json(),
+            ex=max(1, int(ttl_seconds)),
+        )
+
+    def delete(self, username: str) -> None:
+        self._client.delete(self._key(username))
+
+
+def build_session_backend(settings: Settings) -> Optional[SessionBackend]:
+    """
+    Construye el backend compartido configurado en `SESSION_BACKEND`. Con `memory`
+    devuelve `None` y las sesiones quedan sólo en el proceso actual. El backend
+    `sqlite` exige `SESSION_BACKEND_URL` para no dejar sesiones vivas en un fichero
+    del directorio de trabajo sin que nadie lo haya elegido.
+    """
+    if settings.session_backend == "sqlite":
+        if not settings.session_backend_url:
+            raise RuntimeError(
+                "SESSION_BACKEND=sqlite requiere indicar en SESSION_BACKEND_URL la "
+                "ruta del fichero de sesiones."
+            )
+        return SqliteSessionBackend(settings.session_backend_url)
+    if settings.session_backend == "redis":
+        return RedisSessionBackend(url=settings.session_backend_url)
+    return None
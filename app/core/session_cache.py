@@ -1,34 +1,302 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from threading import Lock
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from app.infrastructure.bonita.client import BonitaClient
+from app.config import get_settings
+from app.core.monitoring import register_stats_provider
+from app.core.session_backends import (
+    SessionBackend,
+    SessionRecord,
+    build_session_backend,
+)
+from app.infrastructure.bonita.async_client import AsyncBonitaClient
 
-_lock = Lock()
-_active_bonita_sessions: Dict[str, BonitaClient] = {}
+logger = logging.getLogger(__name__)
 
 
-def set_session(username: str, client: BonitaClient) -> None:
+@dataclass
+class SessionStoreStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    logouts: int = 0
+
+
+@dataclass
+class _SessionEntry:
+    client: AsyncBonitaClient
+    last_access: float
+
+
+class SessionStore:
     """
-    Almacena o reemplaza la sesión activa de Bonita asociada a un usuario.
+    Almacén acotado de sesiones de Bonita por usuario.
+
+    Expulsa la sesión menos usada recientemente al superar `max_size` y caduca las
+    sesiones sin uso durante `idle_ttl_seconds`. Los clientes expulsados no se cierran
+    en línea: quedan pendientes hasta que `reap()` ejecuta su `logout()`, y sólo
+    cuando llevan `close_grace_seconds` sin peticiones en curso, porque una petición
+    o un stream iniciado antes de retirarlos puede seguir usándolos. Con un
+    backend compartido (`logout_on_evict=False`) sólo se liberan las conexiones
+    locales, porque otros workers pueden seguir usando la sesión en Bonita.
     """
-    with _lock:
-        _active_bonita_sessions[username] = client
 
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        idle_ttl_seconds: float,
+        logout_on_evict: bool = True,
+        close_grace_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size debe ser mayor o igual a 1.")
+        self.max_size = max_size
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.logout_on_evict = logout_on_evict
+        self.close_grace_seconds = close_grace_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, _SessionEntry]" = OrderedDict()
+        self._pending_logout: List[AsyncBonitaClient] = []
+        self._stats = SessionStoreStats()
+
+    def set(self, username: str, client: AsyncBonitaClient) -> None:
+        with self._lock:
+            previous = self._entries.pop(username, None)
+            if previous is not None and previous.client is not client:
+                self._pending_logout.append(previous.client)
+            self._entries[username] = _SessionEntry(
+                client=client, last_access=self._clock()
+            )
+            while len(self._entries) > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._pending_logout.append(evicted.client)
+                self._stats.evictions += 1
+
+    def get(self, username: str) -> Optional[AsyncBonitaClient]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if now - entry.last_access >= self.idle_ttl_seconds:
+                del self._entries[username]
+                self._pending_logout.append(entry.client)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            entry.last_access = now
+            self._entries.move_to_end(username)
+            self._stats.hits += 1
+            return entry.client
+
+    def remove(
+        self, username: str, *, client: Optional[AsyncBonitaClient] = None
+    ) -> Optional[AsyncBonitaClient]:
+        """
+        Retira la sesión de `username`. Con `client`, sólo si sigue siendo la
+        almacenada (no se ha sustituido por un login posterior).
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or (client is not None and entry.client is not client):
+                return None
+            del self._entries[username]
+            self._pending_logout.append(entry.client)
+            return entry.client
+
+    def purge_expired(self) -> int:
+        """
+        Retira las sesiones inactivas más allá del TTL y devuelve cuántas caducaron.
+        """
+        now = self._clock()
+        expired = 0
+        with self._lock:
+            # El orden LRU garantiza que las entradas más antiguas van primero.
+            while self._entries:
+                username, entry = next(iter(self._entries.items()))
+                if now - entry.last_access < self.idle_ttl_seconds:
+                    break
+                del self._entries[username]
+                self._pending_logout.append(entry.client)
+                expired += 1
+            self._stats.expirations += expired
+        return expired
 
-def get_session(username: str) -> Optional[BonitaClient]:
+    async def reap(self, *, force: bool = False) -> None:
+        """
+        Caduca las sesiones inactivas y cierra en Bonita las sesiones retiradas que
+        ya no están en uso. Con `force` (al apagar) se cierran todas.
+        """
+        self.purge_expired()
+        with self._lock:
+            pending, self._pending_logout = self._pending_logout, []
+            if not force:
+                # Un cliente retirado puede seguir en la petición que lo obtuvo.
+                idle = []
+                for client in pending:
+                    if client.idle_for(self.close_grace_seconds):
+                        idle.append(client)
+                    else:
+                        self._pending_logout.append(client)
+                pending = idle
+        for client in pending:
+            try:
+                if self.logout_on_evict:
+                    await client.logout()
+                await client.aclose()
+            except Exception as exc:
+                logger.warning(
+                    "No se pudo liberar la sesión de Bonita de %s: %s",
+                    client.username,
+                    exc,
+                )
+            else:
+                self._stats.logouts += 1
+
+    async def run_reaper(self, interval_seconds: float) -> None:
+        """
+        Ejecuta `reap()` periódicamente hasta que la tarea sea cancelada.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.reap()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = asdict(self._stats)
+            snapshot.update(
+                size=len(self._entries),
+                max_size=self.max_size,
+                idle_ttl_seconds=self.idle_ttl_seconds,
+                pending_logouts=len(self._pending_logout),
+            )
+        return snapshot
+
+
+class BackendSessionSync:
     """
-    Recupera la sesión activa de Bonita asociada a un usuario.
+    Publica en el backend compartido cada login correcto y permite a los clientes
+    rehidratados adoptar la sesión renovada por otro worker.
     """
-    with _lock:
-        return _active_bonita_sessions.get(username)
+
+    def __init__(self, backend: SessionBackend, ttl_seconds: float) -> None:
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+
+    async def publish(self, client: AsyncBonitaClient) -> None:
+        record = SessionRecord(
+            username=client.username,
+            base_url=client.base_url,
+            state=client.export_session_state(),
+        )
+        await asyncio.to_thread(self._backend.save, record, self._ttl_seconds)
+
+    async def refresh(self, client: AsyncBonitaClient) -> bool:
+        record = await asyncio.to_thread(self._backend.load, client.username)
+        if record is None or record.state == client.export_session_state():
+            return False
+        client.restore_session_state(record.state)
+        return True
+
+
+@lru_cache
+def get_session_backend() -> Optional[SessionBackend]:
+    return build_session_backend(get_settings())
 
 
-def remove_session(username: str) -> Optional[BonitaClient]:
+@lru_cache
+def get_session_store() -> SessionStore:
+    settings = get_settings()
+    return SessionStore(
+        max_size=settings.session_store_max_size,
+        idle_ttl_seconds=settings.access_token_expire_minutes * 60,
+        logout_on_evict=get_session_backend() is None,
+        close_grace_seconds=settings.session_store_close_grace_seconds,
+    )
+
+
+@lru_cache
+def _get_session_sync() -> Optional[BackendSessionSync]:
+    backend = get_session_backend()
+    if backend is None:
+        return None
+    settings = get_settings()
+    return BackendSessionSync(
+        backend, ttl_seconds=settings.access_token_expire_minutes * 60
+    )
+
+
+register_stats_provider("session_store", lambda: get_session_store().stats())
+
+
+async def set_session(username: str, client: AsyncBonitaClient) -> None:
+    """
+    Almacena o reemplaza la sesión activa de Bonita asociada a un usuario y, si hay
+    un backend compartido, la publica para el resto de workers.
     """
-    Elimina y retorna la sesión activa asociada a un usuario, si existe.
+    session_sync = _get_session_sync()
+    if session_sync is not None:
+        client.session_sync = session_sync
+        await session_sync.publish(client)
+    get_session_store().set(username, client)
+
+
+async def get_session(username: str) -> Optional[AsyncBonitaClient]:
     """
-    with _lock:
-        return _active_bonita_sessions.pop(username, None)
+    Recupera la sesión activa de Bonita asociada a un usuario. Si no está en memoria,
+    intenta rehidratarla desde el backend compartido sin volver a autenticarse.
+    """
+    store = get_session_store()
+    client = store.get(username)
+    if client is not None:
+        return client
+
+    backend = get_session_backend()
+    if backend is None:
+        return None
+    record = await asyncio.to_thread(backend.load, username)
+    if record is None:
+        return None
+
+    client = AsyncBonitaClient.from_session_state(
+        base_url=record.base_url, username=username, state=record.state
+    )
+    client.session_sync = _get_session_sync()
+    store.set(username, client)
+    return client
+
+
+async def remove_session(
+    username: str, *, client: Optional[AsyncBonitaClient] = None
+) -> Optional[AsyncBonitaClient]:
+    """
+    Elimina y retorna la sesión activa asociada a un usuario, si existe, también
+    del backend compartido. Con `client` sólo se elimina si la sesión almacenada
+    sigue siendo la de ese cliente, para no borrar la de un login posterior.
+    """
+    backend = get_session_backend()
+    if backend is not None:
+        await asyncio.to_thread(_delete_backend_session, backend, username, client)
+    return get_session_store().remove(username, client=client)
+
 
+def _delete_backend_session(
+    backend: SessionBackend, username: str, client: Optional[AsyncBonitaClient]
+) -> None:
+    if client is not None:
+        record = backend.load(username)
+        if record is None or record.state != client.export_session_state():
+            return
+    backend.delete(username)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, Set
+
+from app.config import get_settings
+from app.core.monitoring import register_stats_provider
+from app.core.session_cache import remove_session
+from app.infrastructure.bonita.async_client import AsyncBonitaClient
+from app.infrastructure.bonita.client import (
+    BonitaAuthenticationError,
+    BonitaClientError,
+)
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_MODES = ("always", "trusted", "background")
+
+
+@dataclass
+class SessionValidationStats:
+    probes_performed: int = 0
+    probes_skipped: int = 0
+    background_probes: int = 0
+    background_failures: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SessionValidator:
+    """
+    Decide cuándo comprobar la sesión de Bonita con `GET /API/system/session/1`.
+
+    - `always`: sondea antes de cada petición (comportamiento histórico).
+    - `trusted`: confía en una sesión validada hace menos de `trust_seconds`; si no,
+      sondea en línea. La expiración real la cubre el reintento ante 401 del cliente.
+    - `background`: igual que `trusted`, pero una sesión caducada se sondea en segundo
+      plano sin retrasar la petición en curso.
+    """
+
+    def __init__(self, mode: str = "trusted", trust_seconds: float = 60) -> None:
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Modo de validación de sesión desconocido: {mode}")
+        self.mode = mode
+        self.trust_seconds = trust_seconds
+        self.stats = SessionValidationStats()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._pending_usernames: Set[str] = set()
+
+    async def ensure_valid(self, client: AsyncBonitaClient) -> None:
+        """
+        Garantiza que la sesión del cliente sea utilizable según el modo configurado.
+        Propaga `BonitaAuthenticationError`/`BonitaClientError` si el sondeo en línea falla.
+        """
+        if self.mode != "always" and client.validated_within(self.trust_seconds):
+            self.stats.probes_skipped += 1
+            return
+
+        if self.mode == "background" and client.last_validated_at is not None:
+            self.stats.probes_skipped += 1
+            self._schedule_background_probe(client)
+            return
+
+        self.stats.probes_performed += 1
+        await client.get_session_info()
+
+    def _schedule_background_probe(self, client: AsyncBonitaClient) -> None:
+        if client.username in self._pending_usernames:
+            return
+        self._pending_usernames.add(client.username)
+        task = asyncio.create_task(self._background_probe(client))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _background_probe(self, client: AsyncBonitaClient) -> None:
+        self.stats.background_probes += 1
+        try:
+            await client.get_session_info()
+        except BonitaAuthenticationError:
+            self.stats.background_failures += 1
+            logger.info(
+                "La sesión de Bonita de %s ya no es válida; se descarta de la caché.",
+                client.username,
+            )
+            # Sólo si sigue siendo la sesión almacenada: el usuario puede haber
+            # iniciado sesión de nuevo mientras se validaba.
+            await remove_session(client.username, client=client)
+        except BonitaClientError as exc:
+            self.stats.background_failures += 1
+            logger.warning(
+                "No se pudo validar en segundo plano la sesión de %s: %s",
+                client.username,
+                exc,
+            )
+        finally:
+            self._pending_usernames.discard(client.username)
+
+
+@lru_cache
+def get_session_validator() -> SessionValidator:
+    settings = get_settings()
+    return SessionValidator(
+        mode=settings.bonita_session_validation,
+        trust_seconds=settings.bonita_session_trust_seconds,
+    )
+
+
+register_stats_provider(
+    "session_validation", lambda: get_session_validator().stats.as_dict()
+)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Deduplica llamadas concurrentes con la misma clave: la primera ejecuta
+    `factory` y las que llegan mientras sigue en vuelo esperan su mismo resultado
+    (o excepción). Al terminar, la clave se libera; no es una caché.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self._stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            self._stats.leaders += 1
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self._stats.coalesced += 1
+        # `shield` evita que la cancelación de un solicitante cancele la llamada
+        # que comparten los demás.
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Marca la excepción como recuperada si ningún solicitante la esperó.
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "in_flight": len(self._in_flight)}
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(slots=True)
+class Span:
+    """
+    Tramo de una traza con el modelo de OpenTelemetry: identificadores W3C
+    (`trace_id` de 32 hex, `span_id` de 16 hex) y tiempos en nanosegundos.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: str = "internal"
+    start_time_ns: int = 0
+    end_time_ns: Optional[int] = None
+    status: str = "unset"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "duration_ms": self.duration_ms}
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None:
+        ...
+
+
+class InMemorySpanExporter:
+    """
+    Conserva los últimos `max_spans` tramos terminados para consultarlos sin
+    infraestructura externa (ver `GET /api/monitoring/traces`).
+    """
+
+    def __init__(self, max_spans: int = 2000) -> None:
+        self._lock = Lock()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class ConsoleSpanExporter:
+    """
+    Escribe cada tramo terminado como una línea JSON en el log.
+    """
+
+    def export(self, span: Span) -> None:
+        logger.info("span %s", json.dumps(span.to_dict(), default=str))
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_exporter: Optional[SpanExporter] = None
+
+
+def configure_tracing(exporter: Optional[SpanExporter]) -> None:
+    """
+    Define el exportador de tramos. Con `None` el tracing queda desactivado y
+    `start_span` no registra nada.
+    """
+    global _exporter
+    _exporter = exporter
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    return _exporter
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    *,
+    kind: str = "internal",
+    parent: Optional[Tuple[str, str]] = None,
+    attributes: Optional[Dict[str, Any]] = None,
+) -> Iterator[Optional[Span]]:
+    """
+    Abre un tramo hijo del tramo activo (o de `parent`, un par `(trace_id,
+    span_id)` recibido en `traceparent`) y lo exporta al cerrarse. Si el tracing
+    está desactivado entrega `None`.
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+
+    if parent is not None:
+        trace_id, parent_span_id = parent
+    else:
+        active = _current_span.get()
+        trace_id = active.trace_id if active is not None else secrets.token_hex(16)
+        parent_span_id = active.span_id if active is not None else None
+
+    span = Span(
+        name=name,
+        trace_id=trace_id,
+        span_id=secrets.token_hex(8),
+        parent_span_id=parent_span_id,
+        kind=kind,
+        start_time_ns=time.time_ns(),
+        attributes=dict(attributes or {}),
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.status = "error"
+        span.attributes.setdefault("exception.type", exc.__class__.__name__)
+        raise
+    else:
+        if span.status == "unset":
+            span.status = "ok"
+    finally:
+        span.end_time_ns = time.time_ns()
+        _current_span.reset(token)
+        exporter.export(span)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorador que envuelve una función (síncrona o asíncrona) en un tramo
+    llamado `name` o, por defecto, con su `__qualname__`.
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with start_span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with start_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def format_traceparent(span: Span) -> str:
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Interpreta una cabecera W3C `traceparent` y devuelve `(trace_id, span_id)`,
+    o `None` si no es válida.
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, span_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16)
+        int(span_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id
+
+
+def propagation_headers() -> Dict[str, str]:
+    """
+    Cabeceras W3C para propagar el tramo activo a un servicio externo.
+    """
+    span = _current_span.get()
+    if span is None:
+        return {}
+    return {"traceparent": format_traceparent(span)}
+
+
+def build_span_exporter(kind: str, *, max_spans: int) -> Optional[SpanExporter]:
+    """
+    Crea el exportador indicado por `TRACING_EXPORTER` (`none`, `memory` o
+    `console`).
+    """
+    if kind == "memory":
+        return InMemorySpanExporter(max_spans=max_spans)
+    if kind == "console":
+        return ConsoleSpanExporter()
+    return None
@@ -1,15 +1,41 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 
+from .config import get_settings
+from .core.monitoring import register_stats_provider
+from .core.rate_limit import AsyncRateLimiter
 from .core.session_cache import get_session, remove_session
-from .domain.contratos.services import ContratosService
+from .core.session_validation import get_session_validator
+from .core.tracing import traced
+from .domain.contratos.bandeja import TaskInboxHub
+from .domain.contratos.importacion import ImportacionMasivaService
+from .domain.contratos.indice import TaskIndexRegistry
+from .domain.contratos.operaciones import TaskCompletionQueue
+from .domain.contratos.services import AsyncContratosService
+from .infrastructure.bonita.async_client import AsyncBonitaClient
+from .infrastructure.bonita.async_contratos_repository import (
+    AsyncBonitaContratosRepository,
+)
+from .infrastructure.bonita.caches import get_process_cache, process_cache_scope
 from .infrastructure.bonita.client import (
     BonitaAuthenticationError,
-    BonitaClient,
     BonitaClientError,
+    BonitaUnavailableError,
+    is_bonita_session_error,
+    is_transient_bonita_error,
+    is_unsent_bonita_error,
+)
+from .infrastructure.persistence.sqlite_checkpoints import (
+    get_import_checkpoint_store,
 )
-from .infrastructure.bonita.contratos_repository import BonitaContratosRepository
+from .infrastructure.persistence.sqlite_operations import get_task_operation_store
 from .security import get_current_user
 
+logger = logging.getLogger(__name__)
+
 
 def _unauthorized_session_exception() -> HTTPException:
     return HTTPException(
@@ -19,28 +45,35 @@ def _unauthorized_session_exception() -> HTTPException:
     )
 
 
-def get_bonita_client(
+@traced("get_bonita_client")
+async def get_bonita_client(
     current_user: str = Depends(get_current_user),
-) -> BonitaClient:
+) -> AsyncBonitaClient:
     """
     Devuelve un cliente autenticado en Bonita reutilizando la sesión almacenada.
+    La sesión sólo se sondea contra Bonita según `BONITA_SESSION_VALIDATION`.
     """
-    client = get_session(current_user)
+    client = await get_session(current_user)
     if client is None:
         raise _unauthorized_session_exception()
 
     if not client.is_session_active:
         try:
-            client.login()
+            await client.login()
         except BonitaAuthenticationError as exc:
-            remove_session(current_user)
+            await remove_session(current_user, client=client)
             raise _unauthorized_session_exception() from exc
 
     try:
-        client.get_session_info()
+        await get_session_validator().ensure_valid(client)
     except BonitaAuthenticationError as exc:
-        remove_session(current_user)
+        await remove_session(current_user, client=client)
         raise _unauthorized_session_exception() from exc
+    except BonitaUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"message": str(exc), "details": exc.details},
+        ) from exc
     except BonitaClientError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -54,11 +87,136 @@ def get_bonita_client(
 
 
 def get_contratos_service(
-    client: BonitaClient = Depends(get_bonita_client),
-) -> ContratosService:
+    client: AsyncBonitaClient = Depends(get_bonita_client),
+) -> AsyncContratosService:
+    """
+    Resuelve la implementación de AsyncContratosService utilizando el repositorio de Bonita.
+    """
+    return _build_contratos_service(client)
+
+
+async def get_contratos_service_for(username: str) -> AsyncContratosService:
+    """
+    Servicio con la sesión de Bonita almacenada de `username`, para tareas en
+    segundo plano fuera de una petición. Lanza `BonitaAuthenticationError` si la
+    sesión ya no existe.
+    """
+    client = await get_session(username)
+    if client is None:
+        raise BonitaAuthenticationError(
+            f"Sesión de Bonita no encontrada o expirada para {username}.",
+            details={"status_code": 401, "reason": "session_not_found"},
+        )
+    if not client.is_session_active:
+        await client.login()
+    return _build_contratos_service(client)
+
+
+def _build_contratos_service(client: AsyncBonitaClient) -> AsyncContratosService:
+    settings = get_settings()
+    repository = AsyncBonitaContratosRepository(
+        client=client,
+        process_cache=get_process_cache(),
+        cache_scope=process_cache_scope(client.username),
+        variables_page_size=settings.bonita_case_variables_page_size,
+        fanout_concurrency=settings.bonita_fanout_concurrency,
+    )
+    return AsyncContratosService(repository=repository)
+
+
+def get_importacion_service(
+    service: AsyncContratosService = Depends(get_contratos_service),
+) -> ImportacionMasivaService:
+    """
+    Servicio de inicio masivo de procesos con checkpoints persistidos en SQLite.
+    """
+    settings = get_settings()
+    return ImportacionMasivaService(
+        service,
+        get_import_checkpoint_store(),
+        max_concurrency=settings.bulk_start_concurrency,
+        rate_limiter=AsyncRateLimiter(settings.bulk_start_rate_per_second),
+        lease_seconds=settings.bulk_start_lease_seconds,
+    )
+
+
+@lru_cache
+def get_task_inbox_hub() -> TaskInboxHub:
+    """
+    Bandeja de tareas compartida por todos los clientes de `tasks:watch`.
+    """
+    settings = get_settings()
+    return TaskInboxHub(
+        poll_seconds=settings.task_inbox_poll_seconds,
+        queue_size=settings.task_inbox_queue_size,
+    )
+
+
+def _task_inbox_stats() -> dict:
+    return get_task_inbox_hub().stats()
+
+
+register_stats_provider("task_inbox", _task_inbox_stats)
+
+
+@lru_cache
+def get_task_index_registry() -> Optional[TaskIndexRegistry]:
     """
-    Resuelve la implementación de ContratosService utilizando el repositorio de Bonita.
+    Índices locales de tareas por usuario para `tasks:search`.
+    Devuelve `None` si `TASK_INDEX_ENABLED` es false.
     """
-    repository = BonitaContratosRepository(client=client)
-    return ContratosService(repository=repository)
+    settings = get_settings()
+    if not settings.task_index_enabled:
+        return None
+    return TaskIndexRegistry(
+        refresh_seconds=settings.task_index_refresh_seconds,
+        full_sync_seconds=settings.task_index_full_sync_seconds,
+        max_users=settings.task_index_max_users,
+        page_size=settings.bonita_stream_page_size,
+    )
+
+
+def _task_index_stats() -> dict:
+    registry = get_task_index_registry()
+    return registry.stats() if registry is not None else {"enabled": False}
+
+
+register_stats_provider("task_index", _task_index_stats)
+
+
+@lru_cache
+def get_task_completion_queue() -> Optional[TaskCompletionQueue]:
+    """
+    Cola de completado de tareas en segundo plano. Devuelve `None` si
+    `TASK_COMPLETION_MODE` es `sync`.
+    """
+    settings = get_settings()
+    if settings.task_completion_mode == "sync":
+        return None
+    if settings.session_backend == "memory":
+        logger.warning(
+            "TASK_COMPLETION_MODE=%s con SESSION_BACKEND=memory: tras un reinicio "
+            "los completados encolados esperan a que su usuario vuelva a iniciar "
+            "sesión.",
+            settings.task_completion_mode,
+        )
+    return TaskCompletionQueue(
+        get_task_operation_store(),
+        get_contratos_service_for,
+        is_retryable=is_transient_bonita_error,
+        is_unsent=is_unsent_bonita_error,
+        is_session_error=is_bonita_session_error,
+        max_concurrency=settings.task_completion_concurrency,
+        max_attempts=settings.task_completion_max_attempts,
+        retry_base_seconds=settings.task_completion_retry_base_seconds,
+        retry_max_seconds=settings.task_completion_retry_max_seconds,
+        lease_seconds=settings.task_completion_lease_seconds,
+    )
+
+
+def _task_completion_queue_stats() -> dict:
+    queue = get_task_completion_queue()
+    return queue.stats() if queue is not None else {"enabled": False}
+
 
+register_stats_provider("task_completion_queue", _task_completion_queue_stats)
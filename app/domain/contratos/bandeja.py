@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .entities import ContractTask
+
+logger = logging.getLogger(__name__)
+
+TaskFetcher = Callable[[], Awaitable[Iterable[ContractTask]]]
+
+# Tipos de evento que recibe un suscriptor de la bandeja.
+SNAPSHOT_EVENT = "snapshot"
+CHANGES_EVENT = "changes"
+ERROR_EVENT = "error"
+
+
+@dataclass(slots=True)
+class TaskInboxDiff:
+    added: List[ContractTask] = field(default_factory=list)
+    changed: List[ContractTask] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+@dataclass(frozen=True, slots=True)
+class TaskInboxEvent:
+    kind: str
+    tasks: Tuple[ContractTask, ...] = ()
+    diff: Optional[TaskInboxDiff] = None
+    error: Optional[Exception] = None
+
+
+def diff_tasks(
+    previous: Dict[str, ContractTask], current: Iterable[ContractTask]
+) -> Tuple[TaskInboxDiff, Dict[str, ContractTask]]:
+    """
+    Compara dos consultas consecutivas de tareas y devuelve las añadidas, las
+    modificadas (cualquier campo, `metadata` incluido) y los ids eliminados,
+    junto con la nueva instantánea indexada por id.
+    """
+    snapshot = {task.id: task for task in current}
+    diff = TaskInboxDiff()
+    for task_id, task in snapshot.items():
+        old = previous.get(task_id)
+        if old is None:
+            diff.added.append(task)
+        elif old != task:
+            diff.changed.append(task)
+    diff.removed = [task_id for task_id in previous if task_id not in snapshot]
+    return diff, snapshot
+
+
+class _TaskInboxPoller:
+    """
+    Consulta periódicamente las tareas de una clave (usuario y filtros) y reparte
+    los cambios entre todos sus suscriptores. Sólo existe mientras tenga alguno.
+    """
+
+    def __init__(
+        self,
+        fetch: TaskFetcher,
+        *,
+        poll_seconds: float,
+        max_backoff_seconds: float,
+        queue_size: int,
+    ) -> None:
+        self.fetch = fetch
+        self._poll_seconds = poll_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._queue_size = queue_size
+        self._subscribers: Set["asyncio.Queue[TaskInboxEvent]"] = set()
+        self._snapshot: Optional[Dict[str, ContractTask]] = None
+        self._wake = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.polls = 0
+        self.events = 0
+        self.resyncs = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> "asyncio.Queue[TaskInboxEvent]":
+        queue: "asyncio.Queue[TaskInboxEvent]" = asyncio.Queue(self._queue_size)
+        self._subscribers.add(queue)
+        if self._snapshot is not None:
+            queue.put_nowait(self._snapshot_event())
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[TaskInboxEvent]") -> None:
+        self._subscribers.discard(queue)
+
+    def refresh(self) -> None:
+        self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _snapshot_event(self) -> TaskInboxEvent:
+        return TaskInboxEvent(
+            SNAPSHOT_EVENT, tasks=tuple((self._snapshot or {}).values())
+        )
+
+    def _publish(self, event: TaskInboxEvent) -> None:
+        self.events += 1
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # El cliente no consume al ritmo de los cambios: en lugar de
+                # acumularlos se descartan y se le reenvía la instantánea completa.
+                self.resyncs += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._snapshot_event())
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            self._wake.clear()
+            try:
+                self.polls += 1
+                tasks = await self.fetch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                failures += 1
+                logger.warning("Error consultando la bandeja de tareas: %s", exc)
+                self._publish(TaskInboxEvent(ERROR_EVENT, error=exc))
+            else:
+                failures = 0
+                if self._snapshot is None:
+                    _, self._snapshot = diff_tasks({}, tasks)
+                    self._publish(self._snapshot_event())
+                else:
+                    diff, self._snapshot = diff_tasks(self._snapshot, tasks)
+                    if not diff.empty:
+                        self._publish(TaskInboxEvent(CHANGES_EVENT, diff=diff))
+
+            backoff = self._poll_seconds * 2 ** min(failures, 10)
+            delay = min(backoff, self._max_backoff_seconds)
+            # `asyncio.timeout` y no `wait_for`: en 3.11 `wait_for` pierde la
+            # cancelación de `stop()` si `refresh()` despierta el bucle a la vez.
+            with contextlib.suppress(asyncio.TimeoutError):
+                async with asyncio.timeout(delay):
+                    await self._wake.wait()
+
+
+class TaskInboxHub:
+    """
+    Agrupa a los clientes que observan las mismas tareas para que N suscriptores
+    de un usuario y filtros generen una sola consulta a Bonita por intervalo.
+    """
+
+    def __init__(
+        self,
+        *,
+        poll_seconds: float = 5.0,
+        max_backoff_seconds: float = 60.0,
+        queue_size: int = 100,
+    ) -> None:
+        self._poll_seconds = poll_seconds
+        self._max_backoff_seconds = max(poll_seconds, max_backoff_seconds)
+        self._queue_size = queue_size
+        self._pollers: Dict[Hashable, _TaskInboxPoller] = {}
+        # Contadores acumulados de los pollers ya detenidos.
+        self._retired = {"polls": 0, "events": 0, "resyncs": 0}
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+        self, key: Hashable, fetch: TaskFetcher
+    ) -> AsyncIterator["asyncio.Queue[TaskInboxEvent]"]:
+        """
+        Suscribe a los eventos de `key`. El primer evento es siempre la
+        instantánea completa (`snapshot`); después sólo llegan los cambios. El
+        primer elemento de `key` debe ser el usuario (ver `refresh`).
+        """
+        poller = self._pollers.get(key)
+        if poller is None:
+            poller = _TaskInboxPoller(
+                fetch,
+                poll_seconds=self._poll_seconds,
+                max_backoff_seconds=self._max_backoff_seconds,
+                queue_size=self._queue_size,
+            )
+            self._pollers[key] = poller
+        else:
+            # Se usa el cliente del suscriptor más reciente, cuya sesión de Bonita
+            # es la que con más probabilidad sigue vigente.
+            poller.fetch = fetch
+        queue = poller.subscribe()
+        try:
+            yield queue
+        finally:
+            poller.unsubscribe(queue)
+            if not poller.subscribers and self._pollers.get(key) is poller:
+                del self._pollers[key]
+                await self._retire(poller)
+
+    def refresh(self, scope: str) -> None:
+        """
+        Adelanta la siguiente consulta de las bandejas de un usuario, p.ej. tras
+        asignar o completar una tarea.
+        """
+        for key, poller in self._pollers.items():
+            if isinstance(key, tuple) and key and key[0] == scope:
+                poller.refresh()
+
+    async def _retire(self, poller: _TaskInboxPoller) -> None:
+        await poller.stop()
+        for name in self._retired:
+            self._retired[name] += getattr(poller, name)
+
+    async def close(self) -> None:
+        pollers = list(self._pollers.values())
+        self._pollers.clear()
+        for poller in pollers:
+            await self._retire(poller)
+
+    def stats(self) -> Dict[str, Any]:
+        pollers = list(self._pollers.values())
+        return {
+            "pollers": len(pollers),
+            "subscribers": sum(poller.subscribers for poller in pollers),
+            **{
+                name: total + sum(getattr(poller, name) for poller in pollers)
+                for name, total in self._retired.items()
+            },
+        }
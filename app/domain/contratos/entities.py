@@ -25,6 +25,10 @@ class ContractTask:
     display_name: str
     state: str
     assigned_id: Optional[str] = None
+    last_update_date: Optional[str] = None
+    case_id: Optional[str] = None
+    process_id: Optional[str] = None
+    due_date: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -52,3 +56,25 @@ class ContractCaseWithVariables:
     variables: List[ContractCaseVariable] = field(default_factory=list)
 
 
+@dataclass(slots=True)
+class TaskAssignment:
+    task_id: str
+    user_id: str
+
+
+@dataclass(slots=True)
+class TaskCompletion:
+    task_id: str
+    contract_inputs: Optional[Dict[str, Any]] = None
+    variables: Optional[Dict[str, Any]] = None
+
+
+@dataclass(slots=True)
+class TaskOperationResult:
+    task_id: str
+    error: Optional[Exception] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Set, Tuple, Union
+
+from ...core.rate_limit import AsyncRateLimiter
+from .services import AsyncContratosService
+
+
+class ImportJobConflictError(Exception):
+    """El `job_id` ya pertenece a una importación de otro proceso o usuario."""
+
+
+class ImportJobRunningError(ImportJobConflictError):
+    """Otra ejecución de la misma importación sigue en curso."""
+
+
+@dataclass(slots=True)
+class ImportJobSummary:
+    job_id: str
+    process_id: str
+    owner: str
+    succeeded: int = 0
+    failed: int = 0
+    case_ids: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ImportRunReport:
+    job_id: str
+    process_id: str
+    received: int = 0
+    started: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class ImportCheckpointStore(Protocol):
+    """
+    Persiste el avance de una importación para poder reanudarla tras un fallo.
+    """
+
+    async def start_job(
+        self,
+        job_id: str,
+        process_id: str,
+        owner: str,
+        run_id: str,
+        running_until: float,
+    ) -> None:
+        """
+        Registra la importación o la reanuda a nombre de `run_id` hasta
+        `running_until`. Lanza `ImportJobConflictError` si `job_id` ya existe para
+        otro proceso o usuario, e `ImportJobRunningError` si otra ejecución lo
+        tiene reservado y su reserva no ha caducado.
+        """
+        ...
+
+    async def renew_job(self, job_id: str, run_id: str, running_until: float) -> None:
+        ...
+
+    async def finish_job(self, job_id: str, run_id: str) -> None:
+        """
+        Libera la reserva de `run_id` para que la importación pueda reanudarse.
+        """
+        ...
+
+    async def completed_lines(self, job_id: str) -> Set[int]:
+        ...
+
+    async def record_success(self, job_id: str, line_no: int, case_id: str) -> None:
+        ...
+
+    async def record_failure(self, job_id: str, line_no: int, error: str) -> None:
+        ...
+
+    async def summary(self, job_id: str) -> Optional[ImportJobSummary]:
+        ...
+
+
+class ImportacionMasivaService:
+    """
+    Instancia un proceso por cada registro de un flujo de entradas de contrato.
+
+    Lee el flujo de forma perezosa: sólo hay `max_concurrency` registros en vuelo, de
+    modo que la entrada nunca se carga completa en memoria. Cada resultado queda en
+    `checkpoints`; al repetir el mismo `job_id` se omiten las líneas ya iniciadas y se
+    reintentan las fallidas. Cada ejecución reserva el `job_id` durante
+    `lease_seconds` (y renueva la reserva mientras avanza), de modo que un
+    reenvío mientras sigue en curso se rechaza en lugar de duplicar los casos.
+    """
+
+    def __init__(
+        self,
+        service: AsyncContratosService,
+        checkpoints: ImportCheckpointStore,
+        *,
+        max_concurrency: int = 10,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        self._service = service
+        self._checkpoints = checkpoints
+        self._max_concurrency = max(1, max_concurrency)
+        self._rate_limiter = rate_limiter
+        self._lease_seconds = lease_seconds
+
+    async def importar(
+        self,
+        job_id: str,
+        process_id: str,
+        owner: str,
+        records: AsyncIterator[Tuple[int, Union[Dict[str, Any], ValueError]]],
+    ) -> ImportRunReport:
+        run_id = uuid.uuid4().hex
+        await self._checkpoints.start_job(
+            job_id, process_id, owner, run_id, time.time() + self._lease_seconds
+        )
+        lease = asyncio.create_task(self._keep_lease(job_id, run_id))
+        try:
+            return await self._run(job_id, process_id, records)
+        finally:
+            lease.cancel()
+            await asyncio.gather(lease, return_exceptions=True)
+            await self._checkpoints.finish_job(job_id, run_id)
+
+    async def _keep_lease(self, job_id: str, run_id: str) -> None:
+        while True:
+            await asyncio.sleep(self._lease_seconds / 3)
+            await self._checkpoints.renew_job(
+                job_id, run_id, time.time() + self._lease_seconds
+            )
+
+    async def _run(
+        self,
+        job_id: str,
+        process_id: str,
+        records: AsyncIterator[Tuple[int, Union[Dict[str, Any], ValueError]]],
+    ) -> ImportRunReport:
+        completed = await self._checkpoints.completed_lines(job_id)
+        report = ImportRunReport(job_id=job_id, process_id=process_id)
+
+        slots = asyncio.Semaphore(self._max_concurrency)
+        in_flight: Set[asyncio.Task] = set()
+
+        async def start(line_no: int, contract_inputs: Dict[str, Any]) -> None:
+            try:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire()
+                result = await self._service.iniciar_proceso(
+                    process_id, contract_inputs=contract_inputs or None
+                )
+            except Exception as exc:
+                report.failed += 1
+                await self._checkpoints.record_failure(job_id, line_no, str(exc))
+            else:
+                report.started += 1
+                await self._checkpoints.record_success(
+                    job_id, line_no, result.case_id
+                )
+            finally:
+                slots.release()
+
+        try:
+            async for line_no, record in records:
+                report.received += 1
+                if line_no in completed:
+                    report.skipped += 1
+                    continue
+                if isinstance(record, ValueError):
+                    report.failed += 1
+                    await self._checkpoints.record_failure(job_id, line_no, str(record))
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(start(line_no, record))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            raise
+        return report
+
+    async def obtener_resumen(self, job_id: str) -> Optional[ImportJobSummary]:
+        return await self._checkpoints.summary(job_id)
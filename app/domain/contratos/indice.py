@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .entities import ContractTask
+from .services import AsyncContratosService
+
+# Campos por los que se puede ordenar (con los nombres de Bonita que acepta
+# `sort` en `listar_tareas`) y atributo de `ContractTask` correspondiente.
+TASK_SORT_FIELDS: Dict[str, str] = {
+    "id": "id",
+    "name": "name",
+    "displayName": "display_name",
+    "state": "state",
+    "assigned_id": "assigned_id",
+    "caseId": "case_id",
+    "processId": "process_id",
+    "dueDate": "due_date",
+    "last_update_date": "last_update_date",
+}
+DEFAULT_TASK_SORT = "dueDate ASC"
+
+# Índices secundarios por igualdad: atributo de la tarea indexado.
+_EQUALITY_INDEXES = ("state", "process_id", "assigned_id", "case_id")
+
+
+@dataclass(frozen=True, slots=True)
+class TaskQuery:
+    states: FrozenSet[str] = frozenset()
+    process_id: Optional[str] = None
+    assigned_id: Optional[str] = None
+    case_id: Optional[str] = None
+    text: Optional[str] = None
+    due_after: Optional[str] = None
+    due_before: Optional[str] = None
+    sort: str = DEFAULT_TASK_SORT
+    page: int = 0
+    count: int = 10
+
+
+def parse_task_sort(raw: Optional[str]) -> Tuple[str, bool]:
+    """
+    Interpreta `campo ASC|DESC` y devuelve el atributo y si es descendente.
+    Lanza `ValueError` si el campo no admite ordenación local.
+    """
+    name, _, direction = (raw or DEFAULT_TASK_SORT).strip().partition(" ")
+    direction = direction.strip().upper() or "ASC"
+    if name not in TASK_SORT_FIELDS or direction not in ("ASC", "DESC"):
+        raise ValueError(
+            "Orden no admitido: usa 'campo ASC|DESC' con uno de "
+            + ", ".join(sorted(TASK_SORT_FIELDS))
+            + "."
+        )
+    return TASK_SORT_FIELDS[name], direction == "DESC"
+
+
+class TaskIndex:
+    """
+    Copia local de las tareas de un usuario con índices secundarios por estado,
+    proceso, asignado y caso, y una vista ordenada por fecha de vencimiento, de
+    modo que los filtros y ordenaciones se resuelven sin consultar Bonita.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, ContractTask] = {}
+        self._by: Dict[str, Dict[str, Set[str]]] = {
+            attribute: {} for attribute in _EQUALITY_INDEXES
+        }
+        # (due_date, id) ordenado; las tareas sin vencimiento no aparecen.
+        self._by_due: List[Tuple[str, str]] = []
+        # Mayor `last_update_date` visto: punto de partida del refresco incremental.
+        self.watermark: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, task_id: str) -> Optional[ContractTask]:
+        return self._tasks.get(task_id)
+
+    def upsert(self, task: ContractTask) -> bool:
+        """
+        Inserta o sustituye una tarea. Devuelve `False` si ya estaba igual.
+        """
+        old = self._tasks.get(task.id)
+        if old == task:
+            return False
+        if old is not None:
+            self._unindex(old)
+        self._tasks[task.id] = task
+        for attribute, index in self._by.items():
+            value = getattr(task, attribute)
+            if value is not None:
+                index.setdefault(value, set()).add(task.id)
+        if task.due_date:
+            insort(self._by_due, (task.due_date, task.id))
+        if task.last_update_date and (
+            self.watermark is None or task.last_update_date > self.watermark
+        ):
+            self.watermark = task.last_update_date
+        return True
+
+    def discard(self, task_id: str) -> bool:
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return False
+        self._unindex(task)
+        return True
+
+    def replace_all(self, tasks: Iterable[ContractTask]) -> None:
+        """
+        Sustituye el contenido por `tasks`, tocando sólo las tareas que cambian.
+        """
+        current = {task.id: task for task in tasks}
+        for task_id in [task_id for task_id in self._tasks if task_id not in current]:
+            self.discard(task_id)
+        for task in current.values():
+            self.upsert(task)
+
+    def _unindex(self, task: ContractTask) -> None:
+        for attribute, index in self._by.items():
+            value = getattr(task, attribute)
+            ids = index.get(value) if value is not None else None
+            if ids is not None:
+                ids.discard(task.id)
+                if not ids:
+                    del index[value]
+        if task.due_date:
+            position = bisect_left(self._by_due, (task.due_date, task.id))
+            if position < len(self._by_due) and self._by_due[position][1] == task.id:
+                del self._by_due[position]
+
+    def _candidates(self, query: TaskQuery) -> Optional[Set[str]]:
+        """
+        Ids que cumplen los filtros indexados, intersecando primero los conjuntos
+        más pequeños. `None` significa que no hay filtro indexado (todas).
+        """
+        groups: List[Set[str]] = []
+        if query.states:
+            by_state = self._by["state"]
+            groups.append(
+                set().union(*(by_state.get(state, ()) for state in query.states))
+            )
+        for attribute in ("process_id", "assigned_id", "case_id"):
+            value = getattr(query, attribute)
+            if value is not None:
+                groups.append(self._by[attribute].get(value, set()))
+        if query.due_after is not None or query.due_before is not None:
+            start = (
+                bisect_left(self._by_due, (query.due_after,))
+                if query.due_after is not None
+                else 0
+            )
+            # `due_before` es exclusivo: (fecha,) ordena antes que (fecha, id).
+            end = (
+                bisect_left(self._by_due, (query.due_before,))
+                if query.due_before is not None
+                else len(self._by_due)
+            )
+            groups.append({task_id for _, task_id in self._by_due[start:end]})
+        if not groups:
+            return None
+        groups.sort(key=len)
+        result = set(groups[0])
+        for group in groups[1:]:
+            result &= group
+        return result
+
+    def query(self, query: TaskQuery) -> Tuple[int, List[ContractTask]]:
+        """
+        Devuelve el total de tareas que cumplen `query` y la página pedida.
+        """
+        attribute, descending = parse_task_sort(query.sort)
+        candidates = self._candidates(query)
+        text = query.text.casefold() if query.text else None
+
+        def matches(task: ContractTask) -> bool:
+            if candidates is not None and task.id not in candidates:
+                return False
+            return text is None or (
+                text in task.display_name.casefold() or text in task.name.casefold()
+            )
+
+        if attribute == "due_date":
+            # Vista ya ordenada: se recorre sin ordenar; las tareas sin
+            # vencimiento van al final.
+            due = reversed(self._by_due) if descending else iter(self._by_due)
+            ordered = [self._tasks[task_id] for _, task_id in due]
+            ordered.extend(task for task in self._tasks.values() if not task.due_date)
+            selected = [task for task in ordered if matches(task)]
+        else:
+            pool: Iterable[ContractTask] = (
+                self._tasks.values()
+                if candidates is None
+                else (self._tasks[task_id] for task_id in candidates)
+            )
+            selected = [task for task in pool if matches(task)]
+            selected = _sorted_by(selected, attribute, descending)
+
+        start = query.page * query.count
+        return len(selected), selected[start : start + query.count]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tasks": len(self._tasks),
+            "states": {state: len(ids) for state, ids in self._by["state"].items()},
+        }
+
+
+def _sorted_by(
+    tasks: List[ContractTask], attribute: str, descending: bool
+) -> List[ContractTask]:
+    # Los valores vacíos quedan siempre al final, en ambos sentidos; el id
+    # desempata para que la paginación sea estable.
+    present = [task for task in tasks if getattr(task, attribute)]
+    missing = [task for task in tasks if not getattr(task, attribute)]
+    present.sort(
+        key=lambda task: (getattr(task, attribute), task.id), reverse=descending
+    )
+    missing.sort(key=lambda task: task.id)
+    return present + missing
+
+
+@dataclass(slots=True)
+class _IndexEntry:
+    index: TaskIndex
+    lock: asyncio.Lock
+    last_refresh: float = 0.0
+    last_full_sync: Optional[float] = None
+    stale: bool = False
+
+
+class TaskIndexRegistry:
+    """
+    Mantiene un `TaskIndex` por usuario, refrescado al consultarlo: si el último
+    refresco tiene más de `refresh_seconds` (o hubo escrituras) se piden a
+    Bonita sólo las tareas actualizadas desde la marca `last_update_date`, y
+    cada `full_sync_seconds` se recorren todas para detectar las que ya no
+    existen. Conserva como máximo `max_users` índices (LRU).
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_seconds: float = 10.0,
+        full_sync_seconds: float = 300.0,
+        max_users: int = 100,
+        page_size: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._refresh_seconds = refresh_seconds
+        self._full_sync_seconds = full_sync_seconds
+        self._max_users = max_users
+        self._page_size = page_size
+        self._clock = clock
+        self._entries: "OrderedDict[str, _IndexEntry]" = OrderedDict()
+        self.full_syncs = 0
+        self.incremental_refreshes = 0
+        self.evictions = 0
+
+    async def get(self, scope: str, service: AsyncContratosService) -> TaskIndex:
+        """
+        Devuelve el índice de `scope` actualizado con el servicio del usuario.
+        """
+        entry = self._entries.get(scope)
+        if entry is None:
+            entry = _IndexEntry(index=TaskIndex(), lock=asyncio.Lock())
+            self._entries[scope] = entry
+            while len(self._entries) > self._max_users:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        self._entries.move_to_end(scope)
+
+        async with entry.lock:
+            now = self._clock()
+            if (
+                entry.last_full_sync is None
+                or now - entry.last_full_sync >= self._full_sync_seconds
+            ):
+                await self._full_sync(entry.index, service)
+                entry.last_full_sync = entry.last_refresh = now
+                entry.stale = False
+            elif entry.stale or now - entry.last_refresh >= self._refresh_seconds:
+                await self._incremental_refresh(entry.index, service)
+                entry.last_refresh = now
+                entry.stale = False
+        return entry.index
+
+    async def _full_sync(
+        self, index: TaskIndex, service: AsyncContratosService
+    ) -> None:
+        self.full_syncs += 1
+        tasks = service.iterar_tareas(
+            state=None, page_size=self._page_size, include_metadata=False
+        )
+        index.replace_all([task async for task in tasks])
+
+    async def _incremental_refresh(
+        self, index: TaskIndex, service: AsyncContratosService
+    ) -> None:
+        self.incremental_refreshes += 1
+        watermark = index.watermark
+        tasks = service.iterar_tareas(
+            state=None,
+            sort="last_update_date DESC",
+            page_size=self._page_size,
+            include_metadata=False,
+        )
+        async with contextlib.aclosing(tasks):
+            async for task in tasks:
+                # Con la marca incluida: varias tareas pueden compartir la fecha.
+                if (
+                    watermark is not None
+                    and task.last_update_date is not None
+                    and task.last_update_date < watermark
+                ):
+                    break
+                index.upsert(task)
+
+    def mark_stale(self, scope: str) -> None:
+        """
+        Fuerza un refresco incremental en la próxima consulta del usuario.
+        """
+        entry = self._entries.get(scope)
+        if entry is not None:
+            entry.stale = True
+
+    def forget_task(self, scope: str, task_id: str) -> None:
+        """
+        Retira una tarea completada, que Bonita deja de listar y que el refresco
+        incremental no puede detectar.
+        """
+        entry = self._entries.get(scope)
+        if entry is not None:
+            entry.index.discard(task_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "users": len(self._entries),
+            "tasks": sum(len(entry.index) for entry in self._entries.values()),
+            "full_syncs": self.full_syncs,
+            "incremental_refreshes": self.incremental_refreshes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+)
+
+from .entities import TaskCompletion
+from .services import AsyncContratosService
+
+logger = logging.getLogger(__name__)
+
+# Estados de una operación encolada.
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+# Sin sesión de Bonita del usuario: se reanuda cuando vuelve a iniciar sesión.
+WAITING_SESSION = "waiting_session"
+
+COMPLETE_TASK = "complete_task"
+
+ServiceFactory = Callable[[str], Awaitable[AsyncContratosService]]
+
+
+@dataclass(slots=True)
+class TaskOperation:
+    operation_id: str
+    kind: str
+    owner: str
+    task_id: str
+    payload: Dict[str, Any]
+    status: str = PENDING
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    next_attempt_at: float = 0.0
+
+
+class TaskOperationStore(Protocol):
+    """
+    Cola persistente de operaciones sobre tareas: sobrevive a reinicios y permite
+    consultar el resultado de cada operación después de ejecutarse.
+
+    Cada operación reclamada queda a nombre del worker (`worker_id`) hasta
+    `lease_until`; los cambios de estado posteriores sólo se aplican si el worker
+    conserva ese arrendamiento.
+    """
+
+    async def enqueue(self, operation: TaskOperation) -> TaskOperation:
+        """
+        Guarda la operación y la devuelve. Si el mismo usuario ya tiene una
+        operación del mismo tipo sin terminar para la tarea, devuelve esa.
+        """
+        ...
+
+    async def claim(
+        self, worker_id: str, limit: int, now: float, lease_until: float
+    ) -> List[TaskOperation]:
+        """
+        Marca como `running` y devuelve hasta `limit` operaciones pendientes cuyo
+        `next_attempt_at` ya pasó, por orden de llegada. También reclama las
+        `running` cuyo arrendamiento caducó (su worker se detuvo), contando el
+        intento interrumpido.
+        """
+        ...
+
+    async def renew(
+        self, worker_id: str, operation_ids: List[str], lease_until: float
+    ) -> None:
+        ...
+
+    async def release(self, worker_id: str, operation_ids: List[str]) -> None:
+        """
+        Devuelve a `pending` las operaciones interrumpidas al detener el worker,
+        contando el intento, para que otro las reclame sin esperar a que caduque
+        el arrendamiento.
+        """
+        ...
+
+    async def mark_succeeded(self, worker_id: str, operation_id: str) -> None:
+        ...
+
+    async def mark_retry(
+        self, worker_id: str, operation_id: str, error: str, next_attempt_at: float
+    ) -> None:
+        ...
+
+    async def mark_failed(self, worker_id: str, operation_id: str, error: str) -> None:
+        ...
+
+    async def mark_waiting_session(
+        self, worker_id: str, operation_id: str, error: str
+    ) -> None:
+        """
+        Aparca la operación en `waiting_session` sin contar el intento.
+        """
+        ...
+
+    async def resume_waiting(self, owner: str, now: float) -> int:
+        """
+        Devuelve a `pending` las operaciones de `owner` que esperaban sesión.
+        Devuelve cuántas eran.
+        """
+        ...
+
+    async def get(self, operation_id: str) -> Optional[TaskOperation]:
+        ...
+
+
+class TaskCompletionQueue:
+    """
+    Completa tareas en segundo plano (write-behind): `encolar` persiste la
+    operación y vuelve de inmediato, y `run` la ejecuta contra Bonita con
+    `max_concurrency` operaciones en vuelo.
+
+    Completar no es idempotente, así que sólo se repite sin más un intento que
+    seguro no llegó a Bonita (`is_unsent`). Tras cualquier otro fallo, y antes de
+    cada reintento, se comprueba si la tarea ya quedó completada; si no, los
+    errores transitorios (`is_retryable`) se reintentan con espera exponencial
+    hasta `max_attempts` intentos y el resto deja la operación `failed`. Si falta
+    la sesión del usuario (`is_session_error`) la operación espera en
+    `waiting_session` hasta `reanudar`.
+    """
+
+    def __init__(
+        self,
+        store: TaskOperationStore,
+        service_factory: ServiceFactory,
+        *,
+        is_retryable: Callable[[Exception], bool],
+        is_unsent: Callable[[Exception], bool],
+        is_session_error: Callable[[Exception], bool],
+        max_concurrency: int = 4,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 60.0,
+        lease_seconds: float = 60.0,
+        poll_seconds: float = 1.0,
+        on_completed: Optional[Callable[[TaskOperation], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._store = store
+        self._service_factory = service_factory
+        self._is_retryable = is_retryable
+        self._is_unsent = is_unsent
+        self._is_session_error = is_session_error
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_attempts = max(1, max_attempts)
+        self._retry_base_seconds = retry_base_seconds
+        self._retry_max_seconds = retry_max_seconds
+        self._lease_seconds = lease_seconds
+        self._poll_seconds = min(poll_seconds, lease_seconds / 3)
+        self._clock = clock
+        self.worker_id = uuid.uuid4().hex
+        self.on_completed = on_completed
+        self._wake = asyncio.Event()
+        self._in_flight: Dict[str, "asyncio.Task[None]"] = {}
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.waiting_session = 0
+
+    async def encolar(self, owner: str, completion: TaskCompletion) -> TaskOperation:
+        now = self._clock()
+        operation = await self._store.enqueue(
+            TaskOperation(
+                operation_id=uuid.uuid4().hex,
+                kind=COMPLETE_TASK,
+                owner=owner,
+                task_id=completion.task_id,
+                payload={
+                    "contract_inputs": completion.contract_inputs,
+                    "variables": completion.variables,
+                },
+                created_at=now,
+                updated_at=now,
+                next_attempt_at=now,
+            )
+        )
+        self._wake.set()
+        return operation
+
+    async def obtener(self, operation_id: str) -> Optional[TaskOperation]:
+        return await self._store.get(operation_id)
+
+    async def reanudar(self, owner: str) -> int:
+        """
+        Vuelve a poner en cola las operaciones de `owner` que esperaban una
+        sesión de Bonita; se llama cuando el usuario inicia sesión.
+        """
+        resumed = await self._store.resume_waiting(owner, self._clock())
+        if resumed:
+            self._wake.set()
+        return resumed
+
+    async def run(self) -> None:
+        """
+        Bucle de los workers; se detiene al cancelarlo. Las operaciones en vuelo
+        se cancelan y se devuelven a la cola; si el proceso muere sin hacerlo, las
+        reclama otro worker cuando caduca su arrendamiento.
+        """
+        renewed_at = self._clock()
+        try:
+            while True:
+                self._wake.clear()
+                now = self._clock()
+                if self._in_flight and now - renewed_at >= self._lease_seconds / 3:
+                    await self._store.renew(
+                        self.worker_id, list(self._in_flight), now + self._lease_seconds
+                    )
+                    renewed_at = now
+                free = self._max_concurrency - len(self._in_flight)
+                claimed = (
+                    await self._store.claim(
+                        self.worker_id, free, now, now + self._lease_seconds
+                    )
+                    if free > 0
+                    else []
+                )
+                for operation in claimed:
+                    task = asyncio.create_task(self._execute(operation))
+                    self._in_flight[operation.operation_id] = task
+                    task.add_done_callback(
+                        lambda _, operation_id=operation.operation_id: self._finished(
+                            operation_id
+                        )
+                    )
+                if len(claimed) == free and free > 0:
+                    # Puede haber más pendientes: se vuelve a mirar sin esperar.
+                    continue
+                # `asyncio.timeout` y no `wait_for`: en 3.11 `wait_for` pierde la
+                # cancelación si `_wake` se activa a la vez, y el bucle no para.
+                with contextlib.suppress(asyncio.TimeoutError):
+                    async with asyncio.timeout(self._poll_seconds):
+                        await self._wake.wait()
+        finally:
+            in_flight = dict(self._in_flight)
+            for task in in_flight.values():
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight.values(), return_exceptions=True)
+                await self._store.release(self.worker_id, list(in_flight))
+
+    def _finished(self, operation_id: str) -> None:
+        self._in_flight.pop(operation_id, None)
+        # Hay un hueco libre: el despachador puede reclamar otra operación.
+        self._wake.set()
+
+    async def _execute(self, operation: TaskOperation) -> None:
+        attempt = operation.attempts + 1
+        service: Optional[AsyncContratosService] = None
+        try:
+            service = await self._service_factory(operation.owner)
+            # Un intento anterior pudo completarla aunque no recibiera respuesta.
+            if not (
+                operation.attempts and await service.tarea_completada(operation.task_id)
+            ):
+                await service.completar_tarea(
+                    operation.task_id,
+                    contract_inputs=operation.payload.get("contract_inputs") or None,
+                    variables=operation.payload.get("variables") or None,
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await self._handle_failure(operation, service, attempt, exc)
+            return
+        await self._succeed(operation)
+
+    async def _handle_failure(
+        self,
+        operation: TaskOperation,
+        service: Optional[AsyncContratosService],
+        attempt: int,
+        exc: Exception,
+    ) -> None:
+        if self._is_session_error(exc):
+            self.waiting_session += 1
+            await self._store.mark_waiting_session(
+                self.worker_id, operation.operation_id, str(exc)
+            )
+            return
+        retryable = self._is_retryable(exc)
+        if service is not None and not self._is_unsent(exc):
+            # La petición pudo llegar a Bonita: se mira si la tarea se completó.
+            try:
+                if await service.tarea_completada(operation.task_id):
+                    await self._succeed(operation)
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Sin saberlo no se puede dar por fallida; el siguiente intento
+                # vuelve a comprobarlo antes de repetir el completado.
+                retryable = True
+        if retryable and attempt < self._max_attempts:
+            self.retries += 1
+            delay = min(
+                self._retry_base_seconds * 2 ** (attempt - 1),
+                self._retry_max_seconds,
+            )
+            await self._store.mark_retry(
+                self.worker_id, operation.operation_id, str(exc), self._clock() + delay
+            )
+            # Sin esperar al siguiente sondeo si el reintento vence antes.
+            asyncio.get_running_loop().call_later(delay, self._wake.set)
+            return
+        self.failed += 1
+        logger.warning(
+            "La operación %s sobre la tarea %s falló tras %s intentos: %s",
+            operation.operation_id,
+            operation.task_id,
+            attempt,
+            exc,
+        )
+        await self._store.mark_failed(self.worker_id, operation.operation_id, str(exc))
+
+    async def _succeed(self, operation: TaskOperation) -> None:
+        self.succeeded += 1
+        await self._store.mark_succeeded(self.worker_id, operation.operation_id)
+        if self.on_completed is not None:
+            self.on_completed(operation)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "waiting_session": self.waiting_session,
+        }
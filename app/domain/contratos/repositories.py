@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable, Protocol
+from typing import AsyncIterator, Iterable, Iterator, Protocol
 
 from .entities import (
     ContractCase,
@@ -18,7 +18,12 @@ class ContratosRepository(Protocol):
     """
 
     def listar_procesos(
-        self, *, page: int = 0, count: int = 10, sort: str | None = None
+        self,
+        *,
+        page: int = 0,
+        count: int = 10,
+        sort: str | None = None,
+        include_metadata: bool = True,
     ) -> Iterable[ContractProcess]:
         ...
 
@@ -36,6 +41,7 @@ class ContratosRepository(Protocol):
         user_id: str | None = None,
         process_id: str | None = None,
         sort: str | None = None,
+        include_metadata: bool = True,
     ) -> Iterable[ContractTask]:
         ...
 
@@ -51,7 +57,15 @@ class ContratosRepository(Protocol):
     ) -> None:
         ...
 
-    def obtener_caso(self, case_id: str) -> ContractCase:
+    def tarea_completada(self, task_id: str) -> bool:
+        """
+        Indica si la tarea ya se completó (Bonita la archivó como `completed`).
+        """
+        ...
+
+    def obtener_caso(
+        self, case_id: str, *, include_metadata: bool = True
+    ) -> ContractCase:
         ...
 
     def obtener_variables_caso(
@@ -60,8 +74,123 @@ class ContratosRepository(Protocol):
         ...
 
     def obtener_caso_con_variables(
-        self, case_id: str, *, include_variables: bool = True
+        self,
+        case_id: str,
+        *,
+        include_variables: bool = True,
+        include_metadata: bool = True,
     ) -> ContractCaseWithVariables:
         ...
 
+    def iterar_procesos(
+        self, *, sort: str | None = None, page_size: int = 100
+    ) -> Iterator[ContractProcess]:
+        ...
+
+    def iterar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        page_size: int = 100,
+        include_metadata: bool = True,
+    ) -> Iterator[ContractTask]:
+        ...
+
+    def iterar_variables_caso(
+        self, case_id: str, *, page_size: int = 100
+    ) -> Iterator[ContractCaseVariable]:
+        ...
+
 
+class AsyncContratosRepository(Protocol):
+    """
+    Variante asíncrona de `ContratosRepository` para implementaciones que no
+    deben bloquear el event loop (p.ej. clientes HTTP asíncronos).
+    """
+
+    async def listar_procesos(
+        self,
+        *,
+        page: int = 0,
+        count: int = 10,
+        sort: str | None = None,
+        include_metadata: bool = True,
+    ) -> Iterable[ContractProcess]:
+        ...
+
+    async def iniciar_proceso(
+        self, process_id: str, *, contract_inputs: dict | None = None
+    ) -> StartProcessResult:
+        ...
+
+    async def listar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        page: int = 0,
+        count: int = 10,
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        include_metadata: bool = True,
+    ) -> Iterable[ContractTask]:
+        ...
+
+    async def asignar_tarea(self, task_id: str, user_id: str) -> None:
+        ...
+
+    async def completar_tarea(
+        self,
+        task_id: str,
+        *,
+        contract_inputs: dict | None = None,
+        variables: dict | None = None,
+    ) -> None:
+        ...
+
+    async def tarea_completada(self, task_id: str) -> bool:
+        ...
+
+    async def obtener_caso(
+        self, case_id: str, *, include_metadata: bool = True
+    ) -> ContractCase:
+        ...
+
+    async def obtener_variables_caso(
+        self, case_id: str, *, page: int = 0, count: int = 50
+    ) -> Iterable[ContractCaseVariable]:
+        ...
+
+    async def obtener_caso_con_variables(
+        self,
+        case_id: str,
+        *,
+        include_variables: bool = True,
+        include_metadata: bool = True,
+    ) -> ContractCaseWithVariables:
+        ...
+
+    def iterar_procesos(
+        self, *, sort: str | None = None, page_size: int = 100
+    ) -> AsyncIterator[ContractProcess]:
+        ...
+
+    def iterar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        page_size: int = 100,
+        include_metadata: bool = True,
+    ) -> AsyncIterator[ContractTask]:
+        ...
+
+    def iterar_variables_caso(
+        self, case_id: str, *, page_size: int = 100
+    ) -> AsyncIterator[ContractCaseVariable]:
+        ...
@@ -1,7 +1,20 @@
 from __future__ import annotations
 
-from typing import Iterable
+import time
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
 
+from ...core.concurrency import gather_limited_settled, iter_completed_limited
+from ...core.tracing import traced
 from .entities import (
     ContractCase,
     ContractCaseVariable,
@@ -9,8 +22,11 @@ from .entities import (
     ContractProcess,
     ContractTask,
     StartProcessResult,
+    TaskAssignment,
+    TaskCompletion,
+    TaskOperationResult,
 )
-from .repositories import ContratosRepository
+from .repositories import AsyncContratosRepository, ContratosRepository
 
 
 class ContratosService:
@@ -21,11 +37,20 @@ class ContratosService:
     def __init__(self, repository: ContratosRepository) -> None:
         self._repository = repository
 
+    @traced()
     def listar_procesos(
-        self, *, page: int = 0, count: int = 10, sort: str | None = None
+        self,
+        *,
+        page: int = 0,
+        count: int = 10,
+        sort: str | None = None,
+        include_metadata: bool = True,
     ) -> Iterable[ContractProcess]:
-        return self._repository.listar_procesos(page=page, count=count, sort=sort)
+        return self._repository.listar_procesos(
+            page=page, count=count, sort=sort, include_metadata=include_metadata
+        )
 
+    @traced()
     def iniciar_proceso(
         self, process_id: str, *, contract_inputs: dict | None = None
     ) -> StartProcessResult:
@@ -33,6 +58,7 @@ class ContratosService:
             process_id, contract_inputs=contract_inputs
         )
 
+    @traced()
     def listar_tareas(
         self,
         *,
@@ -42,6 +68,7 @@ class ContratosService:
         user_id: str | None = None,
         process_id: str | None = None,
         sort: str | None = None,
+        include_metadata: bool = True,
     ) -> Iterable[ContractTask]:
         return self._repository.listar_tareas(
             state=state,
@@ -50,11 +77,14 @@ class ContratosService:
             user_id=user_id,
             process_id=process_id,
             sort=sort,
+            include_metadata=include_metadata,
         )
 
+    @traced()
     def asignar_tarea(self, task_id: str, user_id: str) -> None:
         self._repository.asignar_tarea(task_id, user_id)
 
+    @traced()
     def completar_tarea(
         self,
         task_id: str,
@@ -66,9 +96,19 @@ class ContratosService:
             task_id, contract_inputs=contract_inputs, variables=variables
         )
 
-    def obtener_caso(self, case_id: str) -> ContractCase:
-        return self._repository.obtener_caso(case_id)
+    @traced()
+    def tarea_completada(self, task_id: str) -> bool:
+        return self._repository.tarea_completada(task_id)
 
+    @traced()
+    def obtener_caso(
+        self, case_id: str, *, include_metadata: bool = True
+    ) -> ContractCase:
+        return self._repository.obtener_caso(
+            case_id, include_metadata=include_metadata
+        )
+
+    @traced()
     def obtener_variables_caso(
         self, case_id: str, *, page: int = 0, count: int = 50
     ) -> Iterable[ContractCaseVariable]:
@@ -76,14 +116,265 @@ class ContratosService:
             case_id, page=page, count=count
         )
 
+    @traced()
     def obtener_caso_con_variables(
-        self, case_id: str, *, include_variables: bool = True
+        self,
+        case_id: str,
+        *,
+        include_variables: bool = True,
+        include_metadata: bool = True,
     ) -> ContractCaseWithVariables:
         if include_variables:
             return self._repository.obtener_caso_con_variables(
-                case_id, include_variables=True
+                case_id, include_variables=True, include_metadata=include_metadata
             )
-        case = self._repository.obtener_caso(case_id)
+        case = self._repository.obtener_caso(case_id, include_metadata=include_metadata)
         return ContractCaseWithVariables(case=case, variables=[])
 
+    def iterar_procesos(
+        self, *, sort: str | None = None, page_size: int = 100
+    ) -> Iterator[ContractProcess]:
+        return self._repository.iterar_procesos(sort=sort, page_size=page_size)
+
+    def iterar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        page_size: int = 100,
+        include_metadata: bool = True,
+    ) -> Iterator[ContractTask]:
+        return self._repository.iterar_tareas(
+            state=state,
+            user_id=user_id,
+            process_id=process_id,
+            sort=sort,
+            page_size=page_size,
+            include_metadata=include_metadata,
+        )
+
+    def iterar_variables_caso(
+        self, case_id: str, *, page_size: int = 100
+    ) -> Iterator[ContractCaseVariable]:
+        return self._repository.iterar_variables_caso(case_id, page_size=page_size)
+
+
+class AsyncContratosService:
+    """
+    Versión asíncrona de `ContratosService` que orquesta un `AsyncContratosRepository`.
+    """
+
+    def __init__(self, repository: AsyncContratosRepository) -> None:
+        self._repository = repository
+
+    @traced()
+    async def listar_procesos(
+        self,
+        *,
+        page: int = 0,
+        count: int = 10,
+        sort: str | None = None,
+        include_metadata: bool = True,
+    ) -> Iterable[ContractProcess]:
+        return await self._repository.listar_procesos(
+            page=page, count=count, sort=sort, include_metadata=include_metadata
+        )
+
+    @traced()
+    async def iniciar_proceso(
+        self, process_id: str, *, contract_inputs: dict | None = None
+    ) -> StartProcessResult:
+        return await self._repository.iniciar_proceso(
+            process_id, contract_inputs=contract_inputs
+        )
+
+    @traced()
+    async def listar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        page: int = 0,
+        count: int = 10,
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        include_metadata: bool = True,
+    ) -> Iterable[ContractTask]:
+        return await self._repository.listar_tareas(
+            state=state,
+            page=page,
+            count=count,
+            user_id=user_id,
+            process_id=process_id,
+            sort=sort,
+            include_metadata=include_metadata,
+        )
+
+    @traced()
+    async def asignar_tarea(self, task_id: str, user_id: str) -> None:
+        await self._repository.asignar_tarea(task_id, user_id)
+
+    @traced()
+    async def completar_tarea(
+        self,
+        task_id: str,
+        *,
+        contract_inputs: dict | None = None,
+        variables: dict | None = None,
+    ) -> None:
+        await self._repository.completar_tarea(
+            task_id, contract_inputs=contract_inputs, variables=variables
+        )
+
+    @traced()
+    async def tarea_completada(self, task_id: str) -> bool:
+        return await self._repository.tarea_completada(task_id)
+
+    @traced()
+    async def obtener_caso(
+        self, case_id: str, *, include_metadata: bool = True
+    ) -> ContractCase:
+        return await self._repository.obtener_caso(
+            case_id, include_metadata=include_metadata
+        )
+
+    @traced()
+    async def obtener_variables_caso(
+        self, case_id: str, *, page: int = 0, count: int = 50
+    ) -> Iterable[ContractCaseVariable]:
+        return await self._repository.obtener_variables_caso(
+            case_id, page=page, count=count
+        )
+
+    @traced()
+    async def obtener_caso_con_variables(
+        self,
+        case_id: str,
+        *,
+        include_variables: bool = True,
+        include_metadata: bool = True,
+    ) -> ContractCaseWithVariables:
+        if include_variables:
+            return await self._repository.obtener_caso_con_variables(
+                case_id, include_variables=True, include_metadata=include_metadata
+            )
+        case = await self._repository.obtener_caso(
+            case_id, include_metadata=include_metadata
+        )
+        return ContractCaseWithVariables(case=case, variables=[])
+
+    def iterar_procesos(
+        self, *, sort: str | None = None, page_size: int = 100
+    ) -> AsyncIterator[ContractProcess]:
+        return self._repository.iterar_procesos(sort=sort, page_size=page_size)
+
+    def iterar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        page_size: int = 100,
+        include_metadata: bool = True,
+    ) -> AsyncIterator[ContractTask]:
+        return self._repository.iterar_tareas(
+            state=state,
+            user_id=user_id,
+            process_id=process_id,
+            sort=sort,
+            page_size=page_size,
+            include_metadata=include_metadata,
+        )
+
+    def iterar_variables_caso(
+        self, case_id: str, *, page_size: int = 100
+    ) -> AsyncIterator[ContractCaseVariable]:
+        return self._repository.iterar_variables_caso(case_id, page_size=page_size)
+
+    @traced()
+    async def obtener_casos_con_variables(
+        self,
+        case_ids: Iterable[str],
+        *,
+        include_variables: bool = True,
+        max_concurrency: int = 10,
+    ) -> Dict[str, Union[ContractCaseWithVariables, Exception]]:
+        """
+        Obtiene varios casos a la vez (sin duplicados, respetando el orden recibido)
+        con como máximo `max_concurrency` casos en vuelo. Un fallo no interrumpe al
+        resto: la excepción se devuelve como resultado de ese caso.
+        """
+        unique_ids = list(dict.fromkeys(case_ids))
+        results = await gather_limited_settled(
+            [
+                lambda case_id=case_id: self.obtener_caso_con_variables(
+                    case_id, include_variables=include_variables
+                )
+                for case_id in unique_ids
+            ],
+            limit=max_concurrency,
+        )
+        return dict(zip(unique_ids, results))
+
+    async def asignar_tareas(
+        self, assignments: Iterable[TaskAssignment], *, max_concurrency: int = 10
+    ) -> AsyncIterator[TaskOperationResult]:
+        """
+        Asigna varias tareas con como máximo `max_concurrency` en vuelo y produce el
+        resultado de cada una en cuanto termina.
+        """
+        operations = [
+            (
+                assignment.task_id,
+                lambda assignment=assignment: self.asignar_tarea(
+                    assignment.task_id, assignment.user_id
+                ),
+            )
+            for assignment in assignments
+        ]
+        async for result in self._run_task_operations(operations, max_concurrency):
+            yield result
+
+    async def completar_tareas(
+        self, completions: Iterable[TaskCompletion], *, max_concurrency: int = 10
+    ) -> AsyncIterator[TaskOperationResult]:
+        """
+        Completa varias tareas con como máximo `max_concurrency` en vuelo y produce el
+        resultado de cada una en cuanto termina.
+        """
+        operations = [
+            (
+                completion.task_id,
+                lambda completion=completion: self.completar_tarea(
+                    completion.task_id,
+                    contract_inputs=completion.contract_inputs,
+                    variables=completion.variables,
+                ),
+            )
+            for completion in completions
+        ]
+        async for result in self._run_task_operations(operations, max_concurrency):
+            yield result
+
+    @staticmethod
+    async def _run_task_operations(
+        operations: List[Tuple[str, Callable[[], Awaitable[None]]]],
+        max_concurrency: int,
+    ) -> AsyncIterator[TaskOperationResult]:
+        async def timed(operation: Callable[[], Awaitable[None]]) -> float:
+            started = time.perf_counter()
+            await operation()
+            return time.perf_counter() - started
 
+        async for index, outcome in iter_completed_limited(
+            [lambda operation=operation: timed(operation) for _, operation in operations],
+            limit=max_concurrency,
+        ):
+            task_id = operations[index][0]
+            if isinstance(outcome, Exception):
+                yield TaskOperationResult(task_id=task_id, error=outcome)
+            else:
+                yield TaskOperationResult(task_id=task_id, elapsed_seconds=outcome)
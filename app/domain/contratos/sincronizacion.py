@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .entities import ContractTask
+
+# Lo que se compara de cada tarea entre dos sincronizaciones: Bonita actualiza
+# `last_update_date` en cada cambio, y el estado y el asignado cubren las fuentes
+# que no lo informan.
+TaskFingerprint = Tuple[Optional[str], str, Optional[str]]
+
+
+@dataclass(frozen=True, slots=True)
+class TaskSyncSnapshot:
+    query: Hashable
+    fingerprints: Dict[str, TaskFingerprint]
+
+    @property
+    def token(self) -> str:
+        """
+        Identificador determinista de la instantánea: dos consultas iguales con
+        las mismas tareas sin cambios producen el mismo token.
+        """
+        content = repr((self.query, sorted(self.fingerprints.items())))
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def task_fingerprint(task: ContractTask) -> TaskFingerprint:
+    return (task.last_update_date, task.state, task.assigned_id)
+
+
+def take_task_snapshot(
+    query: Hashable, tasks: Iterable[ContractTask]
+) -> TaskSyncSnapshot:
+    return TaskSyncSnapshot(
+        query=query,
+        fingerprints={task.id: task_fingerprint(task) for task in tasks},
+    )
+
+
+def tasks_changed_since(
+    previous: TaskSyncSnapshot, tasks: Iterable[ContractTask]
+) -> Tuple[List[ContractTask], List[str]]:
+    """
+    Devuelve las tareas nuevas o modificadas respecto a `previous` y los ids de
+    las que ya no aparecen en la consulta.
+    """
+    changed: List[ContractTask] = []
+    seen = set()
+    for task in tasks:
+        seen.add(task.id)
+        if previous.fingerprints.get(task.id) != task_fingerprint(task):
+            changed.append(task)
+    removed = [task_id for task_id in previous.fingerprints if task_id not in seen]
+    return changed, removed
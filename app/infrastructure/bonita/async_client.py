@@ -0,0 +1,835 @@
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+import httpx
+
+from ...config import get_settings
+from ...core.pagination import iter_pages
+from ...core.tracing import propagation_headers, start_span
+from .client import (
+    BonitaAuthenticationError,
+    BonitaClientError,
+    BonitaUnavailableError,
+    is_retryable_login_error,
+    login_backoff_delay,
+)
+from .guards import (
+    endpoint_family,
+    get_circuit_breakers,
+    get_concurrency_limiters,
+    get_retry_budget,
+    get_retry_policy,
+)
+from .instrumentation import (
+    LOGINS,
+    UPSTREAM_ERRORS,
+    UPSTREAM_LATENCY,
+    endpoint_template,
+)
+from .transport import create_async_http_client, get_shared_single_flight
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class SessionSync(Protocol):
+    """
+    Sincroniza el estado de sesión (cookies y token CSRF) con un almacén compartido.
+    """
+
+    async def publish(self, client: "AsyncBonitaClient") -> None:
+        ...
+
+    async def refresh(self, client: "AsyncBonitaClient") -> bool:
+        ...
+
+
+class AsyncBonitaClient:
+    """
+    Variante asíncrona de `BonitaClient` basada en `httpx.AsyncClient`.
+    Mantiene la misma semántica de login, token CSRF y reintento ante 401,
+    pero sin bloquear el event loop mientras Bonita responde.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: Optional[str],
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        # Por defecto las cookies son propias pero las conexiones salen del pool
+        # compartido del proceso (ver `transport.py`).
+        self.http = http_client or create_async_http_client()
+        self.csrf_token: Optional[str] = None
+        self._logged_in: bool = False
+        # Instante (time.monotonic) en que Bonita confirmó por última vez la sesión.
+        self.last_validated_at: Optional[float] = None
+        # Peticiones en curso e instante (time.monotonic) en que terminó la última;
+        # el `SessionStore` no cierra un cliente retirado mientras siga en uso.
+        self.active_requests = 0
+        self.last_used_at = time.monotonic()
+        # Almacén compartido opcional; permite a otros workers reutilizar la sesión.
+        self.session_sync: Optional[SessionSync] = None
+        # Los GET idénticos y simultáneos del mismo usuario comparten una sola
+        # llamada a Bonita.
+        self.single_flight = get_shared_single_flight()
+        # Protecciones compartidas frente a un Bonita lento o caído.
+        self.circuit_breakers = get_circuit_breakers()
+        self.concurrency_limiters = get_concurrency_limiters()
+        self.retry_policy = get_retry_policy()
+        self.retry_budget = get_retry_budget()
+        # Un solo login en vuelo por cliente; ver `BonitaClient._renew_session`.
+        self._login_lock = asyncio.Lock()
+        self._session_generation = 0
+        self._login_failures = 0
+        self._last_login_error: Optional[BonitaAuthenticationError] = None
+        settings = get_settings()
+        self._login_max_attempts = max(1, settings.bonita_login_max_attempts)
+        self._login_backoff_seconds = settings.bonita_login_backoff_seconds
+
+        # Cabeceras base para todas las peticiones
+        self.http.headers.update(
+            {
+                "Accept": "application/json",
+            }
+        )
+
+    @classmethod
+    def from_session_state(
+        cls,
+        base_url: str,
+        username: str,
+        state: Dict[str, Any],
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> "AsyncBonitaClient":
+        """
+        Reconstruye un cliente a partir de una sesión exportada por otro proceso,
+        sin volver a autenticarse. El cliente resultante no conoce la contraseña.
+        """
+        client = cls(
+            base_url=base_url,
+            username=username,
+            password=None,
+            http_client=http_client,
+        )
+        client.restore_session_state(state)
+        return client
+
+    def export_session_state(self) -> Dict[str, Any]:
+        """
+        Devuelve las cookies de sesión (`JSESSIONID`, `X-Bonita-API-Token`, ...) y el
+        token CSRF en un formato serializable a JSON.
+        """
+        return {
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                }
+                for cookie in self.http.cookies.jar
+            ],
+            "csrf_token": self.csrf_token,
+        }
+
+    def restore_session_state(self, state: Dict[str, Any]) -> None:
+        """
+        Sustituye las cookies y el token CSRF por los de una sesión exportada.
+        """
+        self.http.cookies.clear()
+        for cookie in state.get("cookies", []):
+            self.http.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain") or "",
+                path=cookie.get("path") or "/",
+            )
+        self.csrf_token = state.get("csrf_token")
+        if self.csrf_token:
+            self.http.headers["X-Bonita-API-Token"] = self.csrf_token
+        else:
+            self.http.headers.pop("X-Bonita-API-Token", None)
+        self._logged_in = True
+        self.last_validated_at = None
+
+    @property
+    def is_session_active(self) -> bool:
+        return self._logged_in and self._get_cookie("JSESSIONID") is not None
+
+    def validated_within(self, seconds: float) -> bool:
+        """
+        Indica si Bonita aceptó la sesión (login o petición correcta) en los
+        últimos `seconds` segundos.
+        """
+        if not self.is_session_active or self.last_validated_at is None:
+            return False
+        return time.monotonic() - self.last_validated_at < seconds
+
+    def idle_for(self, seconds: float) -> bool:
+        """
+        Indica si el cliente no tiene peticiones en curso ni ha terminado ninguna
+        en los últimos `seconds` segundos.
+        """
+        return (
+            self.active_requests == 0
+            and time.monotonic() - self.last_used_at >= seconds
+        )
+
+    async def login(self) -> None:
+        """
+        Autentica contra Bonita, almacena la cookie de sesión y el token CSRF.
+        """
+        await self._renew_session(self._session_generation)
+
+    async def _renew_session(self, seen_generation: int) -> None:
+        """
+        Renueva la sesión si nadie lo ha hecho desde `seen_generation`. Las
+        corrutinas que esperaban mientras otra hacía login reutilizan su
+        resultado, incluido el error, para no multiplicar las llamadas a
+        `/loginservice` cuando Bonita se reinicia.
+        """
+        failures_before = self._login_failures
+        async with self._login_lock:
+            if self._session_generation != seen_generation:
+                return
+            if self._login_failures != failures_before and self._last_login_error:
+                raise self._last_login_error
+            try:
+                await self._login_with_backoff()
+            except BonitaAuthenticationError as exc:
+                self._login_failures += 1
+                self._last_login_error = exc
+                raise
+            self._session_generation += 1
+
+    async def _login_with_backoff(self) -> None:
+        for attempt in range(self._login_max_attempts):
+            try:
+                return await self._authenticate()
+            except BonitaAuthenticationError as exc:
+                last_attempt = attempt == self._login_max_attempts - 1
+                if last_attempt or not is_retryable_login_error(exc):
+                    raise
+                delay = login_backoff_delay(attempt, self._login_backoff_seconds)
+                logger.warning(
+                    "Login en Bonita fallido (intento %s); reintentando en %.2f s.",
+                    attempt + 1,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+    async def _authenticate(self) -> None:
+        login_url = f"{self.base_url}/loginservice"
+        if self.password is None:
+            # Cliente rehidratado: sólo puede adoptar una sesión más reciente
+            # publicada por otro worker.
+            if self.session_sync is not None and await self.session_sync.refresh(self):
+                logger.info("Sesión de Bonita renovada desde el almacén compartido.")
+                LOGINS.inc("shared_session")
+                return
+            LOGINS.inc("failure")
+            raise BonitaAuthenticationError(
+                "La sesión compartida de Bonita expiró y no hay credenciales para renovarla.",
+                details={"status_code": 401, "endpoint": login_url},
+            )
+
+        payload = {
+            "username": self.username,
+            "password": self.password,
+            "redirect": "false",
+        }
+
+        started = time.perf_counter()
+        try:
+            with start_span("bonita POST /loginservice", kind="client"):
+                response = await self.http.post(
+                    login_url, data=payload, headers=propagation_headers()
+                )
+            if response.is_error:
+                response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            LOGINS.inc("failure")
+            logger.error("Error de autenticación en Bonita: %s", exc)
+            raise BonitaAuthenticationError(
+                "Credenciales inválidas o error de autenticación.",
+                details={
+                    "status_code": exc.response.status_code,
+                    "endpoint": login_url,
+                    "response_text": exc.response.text,
+                },
+            ) from exc
+        except httpx.HTTPError as exc:
+            LOGINS.inc("failure")
+            logger.error("Fallo de red al autenticarse en Bonita: %s", exc)
+            raise BonitaAuthenticationError(
+                "No se pudo acceder al servicio de Bonita.",
+                details={
+                    "endpoint": login_url,
+                    "error_type": exc.__class__.__name__,
+                    "error_message": str(exc),
+                },
+            ) from exc
+
+        finally:
+            UPSTREAM_LATENCY.observe(
+                time.perf_counter() - started, "POST", "/loginservice"
+            )
+
+        self._update_csrf_token()
+        self._logged_in = True
+        self.last_validated_at = time.monotonic()
+        LOGINS.inc("success")
+        logger.info("Autenticación correcta en Bonita y token CSRF almacenado.")
+        if self.session_sync is not None:
+            await self.session_sync.publish(self)
+
+    async def logout(self) -> None:
+        """
+        Cierra la sesión activa en Bonita.
+        """
+        if not self.is_session_active:
+            return
+
+        logout_url = f"{self.base_url}/logoutservice"
+        try:
+            response = await self.http.get(
+                logout_url, params={"redirect": "false"}
+            )
+            if response.is_error:
+                response.raise_for_status()
+            logger.info("Sesión cerrada en Bonita.")
+        except httpx.HTTPError as exc:
+            logger.warning("No fue posible cerrar la sesión en Bonita: %s", exc)
+        finally:
+            self.http.cookies.clear()
+            self.http.headers.pop("X-Bonita-API-Token", None)
+            self._logged_in = False
+            self.csrf_token = None
+            self.last_validated_at = None
+
+    async def aclose(self) -> None:
+        """
+        Libera el cliente HTTP subyacente. Con el transporte compartido el pool de
+        conexiones sigue abierto para el resto de usuarios.
+        """
+        await self.http.aclose()
+
+    async def get_session_info(self) -> Dict[str, Any]:
+        """
+        Obtiene la información de la sesión actual en Bonita.
+        """
+        return await self._request("get", "/API/system/session/1")
+
+    async def get_processes(
+        self, page: int = 0, count: int = 10, sort: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        params: List[Tuple[str, Any]] = [("p", page), ("c", count)]
+        if sort:
+            params.append(("o", sort))
+        return await self._request("get", "/API/bpm/process", params=params)
+
+    async def start_process(
+        self,
+        process_id: str,
+        contract_inputs: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        payload = contract_inputs or {}
+        return await self._request(
+            "post",
+            f"/API/bpm/process/{process_id}/instantiation",
+            json=payload,
+        )
+
+    async def get_tasks(
+        self,
+        state: Optional[str] = "ready",
+        page: int = 0,
+        count: int = 10,
+        user_id: Optional[str] = None,
+        process_id: Optional[str] = None,
+        sort: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        params: List[Tuple[str, Any]] = [("p", page), ("c", count)]
+        if sort:
+            params.append(("o", sort))
+        if state:
+            params.append(("f", f"state={state}"))
+        if user_id:
+            params.append(("f", f"assigned_id={user_id}"))
+        if process_id:
+            params.append(("f", f"processId={process_id}"))
+        return await self._request("get", "/API/bpm/userTask", params=params)
+
+    async def assign_task(self, task_id: str, user_id: str) -> Dict[str, Any]:
+        payload = {"assigned_id": user_id}
+        # Asignar la misma tarea al mismo usuario dos veces deja el mismo estado.
+        return await self._request(
+            "put", f"/API/bpm/humanTask/{task_id}", json=payload, idempotent=True
+        )
+
+    async def complete_task(
+        self,
+        task_id: str,
+        contract_inputs: Optional[Dict[str, Any]] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"state": "completed"}
+        if contract_inputs:
+            payload["contractInputs"] = contract_inputs
+        if variables:
+            payload["variables"] = self._format_variables_payload(variables)
+        return await self._request(
+            "post",
+            f"/API/bpm/userTask/{task_id}/execution",
+            json=payload,
+        )
+
+    async def get_archived_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Versión archivada de una tarea (la que queda al completarla), o `None`
+        si la tarea sigue activa.
+        """
+        params: List[Tuple[str, Any]] = [
+            ("p", 0),
+            ("c", 1),
+            ("f", f"sourceObjectId={task_id}"),
+        ]
+        archived = await self._request(
+            "get", "/API/bpm/archivedHumanTask", params=params
+        )
+        return archived[0] if archived else None
+
+    async def get_case(self, case_id: str) -> Dict[str, Any]:
+        return await self._request("get", f"/API/bpm/case/{case_id}")
+
+    async def get_case_variables(
+        self, case_id: str, page: int = 0, count: int = 50
+    ) -> List[Dict[str, Any]]:
+        params: List[Tuple[str, Any]] = [
+            ("p", page),
+            ("c", count),
+            ("f", f"case_id={case_id}"),
+        ]
+        return await self._request("get", "/API/bpm/caseVariable", params=params)
+
+    async def get_case_variables_page(
+        self, case_id: str, page: int = 0, count: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Igual que `get_case_variables`, pero devuelve además el total de variables
+        del caso según `Content-Range` (o `None` si Bonita no lo informa).
+        """
+        params: List[Tuple[str, Any]] = [
+            ("p", page),
+            ("c", count),
+            ("f", f"case_id={case_id}"),
+        ]
+        return await self._request_page("/API/bpm/caseVariable", params=params)
+
+    def iter_processes(
+        self, *, page_size: int = 100, sort: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorre todas las definiciones de procesos pidiendo la página siguiente
+        mientras se consume la actual.
+        """
+        return iter_pages(
+            lambda page: self.get_processes(page=page, count=page_size, sort=sort),
+            page_size=page_size,
+        )
+
+    def iter_tasks(
+        self,
+        *,
+        state: Optional[str] = "ready",
+        user_id: Optional[str] = None,
+        process_id: Optional[str] = None,
+        sort: Optional[str] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorre todas las tareas que cumplen los filtros, página a página y con
+        prefetch de la siguiente.
+        """
+        return iter_pages(
+            lambda page: self.get_tasks(
+                state=state,
+                page=page,
+                count=page_size,
+                user_id=user_id,
+                process_id=process_id,
+                sort=sort,
+            ),
+            page_size=page_size,
+        )
+
+    def iter_case_variables(
+        self, case_id: str, *, page_size: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorre todas las variables del caso, página a página y con prefetch.
+        """
+        return iter_pages(
+            lambda page: self.get_case_variables(case_id, page=page, count=page_size),
+            page_size=page_size,
+        )
+
+    def _get_cookie(self, name: str) -> Optional[str]:
+        # Se recorre el jar para no fallar con CookieConflict si Bonita
+        # emite la misma cookie para varios paths.
+        for cookie in self.http.cookies.jar:
+            if cookie.name == name:
+                return cookie.value
+        return None
+
+    def _update_csrf_token(self) -> None:
+        token = self._get_cookie("X-Bonita-API-Token")
+        if token is not None:
+            self.csrf_token = token
+            self.http.headers["X-Bonita-API-Token"] = token
+        else:
+            logger.warning(
+                "Autenticación completada pero no se encontró el token CSRF. Las operaciones de escritura podrían fallar."
+            )
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Sequence[Tuple[str, Any]]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        *,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        response = await self._send_tracked(
+            method, endpoint, params=params, json=json, idempotent=idempotent
+        )
+        if response.content:
+            return response.json()
+        return {}
+
+    async def _request_page(
+        self,
+        endpoint: str,
+        params: Sequence[Tuple[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Ejecuta un GET paginado y devuelve los elementos junto al total que Bonita
+        informa en la cabecera `Content-Range` (`0-10/42`), si está presente.
+        """
+        response = await self._send_tracked("get", endpoint, params=params)
+        items = response.json() if response.content else []
+        return items, self._parse_total(response.headers.get("Content-Range"))
+
+    @staticmethod
+    def _parse_total(content_range: Optional[str]) -> Optional[int]:
+        if not content_range or "/" not in content_range:
+            return None
+        try:
+            return int(content_range.rsplit("/", 1)[1])
+        except ValueError:
+            return None
+
+    async def _send_tracked(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Sequence[Tuple[str, Any]]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        *,
+        idempotent: Optional[bool] = None,
+    ) -> httpx.Response:
+        """
+        `_send` contando la petición como en curso mientras dura.
+        """
+        self.active_requests += 1
+        try:
+            return await self._send(
+                method, endpoint, params=params, json=json, idempotent=idempotent
+            )
+        finally:
+            self.active_requests -= 1
+            self.last_used_at = time.monotonic()
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Sequence[Tuple[str, Any]]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        *,
+        idempotent: Optional[bool] = None,
+        _retry: bool = True,
+        _coalesce: bool = True,
+    ) -> httpx.Response:
+        """
+        Envía la petición reintentando ante 401 (tras renovar la sesión) y, si es
+        idempotente (por defecto sólo GET), ante errores transitorios.
+        """
+        if idempotent is None:
+            idempotent = method.lower() == "get"
+        if _coalesce and method.lower() == "get" and self.single_flight is not None:
+            # La visibilidad en Bonita depende del usuario, por eso forma parte de
+            # la clave.
+            key = (self.base_url, self.username, endpoint, tuple(params or ()))
+            return await self.single_flight.do(
+                key,
+                lambda: self._send(method, endpoint, params=params, _coalesce=False),
+            )
+
+        generation = self._session_generation
+        if not self.is_session_active:
+            logger.info(
+                "Sesión de Bonita inactiva. Reintentando login antes de la petición %s %s",
+                method.upper(),
+                endpoint,
+            )
+            await self._renew_session(generation)
+            generation = self._session_generation
+
+        url = f"{self.base_url}{endpoint}"
+
+        try:
+            response = await self._request_with_retries(
+                method,
+                endpoint,
+                idempotent,
+                url=url,
+                params=list(params) if params is not None else None,
+                json=json,
+            )
+            if response.is_error:
+                response.raise_for_status()
+            self.last_validated_at = time.monotonic()
+            return response
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 401 and _retry:
+                logger.info(
+                    "Sesión expirada. Reintentando autenticación y repitiendo la petición %s %s.",
+                    method.upper(),
+                    endpoint,
+                )
+                await self._renew_session(generation)
+                return await self._send(
+                    method=method,
+                    endpoint=endpoint,
+                    params=params,
+                    json=json,
+                    idempotent=idempotent,
+                    _retry=False,
+                    _coalesce=False,
+                )
+            status_code = exc.response.status_code
+            response_text = exc.response.text
+            response_json: Optional[Any] = None
+            try:
+                response_json = exc.response.json()
+            except ValueError:
+                response_json = None
+            message = response_text if response_text else str(exc)
+            logger.error(
+                "Bonita devolvió un error HTTP en %s %s [%s]: %s",
+                method.upper(),
+                endpoint,
+                status_code,
+                message,
+            )
+            raise BonitaClientError(
+                f"Error al comunicarse con Bonita (HTTP {status_code}).",
+                details={
+                    "status_code": status_code,
+                    "method": method.upper(),
+                    "endpoint": endpoint,
+                    "response_text": response_text,
+                    "response_json": response_json,
+                },
+            ) from exc
+        except httpx.HTTPError as exc:
+            logger.error(
+                "Error de red en la petición %s %s: %s", method.upper(), endpoint, exc
+            )
+            raise BonitaClientError(
+                "Error de red al comunicarse con Bonita.",
+                details={
+                    "method": method.upper(),
+                    "endpoint": endpoint,
+                    "error_type": exc.__class__.__name__,
+                    "error_message": str(exc),
+                },
+            ) from exc
+
+    async def _request_with_retries(
+        self, method: str, endpoint: str, idempotent: bool, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Repite las peticiones idempotentes que fallan por red o con 502/503/504,
+        con espera exponencial con jitter y siempre que quede presupuesto de
+        reintentos. Cada intento se registra con su duración.
+        """
+        policy = self.retry_policy
+        self.retry_budget.record_request()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            error: Optional[httpx.TransportError] = None
+            response: Optional[httpx.Response] = None
+            try:
+                response = await self._guarded_request(method, endpoint, **kwargs)
+            except httpx.TransportError as exc:
+                error = exc
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if error is None and response.status_code not in policy.retry_statuses:
+                logger.debug(
+                    "%s %s intento %s: HTTP %s en %.1f ms",
+                    method.upper(),
+                    endpoint,
+                    attempt + 1,
+                    response.status_code,
+                    elapsed_ms,
+                )
+                return response
+
+            if error is not None:
+                reason = error.__class__.__name__
+            else:
+                reason = str(response.status_code)
+            if (
+                not idempotent
+                or attempt + 1 >= policy.max_attempts
+                or not self.retry_budget.try_withdraw(reason)
+            ):
+                if error is not None:
+                    raise error
+                return response
+
+            retry_after = None
+            if response is not None:
+                retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            delay = policy.delay(attempt, retry_after)
+            logger.warning(
+                "%s %s intento %s falló (%s) en %.1f ms; reintentando en %.2f s.",
+                method.upper(),
+                endpoint,
+                attempt + 1,
+                reason,
+                elapsed_ms,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    async def _guarded_request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Envía la petición pasando por el circuit breaker y el limitador de
+        concurrencia de su familia de endpoints. Si alguno la rechaza se lanza
+        `BonitaUnavailableError` sin esperar a Bonita. Cuentan como fallo los
+        errores de red y las respuestas 5xx.
+        """
+        family = endpoint_family(endpoint, method)
+        method_label = method.upper()
+        template = endpoint_template(endpoint)
+        breaker = (
+            self.circuit_breakers.get(family)
+            if self.circuit_breakers is not None
+            else None
+        )
+        if breaker is not None and not breaker.allow():
+            UPSTREAM_ERRORS.inc(method_label, template, "circuit_open")
+            raise BonitaUnavailableError(
+                "Bonita no está disponible temporalmente (circuito abierto).",
+                details={
+                    "status_code": 503,
+                    "reason": "circuit_open",
+                    "family": family,
+                    "retry_after_seconds": round(breaker.retry_after(), 3),
+                },
+            )
+        limiter = (
+            self.concurrency_limiters.get(family)
+            if self.concurrency_limiters is not None
+            else None
+        )
+        if limiter is not None and not limiter.try_acquire():
+            if breaker is not None:
+                breaker.record_ignored()
+            UPSTREAM_ERRORS.inc(method_label, template, "overloaded")
+            raise BonitaUnavailableError(
+                "Bonita está saturado; se descarta la petición.",
+                details={
+                    "status_code": 503,
+                    "reason": "overloaded",
+                    "family": family,
+                    "concurrency_limit": limiter.limit,
+                },
+            )
+
+        started = time.perf_counter()
+        failed: Optional[bool] = True
+        try:
+            with start_span(
+                f"bonita {method_label} {template}",
+                kind="client",
+                attributes={"http.method": method_label, "http.route": template},
+            ) as span:
+                response = await self.http.request(
+                    method=method_label, headers=propagation_headers(), **kwargs
+                )
+                if span is not None:
+                    span.set_attribute("http.status_code", response.status_code)
+            failed = response.status_code >= 500
+            if response.status_code >= 400:
+                UPSTREAM_ERRORS.inc(method_label, template, str(response.status_code))
+            return response
+        except asyncio.CancelledError:
+            failed = None
+            raise
+        except httpx.TransportError:
+            UPSTREAM_ERRORS.inc(method_label, template, "network")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            UPSTREAM_LATENCY.observe(elapsed, method_label, template)
+            if limiter is not None:
+                limiter.release(elapsed)
+            if breaker is not None:
+                if failed is None:
+                    breaker.record_ignored()
+                elif failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+    @staticmethod
+    def _format_variables_payload(variables: Dict[str, Any]) -> List[Dict[str, Any]]:
+        formatted: List[Dict[str, Any]] = []
+        for name, value in variables.items():
+            formatted.append({"name": name, "value": value})
+        return formatted
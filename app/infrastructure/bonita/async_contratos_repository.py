@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import math
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from ...core.concurrency import gather_limited
+from ...core.tracing import traced
+from ...core.ttl_cache import TTLCache
+from ...domain.contratos.entities import (
+    ContractCase,
+    ContractCaseVariable,
+    ContractCaseWithVariables,
+    ContractProcess,
+    ContractTask,
+    StartProcessResult,
+)
+from ...domain.contratos.repositories import AsyncContratosRepository
+from .async_client import AsyncBonitaClient
+from .mappers import map_case, map_case_variable, map_process, map_task
+
+
+class AsyncBonitaContratosRepository(AsyncContratosRepository):
+    """
+    Implementación asíncrona del repositorio que utiliza la API REST de Bonita.
+
+    Si recibe `process_cache`, el listado de procesos se sirve desde la caché por
+    página/cantidad/orden dentro de `cache_scope` (la visibilidad del usuario).
+    Las llamadas independientes a Bonita se lanzan en paralelo con un máximo de
+    `fanout_concurrency` en vuelo.
+    """
+
+    def __init__(
+        self,
+        client: AsyncBonitaClient,
+        *,
+        process_cache: Optional[TTLCache[Tuple[ContractProcess, ...]]] = None,
+        cache_scope: Optional[str] = None,
+        variables_page_size: int = 100,
+        fanout_concurrency: int = 8,
+    ) -> None:
+        self._client = client
+        self._process_cache = process_cache
+        self._cache_scope = cache_scope or client.username
+        self._variables_page_size = variables_page_size
+        self._fanout_concurrency = fanout_concurrency
+
+    @traced()
+    async def listar_procesos(
+        self,
+        *,
+        page: int = 0,
+        count: int = 10,
+        sort: str | None = None,
+        include_metadata: bool = True,
+    ) -> Iterable[ContractProcess]:
+        # Con y sin metadatos son entradas distintas: la versión reducida no retiene el
+        # JSON original de Bonita.
+        scope = self._cache_scope
+        cache_key = ("processes", scope, page, count, sort, include_metadata)
+        if self._process_cache is not None:
+            cached = self._process_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+        procesos_raw = await self._client.get_processes(
+            page=page, count=count, sort=sort
+        )
+        procesos = [
+            map_process(proc, include_metadata=include_metadata)
+            for proc in procesos_raw
+        ]
+        if self._process_cache is not None:
+            self._process_cache.set(cache_key, tuple(procesos))
+        return procesos
+
+    @traced()
+    async def iniciar_proceso(
+        self, process_id: str, *, contract_inputs: dict | None = None
+    ) -> StartProcessResult:
+        resultado = await self._client.start_process(
+            process_id=process_id, contract_inputs=contract_inputs
+        )
+        return StartProcessResult(
+            case_id=str(resultado.get("caseId", "")),
+            process_definition_id=str(resultado.get("processDefinitionId", "")),
+            metadata=resultado,
+        )
+
+    @traced()
+    async def listar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        page: int = 0,
+        count: int = 10,
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        include_metadata: bool = True,
+    ) -> Iterable[ContractTask]:
+        tareas_raw = await self._client.get_tasks(
+            state=state,
+            page=page,
+            count=count,
+            user_id=user_id,
+            process_id=process_id,
+            sort=sort,
+        )
+        return [
+            map_task(task, include_metadata=include_metadata) for task in tareas_raw
+        ]
+
+    @traced()
+    async def asignar_tarea(self, task_id: str, user_id: str) -> None:
+        await self._client.assign_task(task_id=task_id, user_id=user_id)
+
+    @traced()
+    async def completar_tarea(
+        self,
+        task_id: str,
+        *,
+        contract_inputs: dict | None = None,
+        variables: dict | None = None,
+    ) -> None:
+        await self._client.complete_task(
+            task_id=task_id, contract_inputs=contract_inputs, variables=variables
+        )
+
+    @traced()
+    async def tarea_completada(self, task_id: str) -> bool:
+        archived = await self._client.get_archived_task(task_id)
+        return archived is not None and archived.get("state") == "completed"
+
+    @traced()
+    async def obtener_caso(
+        self, case_id: str, *, include_metadata: bool = True
+    ) -> ContractCase:
+        caso_raw = await self._client.get_case(case_id)
+        return map_case(caso_raw, include_metadata=include_metadata)
+
+    @traced()
+    async def obtener_variables_caso(
+        self, case_id: str, *, page: int = 0, count: int = 50
+    ) -> Iterable[ContractCaseVariable]:
+        variables_raw = await self._client.get_case_variables(
+            case_id, page=page, count=count
+        )
+        return [map_case_variable(var) for var in variables_raw]
+
+    @traced()
+    async def obtener_caso_con_variables(
+        self,
+        case_id: str,
+        *,
+        include_variables: bool = True,
+        include_metadata: bool = True,
+    ) -> ContractCaseWithVariables:
+        if not include_variables:
+            case = await self.obtener_caso(case_id, include_metadata=include_metadata)
+            return ContractCaseWithVariables(case=case, variables=[])
+
+        case, variables_raw = await gather_limited(
+            [
+                lambda: self._client.get_case(case_id),
+                lambda: self._obtener_todas_variables_raw(case_id),
+            ],
+            limit=2,
+        )
+        return ContractCaseWithVariables(
+            case=map_case(case, include_metadata=include_metadata),
+            variables=[
+                map_case_variable(var, include_metadata=include_metadata)
+                for var in variables_raw
+            ],
+        )
+
+    async def iterar_procesos(
+        self, *, sort: str | None = None, page_size: int = 100
+    ) -> AsyncIterator[ContractProcess]:
+        procesos_raw = self._client.iter_processes(page_size=page_size, sort=sort)
+        async for proc in procesos_raw:
+            yield map_process(proc)
+
+    async def iterar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        page_size: int = 100,
+        include_metadata: bool = True,
+    ) -> AsyncIterator[ContractTask]:
+        tareas_raw = self._client.iter_tasks(
+            state=state,
+            user_id=user_id,
+            process_id=process_id,
+            sort=sort,
+            page_size=page_size,
+        )
+        async for task in tareas_raw:
+            yield map_task(task, include_metadata=include_metadata)
+
+    async def iterar_variables_caso(
+        self, case_id: str, *, page_size: int = 100
+    ) -> AsyncIterator[ContractCaseVariable]:
+        variables_raw = self._client.iter_case_variables(case_id, page_size=page_size)
+        async for var in variables_raw:
+            yield map_case_variable(var)
+
+    @traced()
+    async def _obtener_todas_variables_raw(self, case_id: str) -> List[Dict[str, Any]]:
+        """
+        Recorre todas las páginas de variables del caso. Con el total de
+        `Content-Range` pide las páginas restantes en paralelo; sin él, avanza en
+        ventanas de `fanout_concurrency` páginas hasta encontrar una incompleta.
+        """
+        page_size = self._variables_page_size
+        first_page, total = await self._client.get_case_variables_page(
+            case_id, page=0, count=page_size
+        )
+        variables = list(first_page)
+        if len(first_page) < page_size:
+            return variables
+
+        def fetch(page: int):
+            return lambda: self._client.get_case_variables(
+                case_id, page=page, count=page_size
+            )
+
+        if total is not None:
+            pages = await gather_limited(
+                [fetch(page) for page in range(1, math.ceil(total / page_size))],
+                limit=self._fanout_concurrency,
+            )
+            for chunk in pages:
+                variables.extend(chunk)
+            return variables
+
+        next_page = 1
+        while True:
+            window = range(next_page, next_page + self._fanout_concurrency)
+            pages = await gather_limited(
+                [fetch(page) for page in window], limit=self._fanout_concurrency
+            )
+            for chunk in pages:
+                variables.extend(chunk)
+                if len(chunk) < page_size:
+                    return variables
+            next_page = window.stop
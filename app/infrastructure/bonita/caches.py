@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from ...config import get_settings
+from ...core.monitoring import register_stats_provider
+from ...core.ttl_cache import TTLCache
+from ...domain.contratos.entities import ContractProcess
+
+# Alcance usado cuando todos los usuarios comparten las definiciones en caché.
+SHARED_SCOPE = "*"
+
+
+@lru_cache
+def get_process_cache() -> Optional[TTLCache[Tuple[ContractProcess, ...]]]:
+    """
+    Caché de lectura para el listado de definiciones de procesos.
+    Devuelve `None` si `PROCESS_CACHE_TTL_SECONDS` es 0.
+    """
+    settings = get_settings()
+    if settings.process_cache_ttl_seconds <= 0:
+        return None
+    return TTLCache(
+        max_entries=settings.process_cache_max_entries,
+        ttl_seconds=settings.process_cache_ttl_seconds,
+    )
+
+
+def process_cache_scope(username: str) -> str:
+    """
+    Alcance de visibilidad de la caché de procesos para un usuario.
+    """
+    if get_settings().process_cache_shared:
+        return SHARED_SCOPE
+    return username
+
+
+def _process_cache_stats() -> dict:
+    cache = get_process_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+register_stats_provider("process_cache", _process_cache_stats)
@@ -1,10 +1,18 @@
 import logging
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-import requests
 from requests import Session
 from requests.exceptions import HTTPError, RequestException
 
+from ...config import get_settings
+from ...core.pagination import iter_pages_sync
+from ...core.tracing import propagation_headers, start_span
+from .instrumentation import LOGINS, endpoint_template
+from .transport import create_http_session, get_request_timeout
+
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -22,6 +30,78 @@ class BonitaAuthenticationError(BonitaClientError):
     """Se lanza cuando la autenticación con Bonita falla."""
 
 
+class BonitaUnavailableError(BonitaClientError):
+    """
+    Se lanza sin llamar a Bonita cuando su circuito está abierto o el limitador de
+    concurrencia descarta la petición; `details["status_code"]` es 503.
+    """
+
+
+def is_retryable_login_error(exc: BonitaAuthenticationError) -> bool:
+    """
+    Un fallo de red o un 5xx de `/loginservice` suele deberse a que Bonita está
+    arrancando; un 401/403 son credenciales inválidas y no se reintenta.
+    """
+    status_code = exc.details.get("status_code")
+    return status_code is None or status_code >= 500
+
+
+def login_backoff_delay(attempt: int, base_seconds: float) -> float:
+    """
+    Espera exponencial (`base * 2^attempt`) con jitter para que los workers que
+    reintentan a la vez no se sincronicen.
+    """
+    delay = base_seconds * (2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def is_transient_bonita_error(exc: Exception) -> bool:
+    """
+    Errores tras los que tiene sentido repetir una operación más tarde: Bonita no
+    disponible (circuito abierto o carga descartada), 429/502/503/504 o fallo de
+    red. Los 4xx restantes y los fallos de autenticación son definitivos.
+    """
+    if isinstance(exc, BonitaUnavailableError):
+        return True
+    if isinstance(exc, BonitaAuthenticationError) or not isinstance(
+        exc, BonitaClientError
+    ):
+        return False
+    status_code = exc.details.get("status_code")
+    if status_code is None:
+        return "error_type" in exc.details
+    return status_code in (429, 502, 503, 504)
+
+
+# Errores de httpx en los que la petición no llegó a enviarse.
+_UNSENT_ERROR_TYPES = frozenset({"ConnectError", "ConnectTimeout", "PoolTimeout"})
+
+
+def is_unsent_bonita_error(exc: Exception) -> bool:
+    """
+    Errores en los que la petición seguro que no llegó a Bonita (circuito
+    abierto, carga descartada o fallo al conectar), de modo que repetir una
+    operación no idempotente no puede duplicarla.
+    """
+    if isinstance(exc, BonitaUnavailableError):
+        return True
+    return (
+        isinstance(exc, BonitaClientError)
+        and not isinstance(exc, BonitaAuthenticationError)
+        and exc.details.get("error_type") in _UNSENT_ERROR_TYPES
+    )
+
+
+def is_bonita_session_error(exc: Exception) -> bool:
+    """
+    La sesión del usuario no existe o Bonita la rechazó y no se puede renovar
+    sin que vuelva a iniciar sesión.
+    """
+    return isinstance(exc, BonitaAuthenticationError) and not is_retryable_login_error(
+        exc
+    )
+
+
 class BonitaClient:
     """
     Cliente ligero para interactuar con la API REST de Bonita.
@@ -38,9 +118,26 @@ class BonitaClient:
         self.base_url = base_url.rstrip("/")
         self.username = username
         self.password = password
-        self.session = session or requests.Session()
+        # Sesión propia (cookies) sobre el adaptador de conexiones compartido.
+        self.session = session or create_http_session()
+        timeout = get_request_timeout()
+        self.timeout: Tuple[Optional[float], Optional[float]] = (
+            timeout.connect,
+            timeout.read,
+        )
         self.csrf_token: Optional[str] = None
         self._logged_in: bool = False
+        # Un solo login en vuelo por cliente: quien espera el lock reutiliza el
+        # resultado del anterior en lugar de repetirlo.
+        self._login_lock = threading.Lock()
+        # Se incrementa con cada login correcto; permite saber si la sesión ya se
+        # renovó desde que una petición recibió el 401.
+        self._session_generation = 0
+        self._login_failures = 0
+        self._last_login_error: Optional[BonitaAuthenticationError] = None
+        settings = get_settings()
+        self._login_max_attempts = max(1, settings.bonita_login_max_attempts)
+        self._login_backoff_seconds = settings.bonita_login_backoff_seconds
 
         # Cabeceras base para todas las peticiones
         self.session.headers.update(
@@ -57,6 +154,45 @@ class BonitaClient:
         """
         Autentica contra Bonita, almacena la cookie de sesión y el token CSRF.
         """
+        self._renew_session(self._session_generation)
+
+    def _renew_session(self, seen_generation: int) -> None:
+        """
+        Renueva la sesión si nadie lo ha hecho desde `seen_generation`. Los hilos
+        que esperaban mientras otro hacía login reutilizan su resultado, incluido
+        el error, para no multiplicar las llamadas a `/loginservice`.
+        """
+        failures_before = self._login_failures
+        with self._login_lock:
+            if self._session_generation != seen_generation:
+                return
+            if self._login_failures != failures_before and self._last_login_error:
+                raise self._last_login_error
+            try:
+                self._login_with_backoff()
+            except BonitaAuthenticationError as exc:
+                self._login_failures += 1
+                self._last_login_error = exc
+                raise
+            self._session_generation += 1
+
+    def _login_with_backoff(self) -> None:
+        for attempt in range(self._login_max_attempts):
+            try:
+                return self._authenticate()
+            except BonitaAuthenticationError as exc:
+                last_attempt = attempt == self._login_max_attempts - 1
+                if last_attempt or not is_retryable_login_error(exc):
+                    raise
+                delay = login_backoff_delay(attempt, self._login_backoff_seconds)
+                logger.warning(
+                    "Login en Bonita fallido (intento %s); reintentando en %.2f s.",
+                    attempt + 1,
+                    delay,
+                )
+                time.sleep(delay)
+
+    def _authenticate(self) -> None:
         login_url = f"{self.base_url}/loginservice"
         payload = {
             "username": self.username,
@@ -65,9 +201,10 @@ class BonitaClient:
         }
 
         try:
-            response = self.session.post(login_url, data=payload, timeout=10)
+            response = self.session.post(login_url, data=payload, timeout=self.timeout)
             response.raise_for_status()
         except HTTPError as exc:
+            LOGINS.inc("failure")
             logger.error("Error de autenticación en Bonita: %s", exc)
             raise BonitaAuthenticationError(
                 "Credenciales inválidas o error de autenticación.",
@@ -82,6 +219,7 @@ class BonitaClient:
                 },
             ) from exc
         except RequestException as exc:
+            LOGINS.inc("failure")
             logger.error("Fallo de red al autenticarse en Bonita: %s", exc)
             raise BonitaAuthenticationError(
                 "No se pudo acceder al servicio de Bonita.",
@@ -94,6 +232,7 @@ class BonitaClient:
 
         self._update_csrf_token()
         self._logged_in = True
+        LOGINS.inc("success")
         logger.info("Autenticación correcta en Bonita y token CSRF almacenado.")
 
     def logout(self) -> None:
@@ -106,7 +245,7 @@ class BonitaClient:
         logout_url = f"{self.base_url}/logoutservice"
         try:
             response = self.session.get(
-                logout_url, timeout=10, params={"redirect": "false"}
+                logout_url, timeout=self.timeout, params={"redirect": "false"}
             )
             response.raise_for_status()
             logger.info("Sesión cerrada en Bonita.")
@@ -184,6 +323,19 @@ class BonitaClient:
             json=payload,
         )
 
+    def get_archived_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Versión archivada de una tarea (la que queda al completarla), o `None`
+        si la tarea sigue activa.
+        """
+        params: List[Tuple[str, Any]] = [
+            ("p", 0),
+            ("c", 1),
+            ("f", f"sourceObjectId={task_id}"),
+        ]
+        archived = self._request("get", "/API/bpm/archivedHumanTask", params=params)
+        return archived[0] if archived else None
+
     def get_case(self, case_id: str) -> Dict[str, Any]:
         return self._request("get", f"/API/bpm/case/{case_id}")
 
@@ -197,6 +349,53 @@ class BonitaClient:
         ]
         return self._request("get", "/API/bpm/caseVariable", params=params)
 
+    def iter_processes(
+        self, *, page_size: int = 100, sort: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre todas las definiciones de procesos pidiendo cada página bajo demanda.
+        """
+        return iter_pages_sync(
+            lambda page: self.get_processes(page=page, count=page_size, sort=sort),
+            page_size=page_size,
+        )
+
+    def iter_tasks(
+        self,
+        *,
+        state: Optional[str] = "ready",
+        user_id: Optional[str] = None,
+        process_id: Optional[str] = None,
+        sort: Optional[str] = None,
+        page_size: int = 100,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre todas las tareas que cumplen los filtros pidiendo cada página bajo
+        demanda.
+        """
+        return iter_pages_sync(
+            lambda page: self.get_tasks(
+                state=state,
+                page=page,
+                count=page_size,
+                user_id=user_id,
+                process_id=process_id,
+                sort=sort,
+            ),
+            page_size=page_size,
+        )
+
+    def iter_case_variables(
+        self, case_id: str, *, page_size: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre todas las variables del caso pidiendo cada página bajo demanda.
+        """
+        return iter_pages_sync(
+            lambda page: self.get_case_variables(case_id, page=page, count=page_size),
+            page_size=page_size,
+        )
+
     def _update_csrf_token(self) -> None:
         if "X-Bonita-API-Token" in self.session.cookies:
             self.csrf_token = self.session.cookies["X-Bonita-API-Token"]
@@ -215,24 +414,30 @@ class BonitaClient:
         *,
         _retry: bool = True,
     ) -> Any:
+        generation = self._session_generation
         if not self.is_session_active:
             logger.info(
                 "Sesión de Bonita inactiva. Reintentando login antes de la petición %s %s",
                 method.upper(),
                 endpoint,
             )
-            self.login()
+            self._renew_session(generation)
+            generation = self._session_generation
 
         url = f"{self.base_url}{endpoint}"
 
         try:
-            response = self.session.request(
-                method=method.upper(),
-                url=url,
-                params=params,
-                json=json,
-                timeout=15,
-            )
+            with start_span(
+                f"bonita {method.upper()} {endpoint_template(endpoint)}", kind="client"
+            ):
+                response = self.session.request(
+                    method=method.upper(),
+                    url=url,
+                    params=params,
+                    json=json,
+                    headers=propagation_headers(),
+                    timeout=self.timeout,
+                )
             response.raise_for_status()
             if response.content:
                 return response.json()
@@ -244,7 +449,7 @@ class BonitaClient:
                     method.upper(),
                     endpoint,
                 )
-                self.login()
+                self._renew_session(generation)
                 return self._request(
                     method=method,
                     endpoint=endpoint,
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional
 
+from ...core.tracing import traced
 from ...domain.contratos.entities import (
     ContractCase,
     ContractCaseVariable,
@@ -11,7 +12,8 @@ from ...domain.contratos.entities import (
     StartProcessResult,
 )
 from ...domain.contratos.repositories import ContratosRepository
-from .client import BonitaClient, BonitaClientError
+from .client import BonitaClient
+from .mappers import map_case, map_case_variable, map_process, map_task
 
 
 class BonitaContratosRepository(ContratosRepository):
@@ -22,12 +24,22 @@ class BonitaContratosRepository(ContratosRepository):
     def __init__(self, client: BonitaClient) -> None:
         self._client = client
 
+    @traced()
     def listar_procesos(
-        self, *, page: int = 0, count: int = 10, sort: str | None = None
+        self,
+        *,
+        page: int = 0,
+        count: int = 10,
+        sort: str | None = None,
+        include_metadata: bool = True,
     ) -> Iterable[ContractProcess]:
         procesos_raw = self._client.get_processes(page=page, count=count, sort=sort)
-        return [self._map_process(proc) for proc in procesos_raw]
+        return [
+            map_process(proc, include_metadata=include_metadata)
+            for proc in procesos_raw
+        ]
 
+    @traced()
     def iniciar_proceso(
         self, process_id: str, *, contract_inputs: dict | None = None
     ) -> StartProcessResult:
@@ -40,6 +52,7 @@ class BonitaContratosRepository(ContratosRepository):
             metadata=resultado,
         )
 
+    @traced()
     def listar_tareas(
         self,
         *,
@@ -49,6 +62,7 @@ class BonitaContratosRepository(ContratosRepository):
         user_id: str | None = None,
         process_id: str | None = None,
         sort: str | None = None,
+        include_metadata: bool = True,
     ) -> Iterable[ContractTask]:
         tareas_raw = self._client.get_tasks(
             state=state,
@@ -58,11 +72,15 @@ class BonitaContratosRepository(ContratosRepository):
             process_id=process_id,
             sort=sort,
         )
-        return [self._map_task(task) for task in tareas_raw]
+        return [
+            map_task(task, include_metadata=include_metadata) for task in tareas_raw
+        ]
 
+    @traced()
     def asignar_tarea(self, task_id: str, user_id: str) -> None:
         self._client.assign_task(task_id=task_id, user_id=user_id)
 
+    @traced()
     def completar_tarea(
         self,
         task_id: str,
@@ -74,68 +92,81 @@ class BonitaContratosRepository(ContratosRepository):
             task_id=task_id, contract_inputs=contract_inputs, variables=variables
         )
 
-    def obtener_caso(self, case_id: str) -> ContractCase:
+    @traced()
+    def tarea_completada(self, task_id: str) -> bool:
+        archived = self._client.get_archived_task(task_id)
+        return archived is not None and archived.get("state") == "completed"
+
+    @traced()
+    def obtener_caso(
+        self, case_id: str, *, include_metadata: bool = True
+    ) -> ContractCase:
         caso_raw = self._client.get_case(case_id)
-        return self._map_case(caso_raw)
+        return map_case(caso_raw, include_metadata=include_metadata)
 
+    @traced()
     def obtener_variables_caso(
-        self, case_id: str, *, page: int = 0, count: int = 50
+        self,
+        case_id: str,
+        *,
+        page: int = 0,
+        count: int = 50,
+        include_metadata: bool = True,
     ) -> Iterable[ContractCaseVariable]:
         variables_raw = self._client.get_case_variables(
             case_id, page=page, count=count
         )
-        return [self._map_case_variable(var) for var in variables_raw]
+        return [
+            map_case_variable(var, include_metadata=include_metadata)
+            for var in variables_raw
+        ]
 
+    @traced()
     def obtener_caso_con_variables(
-        self, case_id: str, *, include_variables: bool = True
+        self,
+        case_id: str,
+        *,
+        include_variables: bool = True,
+        include_metadata: bool = True,
     ) -> ContractCaseWithVariables:
-        case = self.obtener_caso(case_id)
+        case = self.obtener_caso(case_id, include_metadata=include_metadata)
         variables: List[ContractCaseVariable] = []
         if include_variables:
-            variables = list(self.obtener_variables_caso(case_id))
+            variables = list(
+                self.obtener_variables_caso(case_id, include_metadata=include_metadata)
+            )
         return ContractCaseWithVariables(case=case, variables=variables)
 
-    @staticmethod
-    def _map_process(data: dict) -> ContractProcess:
-        return ContractProcess(
-            id=str(data.get("id", "")),
-            name=data.get("name", ""),
-            display_name=data.get("displayName", data.get("display_name", "")),
-            version=data.get("version", ""),
-            metadata=data,
-        )
-
-    @staticmethod
-    def _map_task(data: dict) -> ContractTask:
-        return ContractTask(
-            id=str(data.get("id", "")),
-            name=data.get("name", ""),
-            display_name=data.get("displayName", data.get("display_name", "")),
-            state=data.get("state", ""),
-            assigned_id=data.get("assigned_id") or data.get("assignedId"),
-            metadata=data,
-        )
-
-    @staticmethod
-    def _map_case(data: dict) -> ContractCase:
-        return ContractCase(
-            id=str(data.get("id", "")),
-            process_definition_id=str(data.get("processDefinitionId", "")),
-            state=data.get("state", ""),
-            started_by=data.get("started_by") or data.get("startedBy"),
-            metadata=data,
-        )
+    def iterar_procesos(
+        self, *, sort: str | None = None, page_size: int = 100
+    ) -> Iterator[ContractProcess]:
+        procesos_raw = self._client.iter_processes(page_size=page_size, sort=sort)
+        for proc in procesos_raw:
+            yield map_process(proc)
 
-    @staticmethod
-    def _map_case_variable(data: dict) -> ContractCaseVariable:
-        return ContractCaseVariable(
-            id=str(data.get("id")) if data.get("id") is not None else None,
-            case_id=str(data.get("case_id"))
-            if data.get("case_id") is not None
-            else data.get("caseId"),
-            name=data.get("name", ""),
-            value=data.get("value"),
-            metadata=data,
+    def iterar_tareas(
+        self,
+        *,
+        state: str | None = "ready",
+        user_id: str | None = None,
+        process_id: str | None = None,
+        sort: str | None = None,
+        page_size: int = 100,
+        include_metadata: bool = True,
+    ) -> Iterator[ContractTask]:
+        tareas_raw = self._client.iter_tasks(
+            state=state,
+            user_id=user_id,
+            process_id=process_id,
+            sort=sort,
+            page_size=page_size,
         )
-
-
+        for task in tareas_raw:
+            yield map_task(task, include_metadata=include_metadata)
+
+    def iterar_variables_caso(
+        self, case_id: str, *, page_size: int = 100
+    ) -> Iterator[ContractCaseVariable]:
+        variables_raw = self._client.iter_case_variables(case_id, page_size=page_size)
+        for var in variables_raw:
+            yield map_case_variable(var)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from ...config import get_settings
+from ...core.monitoring import register_stats_provider
+from ...core.resilience import OPEN, AdaptiveConcurrencyLimiter, CircuitBreaker
+from ...core.retry import RetryBudget, RetryPolicy
+
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def endpoint_family(endpoint: str, method: str = "GET") -> str:
+    """
+    Agrupa los endpoints de Bonita por recurso, acción y tipo de operación para
+    compartir un circuit breaker: `GET /API/bpm/userTask?f=...` -> `bpm/userTask`
+    y `POST /API/bpm/userTask/12/execution` -> `POST bpm/userTask/execution`.
+    Así los fallos de una escritura (p.ej. conectores que fallan al completar)
+    no cortan las lecturas del mismo recurso.
+    """
+    segments = [segment for segment in endpoint.split("?")[0].split("/") if segment]
+    if segments and segments[0] == "API":
+        segments = segments[1:]
+    family = "/".join(segments[:2]) or "/"
+    if len(segments) > 3:
+        family = f"{family}/{segments[3]}"
+    method = method.upper()
+    if method not in _READ_METHODS:
+        family = f"{method} {family}"
+    return family
+
+
+class CircuitBreakerRegistry:
+    """
+    Un `CircuitBreaker` por familia de endpoints, creado al primer uso.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        recovery_seconds: float,
+        half_open_max_calls: int,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, family: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = self._breakers[family] = CircuitBreaker(
+                    failure_threshold=self.failure_threshold,
+                    recovery_seconds=self.recovery_seconds,
+                    half_open_max_calls=self.half_open_max_calls,
+                )
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {family: breaker.stats() for family, breaker in breakers.items()}
+
+
+class ConcurrencyLimiterRegistry:
+    """
+    Un `AdaptiveConcurrencyLimiter` por familia de endpoints, creado al primer
+    uso: las escrituras lentas por diseño (p.ej. completar una tarea con
+    conectores) sólo reducen su propio límite y no el de las lecturas.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_seconds = latency_target_seconds
+        self._lock = Lock()
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+    def get(self, family: str) -> AdaptiveConcurrencyLimiter:
+        with self._lock:
+            limiter = self._limiters.get(family)
+            if limiter is None:
+                limiter = self._limiters[family] = AdaptiveConcurrencyLimiter(
+                    min_limit=self.min_limit,
+                    max_limit=self.max_limit,
+                    latency_target_seconds=self.latency_target_seconds,
+                )
+            return limiter
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {family: limiter.stats() for family, limiter in limiters.items()}
+
+
+@lru_cache
+def get_circuit_breakers() -> Optional[CircuitBreakerRegistry]:
+    """
+    Circuit breakers compartidos por todos los clientes asíncronos. Devuelve `None`
+    si `BONITA_BREAKER_FAILURE_THRESHOLD` es 0.
+    """
+    settings = get_settings()
+    if settings.bonita_breaker_failure_threshold <= 0:
+        return None
+    return CircuitBreakerRegistry(
+        failure_threshold=settings.bonita_breaker_failure_threshold,
+        recovery_seconds=settings.bonita_breaker_recovery_seconds,
+        half_open_max_calls=settings.bonita_breaker_half_open_max_calls,
+    )
+
+
+@lru_cache
+def get_concurrency_limiters() -> Optional[ConcurrencyLimiterRegistry]:
+    """
+    Limitadores adaptativos de llamadas simultáneas a Bonita, uno por familia de
+    endpoints y compartidos por todo el proceso. Devuelve `None` si
+    `BONITA_ADAPTIVE_LIMIT_ENABLED` es `false`.
+    """
+    settings = get_settings()
+    if not settings.bonita_adaptive_limit_enabled:
+        return None
+    return ConcurrencyLimiterRegistry(
+        min_limit=settings.bonita_adaptive_limit_min,
+        max_limit=settings.bonita_adaptive_limit_max,
+        latency_target_seconds=settings.bonita_adaptive_latency_target_seconds,
+    )
+
+
+@lru_cache
+def get_retry_policy() -> RetryPolicy:
+    settings = get_settings()
+    return RetryPolicy(
+        max_attempts=max(1, settings.bonita_retry_max_attempts),
+        base_delay_seconds=settings.bonita_retry_base_delay_seconds,
+        max_delay_seconds=settings.bonita_retry_max_delay_seconds,
+    )
+
+
+@lru_cache
+def get_retry_budget() -> RetryBudget:
+    """
+    Presupuesto de reintentos compartido por todos los clientes del proceso.
+    """
+    settings = get_settings()
+    return RetryBudget(
+        ratio=settings.bonita_retry_budget_ratio,
+        min_retries_per_second=settings.bonita_retry_budget_min_per_second,
+    )
+
+
+def bonita_health() -> Dict[str, Any]:
+    """
+    Estado de las protecciones frente a Bonita: `degraded` si algún circuito está
+    abierto o algún limitador está rechazando llamadas por saturación.
+    """
+    registry = get_circuit_breakers()
+    limiters = get_concurrency_limiters()
+    breakers = registry.stats() if registry is not None else {}
+    limiter_stats = limiters.stats() if limiters is not None else {}
+    open_families = sorted(
+        family for family, stats in breakers.items() if stats["state"] == OPEN
+    )
+    saturated_families = sorted(
+        family
+        for family, stats in limiter_stats.items()
+        if stats["in_flight"] >= stats["limit"]
+    )
+    return {
+        "status": "degraded" if open_families or saturated_families else "ok",
+        "open_circuits": open_families,
+        "saturated_families": saturated_families,
+        "circuit_breakers": breakers,
+        "concurrency_limiters": (
+            limiter_stats if limiters is not None else {"enabled": False}
+        ),
+    }
+
+
+def _circuit_breaker_stats() -> Dict[str, Any]:
+    registry = get_circuit_breakers()
+    return registry.stats() if registry is not None else {"enabled": False}
+
+
+def _concurrency_limiter_stats() -> Dict[str, Any]:
+    limiters = get_concurrency_limiters()
+    return limiters.stats() if limiters is not None else {"enabled": False}
+
+
+register_stats_provider("circuit_breakers", _circuit_breaker_stats)
+register_stats_provider("concurrency_limiters", _concurrency_limiter_stats)
+register_stats_provider("retry", lambda: get_retry_budget().stats())
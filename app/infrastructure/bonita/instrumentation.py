@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from ...core.metrics import counter, histogram
+
+UPSTREAM_LATENCY = histogram(
+    "bonita_upstream_request_duration_seconds",
+    "Duración de cada intento de petición a la API REST de Bonita.",
+    ("method", "endpoint"),
+)
+UPSTREAM_ERRORS = counter(
+    "bonita_upstream_errors_total",
+    "Peticiones a Bonita fallidas por código HTTP o motivo (network, circuit_open, overloaded).",
+    ("method", "endpoint", "status"),
+)
+LOGINS = counter(
+    "bonita_logins_total",
+    "Intentos de login contra /loginservice por resultado.",
+    ("outcome",),
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Sustituye los identificadores de la ruta para acotar la cardinalidad:
+    `/API/bpm/userTask/12/execution` -> `/API/bpm/userTask/{id}/execution`. En la
+    API REST de Bonita (`/API/{api}/{recurso}/{id}/...`) el cuarto segmento siempre
+    es un identificador, aunque no sea numérico.
+    """
+    segments = endpoint.split("/")
+    is_rest_api = len(segments) > 1 and segments[1] == "API"
+    return "/".join(
+        "{id}" if segment.isdigit() or (is_rest_api and index == 4) else segment
+        for index, segment in enumerate(segments)
+    )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from ...domain.contratos.entities import (
+    ContractCase,
+    ContractCaseVariable,
+    ContractProcess,
+    ContractTask,
+)
+
+
+def _optional_str(value: object) -> str | None:
+    # Bonita devuelve "" o 0 para las referencias vacías.
+    return str(value) if value else None
+
+
+def map_process(data: dict, *, include_metadata: bool = True) -> ContractProcess:
+    return ContractProcess(
+        id=str(data.get("id", "")),
+        name=data.get("name", ""),
+        display_name=data.get("displayName", data.get("display_name", "")),
+        version=data.get("version", ""),
+        metadata=data if include_metadata else {},
+    )
+
+
+def map_task(data: dict, *, include_metadata: bool = True) -> ContractTask:
+    return ContractTask(
+        id=str(data.get("id", "")),
+        name=data.get("name", ""),
+        display_name=data.get("displayName", data.get("display_name", "")),
+        state=data.get("state", ""),
+        assigned_id=data.get("assigned_id") or data.get("assignedId"),
+        last_update_date=data.get("last_update_date") or data.get("lastUpdateDate"),
+        case_id=_optional_str(data.get("caseId") or data.get("case_id")),
+        process_id=_optional_str(data.get("processId") or data.get("process_id")),
+        due_date=data.get("dueDate") or data.get("due_date") or None,
+        metadata=data if include_metadata else {},
+    )
+
+
+def map_case(data: dict, *, include_metadata: bool = True) -> ContractCase:
+    return ContractCase(
+        id=str(data.get("id", "")),
+        process_definition_id=str(data.get("processDefinitionId", "")),
+        state=data.get("state", ""),
+        started_by=data.get("started_by") or data.get("startedBy"),
+        metadata=data if include_metadata else {},
+    )
+
+
+def map_case_variable(
+    data: dict, *, include_metadata: bool = True
+) -> ContractCaseVariable:
+    return ContractCaseVariable(
+        id=str(data.get("id")) if data.get("id") is not None else None,
+        case_id=str(data.get("case_id"))
+        if data.get("case_id") is not None
+        else data.get("caseId"),
+        name=data.get("name", ""),
+        value=data.get("value"),
+        metadata=data if include_metadata else {},
+    )
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ...config import get_settings
+from ...core.monitoring import register_stats_provider
+from ...core.single_flight import SingleFlight
+
+
+@dataclass
+class PoolStats:
+    requests_total: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    host_slot_waits: int = 0
+    host_slot_wait_seconds: float = 0.0
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Envuelve el cuerpo de la respuesta para liberar el hueco por host cuando la
+    conexión vuelve al pool (al cerrar el stream), no cuando llegan las cabeceras.
+    """
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, release: Callable[[], None]
+    ) -> None:
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class BonitaTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte HTTP compartido por todos los `AsyncBonitaClient` del proceso.
+
+    Mantiene un único pool de conexiones keep-alive hacia Bonita (las cookies siguen
+    siendo de cada cliente), limita las conexiones simultáneas por host y cuenta el
+    uso del pool. `aclose()` no cierra el pool, porque lo invocan los clientes de cada
+    usuario al liberarse; el pool se cierra con `close_pool()` al apagar la aplicación.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        max_connections_per_host: int,
+        connect_retries: int = 0,
+    ) -> None:
+        self._inner = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            retries=connect_retries,
+        )
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self._host_slots: Dict[Tuple[bytes, bytes, int | None], asyncio.Semaphore] = {}
+        self._stats = PoolStats()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = (request.url.raw_scheme, request.url.raw_host, request.url.port)
+        slots = self._host_slots.get(key)
+        if slots is None:
+            slots = self._host_slots.setdefault(
+                key, asyncio.Semaphore(self.max_connections_per_host)
+            )
+        if slots.locked():
+            self._stats.host_slot_waits += 1
+            started = time.perf_counter()
+            await slots.acquire()
+            self._stats.host_slot_wait_seconds += time.perf_counter() - started
+        else:
+            await slots.acquire()
+
+        self._stats.requests_total += 1
+        self._stats.in_flight += 1
+        self._stats.max_in_flight = max(
+            self._stats.max_in_flight, self._stats.in_flight
+        )
+
+        def release() -> None:
+            self._stats.in_flight -= 1
+            slots.release()
+
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        return None
+
+    async def close_pool(self) -> None:
+        await self._inner.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = asdict(self._stats)
+        connections = getattr(getattr(self._inner, "_pool", None), "connections", [])
+        snapshot.update(
+            max_connections=self.max_connections,
+            max_connections_per_host=self.max_connections_per_host,
+            open_connections=len(connections),
+            idle_connections=sum(1 for conn in connections if conn.is_idle()),
+        )
+        return snapshot
+
+
+def get_request_timeout() -> httpx.Timeout:
+    settings = get_settings()
+    return httpx.Timeout(
+        settings.bonita_read_timeout_seconds,
+        connect=settings.bonita_connect_timeout_seconds,
+    )
+
+
+@lru_cache
+def get_shared_async_transport() -> BonitaTransport:
+    settings = get_settings()
+    return BonitaTransport(
+        max_connections=settings.bonita_pool_max_connections,
+        max_keepalive_connections=settings.bonita_pool_max_keepalive,
+        keepalive_expiry=settings.bonita_pool_keepalive_expiry_seconds,
+        max_connections_per_host=settings.bonita_pool_max_per_host,
+        connect_retries=settings.bonita_pool_connect_retries,
+    )
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """
+    Crea un `httpx.AsyncClient` con cookies propias sobre el pool compartido.
+    """
+    return httpx.AsyncClient(
+        transport=get_shared_async_transport(), timeout=get_request_timeout()
+    )
+
+
+@lru_cache
+def get_shared_single_flight() -> Optional[SingleFlight[httpx.Response]]:
+    """
+    Deduplicador de GETs idénticos en vuelo compartido por todos los clientes
+    asíncronos. Devuelve `None` si `BONITA_SINGLE_FLIGHT` está desactivado.
+    """
+    if not get_settings().bonita_single_flight:
+        return None
+    return SingleFlight()
+
+
+@lru_cache
+def get_shared_http_adapter() -> HTTPAdapter:
+    """
+    Adaptador de `requests` compartido por las sesiones síncronas de `BonitaClient`.
+    """
+    settings = get_settings()
+    return HTTPAdapter(
+        pool_connections=settings.bonita_pool_max_connections,
+        pool_maxsize=settings.bonita_pool_max_per_host,
+        max_retries=Retry(
+            total=settings.bonita_pool_connect_retries,
+            connect=settings.bonita_pool_connect_retries,
+            read=0,
+            status=0,
+        ),
+    )
+
+
+def create_http_session() -> requests.Session:
+    """
+    Crea una `requests.Session` con cookies propias sobre el adaptador compartido.
+    """
+    session = requests.Session()
+    adapter = get_shared_http_adapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _sync_pool_stats() -> Dict[str, Any]:
+    pools = get_shared_http_adapter().poolmanager.pools
+    open_pools = [pools[key] for key in pools.keys()]
+    return {
+        "pools": len(open_pools),
+        "open_connections": sum(pool.num_connections for pool in open_pools),
+        "requests_total": sum(pool.num_requests for pool in open_pools),
+    }
+
+
+register_stats_provider("http_pool", lambda: get_shared_async_transport().stats())
+register_stats_provider("http_pool_sync", _sync_pool_stats)
+
+
+def _single_flight_stats() -> Dict[str, Any]:
+    single_flight = get_shared_single_flight()
+    return single_flight.stats() if single_flight is not None else {"enabled": False}
+
+
+register_stats_provider("single_flight", _single_flight_stats)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional, Set
+
+from ...config import get_settings
+from ...domain.contratos.importacion import (
+    ImportCheckpointStore,
+    ImportJobConflictError,
+    ImportJobRunningError,
+    ImportJobSummary,
+)
+
+
+class SqliteImportCheckpointStore(ImportCheckpointStore):
+    """
+    Guarda en SQLite el resultado de cada línea de una importación masiva.
+    Las operaciones se ejecutan en un hilo para no bloquear el event loop.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS import_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    process_id TEXT NOT NULL,
+                    owner TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    run_id TEXT,
+                    running_until REAL
+                );
+                CREATE TABLE IF NOT EXISTS import_records (
+                    job_id TEXT NOT NULL,
+                    line_no INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    case_id TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (job_id, line_no)
+                );
+                """
+            )
+            # Ficheros creados antes de que cada ejecución reservara su `job_id`.
+            columns = {
+                row[1] for row in connection.execute("PRAGMA table_info(import_jobs)")
+            }
+            for column, kind in (("run_id", "TEXT"), ("running_until", "REAL")):
+                if column not in columns:
+                    connection.execute(
+                        f"ALTER TABLE import_jobs ADD COLUMN {column} {kind}"
+                    )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Conexión en una transacción (commit al salir, rollback si falla) que se
+        cierra siempre al terminar.
+        """
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    async def start_job(
+        self,
+        job_id: str,
+        process_id: str,
+        owner: str,
+        run_id: str,
+        running_until: float,
+    ) -> None:
+        await asyncio.to_thread(
+            self._start_job, job_id, process_id, owner, run_id, running_until
+        )
+
+    async def renew_job(self, job_id: str, run_id: str, running_until: float) -> None:
+        await asyncio.to_thread(self._renew_job, job_id, run_id, running_until)
+
+    async def finish_job(self, job_id: str, run_id: str) -> None:
+        await asyncio.to_thread(self._finish_job, job_id, run_id)
+
+    async def completed_lines(self, job_id: str) -> Set[int]:
+        return await asyncio.to_thread(self._completed_lines, job_id)
+
+    async def record_success(self, job_id: str, line_no: int, case_id: str) -> None:
+        await asyncio.to_thread(
+            self._record, job_id, line_no, "succeeded", case_id, None
+        )
+
+    async def record_failure(self, job_id: str, line_no: int, error: str) -> None:
+        await asyncio.to_thread(self._record, job_id, line_no, "failed", None, error)
+
+    async def summary(self, job_id: str) -> Optional[ImportJobSummary]:
+        return await asyncio.to_thread(self._summary, job_id)
+
+    def _start_job(
+        self,
+        job_id: str,
+        process_id: str,
+        owner: str,
+        run_id: str,
+        running_until: float,
+    ) -> None:
+        now = time.time()
+        with self._connect() as connection:
+            # Bloqueo de escritura desde la lectura: dos peticiones (o procesos)
+            # con el mismo `job_id` no pueden reservarlo a la vez.
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT process_id, owner, running_until FROM import_jobs "
+                "WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                connection.execute(
+                    "INSERT INTO import_jobs "
+                    "(job_id, process_id, owner, created_at, run_id, running_until) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, process_id, owner, now, run_id, running_until),
+                )
+                return
+            if tuple(row[:2]) != (process_id, owner):
+                raise ImportJobConflictError(
+                    f"La importación {job_id} pertenece a otro proceso o usuario."
+                )
+            if row[2] is not None and row[2] > now:
+                raise ImportJobRunningError(
+                    f"La importación {job_id} ya se está ejecutando."
+                )
+            connection.execute(
+                "UPDATE import_jobs SET run_id = ?, running_until = ? "
+                "WHERE job_id = ?",
+                (run_id, running_until, job_id),
+            )
+
+    def _renew_job(self, job_id: str, run_id: str, running_until: float) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE import_jobs SET running_until = ? "
+                "WHERE job_id = ? AND run_id = ?",
+                (running_until, job_id, run_id),
+            )
+
+    def _finish_job(self, job_id: str, run_id: str) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE import_jobs SET run_id = NULL, running_until = NULL "
+                "WHERE job_id = ? AND run_id = ?",
+                (job_id, run_id),
+            )
+
+    def _completed_lines(self, job_id: str) -> Set[int]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT line_no FROM import_records "
+                "WHERE job_id = ? AND status = 'succeeded'",
+                (job_id,),
+            )
+            return {line_no for (line_no,) in rows}
+
+    def _record(
+        self,
+        job_id: str,
+        line_no: int,
+        status: str,
+        case_id: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                """
+                INSERT INTO import_records
+                    (job_id, line_no, status, case_id, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id, line_no) DO UPDATE SET
+                    status = excluded.status,
+                    case_id = excluded.case_id,
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                (job_id, line_no, status, case_id, error, time.time()),
+            )
+
+    def _summary(self, job_id: str) -> Optional[ImportJobSummary]:
+        with self._connect() as connection:
+            job = connection.execute(
+                "SELECT process_id, owner FROM import_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+            if job is None:
+                return None
+            summary = ImportJobSummary(job_id=job_id, process_id=job[0], owner=job[1])
+            rows = connection.execute(
+                "SELECT status, case_id FROM import_records "
+                "WHERE job_id = ? ORDER BY line_no",
+                (job_id,),
+            )
+            for status, case_id in rows:
+                if status == "succeeded":
+                    summary.succeeded += 1
+                    summary.case_ids.append(case_id)
+                else:
+                    summary.failed += 1
+            return summary
+
+
+@lru_cache
+def get_import_checkpoint_store() -> SqliteImportCheckpointStore:
+    return SqliteImportCheckpointStore(get_settings().bulk_checkpoint_path)
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from threading import Lock
+from typing import Iterator, List, Optional
+
+from ...config import get_settings
+from ...domain.contratos.operaciones import (
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    WAITING_SESSION,
+    TaskOperation,
+    TaskOperationStore,
+)
+
+_COLUMNS = (
+    "operation_id, kind, owner, task_id, payload, status, attempts, error, "
+    "created_at, updated_at, next_attempt_at"
+)
+_INTERRUPTED = "Interrumpida antes de terminar; se comprobará la tarea al reanudar."
+
+
+def _to_operation(row: tuple) -> TaskOperation:
+    (
+        operation_id,
+        kind,
+        owner,
+        task_id,
+        payload,
+        status,
+        attempts,
+        error,
+        created_at,
+        updated_at,
+        next_attempt_at,
+    ) = row
+    return TaskOperation(
+        operation_id=operation_id,
+        kind=kind,
+        owner=owner,
+        task_id=task_id,
+        payload=json.loads(payload),
+        status=status,
+        attempts=attempts,
+        error=error,
+        created_at=created_at,
+        updated_at=updated_at,
+        next_attempt_at=next_attempt_at,
+    )
+
+
+class SqliteTaskOperationStore(TaskOperationStore):
+    """
+    Cola de operaciones sobre tareas en SQLite, compartible por varios procesos.
+    Las operaciones se ejecutan en un hilo para no bloquear el event loop;
+    `claim` se serializa con un lock y una transacción inmediata para que dos
+    workers no reclamen la misma operación, y cada fila reclamada guarda el
+    worker y la caducidad de su arrendamiento.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._claim_lock = Lock()
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS task_operations (
+                    operation_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    owner TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS task_operations_due
+                    ON task_operations (status, next_attempt_at, created_at);
+                CREATE INDEX IF NOT EXISTS task_operations_task
+                    ON task_operations (owner, task_id, kind, status);
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Conexión en una transacción (commit al salir, rollback si falla) que se
+        cierra siempre al terminar.
+        """
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    async def enqueue(self, operation: TaskOperation) -> TaskOperation:
+        return await asyncio.to_thread(self._enqueue, operation)
+
+    async def claim(
+        self, worker_id: str, limit: int, now: float, lease_until: float
+    ) -> List[TaskOperation]:
+        return await asyncio.to_thread(self._claim, worker_id, limit, now, lease_until)
+
+    async def renew(
+        self, worker_id: str, operation_ids: List[str], lease_until: float
+    ) -> None:
+        await asyncio.to_thread(self._renew, worker_id, operation_ids, lease_until)
+
+    async def release(self, worker_id: str, operation_ids: List[str]) -> None:
+        await asyncio.to_thread(self._release, worker_id, operation_ids)
+
+    async def mark_succeeded(self, worker_id: str, operation_id: str) -> None:
+        await asyncio.to_thread(
+            self._finish, worker_id, operation_id, SUCCEEDED, None, None
+        )
+
+    async def mark_retry(
+        self, worker_id: str, operation_id: str, error: str, next_attempt_at: float
+    ) -> None:
+        await asyncio.to_thread(
+            self._finish, worker_id, operation_id, PENDING, error, next_attempt_at
+        )
+
+    async def mark_failed(self, worker_id: str, operation_id: str, error: str) -> None:
+        await asyncio.to_thread(
+            self._finish, worker_id, operation_id, FAILED, error, None
+        )
+
+    async def mark_waiting_session(
+        self, worker_id: str, operation_id: str, error: str
+    ) -> None:
+        await asyncio.to_thread(
+            self._finish,
+            worker_id,
+            operation_id,
+            WAITING_SESSION,
+            error,
+            None,
+            count_attempt=False,
+        )
+
+    async def resume_waiting(self, owner: str, now: float) -> int:
+        return await asyncio.to_thread(self._resume_waiting, owner, now)
+
+    async def get(self, operation_id: str) -> Optional[TaskOperation]:
+        return await asyncio.to_thread(self._get, operation_id)
+
+    def _enqueue(self, operation: TaskOperation) -> TaskOperation:
+        with self._connect() as connection:
+            # Como en `_claim`: la comprobación de duplicados y la inserción van en
+            # la misma transacción de escritura, de modo que dos procesos que
+            # comparten el fichero no encolan dos veces el mismo completado.
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                f"SELECT {_COLUMNS} FROM task_operations "
+                "WHERE owner = ? AND task_id = ? AND kind = ? "
+                "AND status IN (?, ?, ?) ORDER BY created_at LIMIT 1",
+                (
+                    operation.owner,
+                    operation.task_id,
+                    operation.kind,
+                    PENDING,
+                    RUNNING,
+                    WAITING_SESSION,
+                ),
+            ).fetchone()
+            if row is not None:
+                return _to_operation(row)
+            connection.execute(
+                f"INSERT INTO task_operations ({_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    operation.operation_id,
+                    operation.kind,
+                    operation.owner,
+                    operation.task_id,
+                    json.dumps(operation.payload, default=str),
+                    operation.status,
+                    operation.attempts,
+                    operation.error,
+                    operation.created_at,
+                    operation.updated_at,
+                    operation.next_attempt_at,
+                ),
+            )
+            return operation
+
+    def _claim(
+        self, worker_id: str, limit: int, now: float, lease_until: float
+    ) -> List[TaskOperation]:
+        with self._claim_lock, self._connect() as connection:
+            # Bloqueo de escritura desde la lectura: otros procesos que compartan
+            # el fichero no pueden reclamar las mismas filas.
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                f"SELECT {_COLUMNS} FROM task_operations "
+                "WHERE (status = ? AND next_attempt_at <= ?) "
+                "OR (status = ? AND lease_expires_at <= ?) "
+                "ORDER BY created_at LIMIT ?",
+                (PENDING, now, RUNNING, now, limit),
+            ).fetchall()
+            operations = [_to_operation(row) for row in rows]
+            for operation in operations:
+                if operation.status == RUNNING:
+                    # Su worker se detuvo a mitad: el intento pudo llegar a Bonita.
+                    operation.attempts += 1
+                    operation.error = _INTERRUPTED
+                operation.status = RUNNING
+                operation.updated_at = time.time()
+            connection.executemany(
+                "UPDATE task_operations SET status = ?, attempts = ?, error = ?, "
+                "updated_at = ?, lease_owner = ?, lease_expires_at = ? "
+                "WHERE operation_id = ?",
+                [
+                    (
+                        RUNNING,
+                        op.attempts,
+                        op.error,
+                        op.updated_at,
+                        worker_id,
+                        lease_until,
+                        op.operation_id,
+                    )
+                    for op in operations
+                ],
+            )
+            return operations
+
+    def _renew(
+        self, worker_id: str, operation_ids: List[str], lease_until: float
+    ) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE task_operations SET lease_expires_at = ? "
+                "WHERE operation_id = ? AND lease_owner = ? AND status = ?",
+                [
+                    (lease_until, operation_id, worker_id, RUNNING)
+                    for operation_id in operation_ids
+                ],
+            )
+
+    def _release(self, worker_id: str, operation_ids: List[str]) -> None:
+        now = time.time()
+        with self._connect() as connection:
+            connection.executemany(
+                """
+                UPDATE task_operations SET
+                    status = ?,
+                    attempts = attempts + 1,
+                    error = ?,
+                    updated_at = ?,
+                    next_attempt_at = ?,
+                    lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE operation_id = ? AND lease_owner = ? AND status = ?
+                """,
+                [
+                    (PENDING, _INTERRUPTED, now, now, operation_id, worker_id, RUNNING)
+                    for operation_id in operation_ids
+                ],
+            )
+
+    def _finish(
+        self,
+        worker_id: str,
+        operation_id: str,
+        status: str,
+        error: Optional[str],
+        next_attempt_at: Optional[float],
+        *,
+        count_attempt: bool = True,
+    ) -> None:
+        # Sólo si el worker conserva el arrendamiento: si caducó, otro worker ya
+        # ha reclamado la operación.
+        with self._connect() as connection:
+            connection.execute(
+                """
+                UPDATE task_operations SET
+                    status = ?,
+                    attempts = attempts + ?,
+                    error = ?,
+                    updated_at = ?,
+                    next_attempt_at = COALESCE(?, next_attempt_at),
+                    lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE operation_id = ? AND lease_owner = ?
+                """,
+                (
+                    status,
+                    1 if count_attempt else 0,
+                    error,
+                    time.time(),
+                    next_attempt_at,
+                    operation_id,
+                    worker_id,
+                ),
+            )
+
+    def _resume_waiting(self, owner: str, now: float) -> int:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE task_operations SET status = ?, updated_at = ?, "
+                "next_attempt_at = ? WHERE owner = ? AND status = ?",
+                (PENDING, now, now, owner, WAITING_SESSION),
+            )
+            return cursor.rowcount
+
+    def _get(self, operation_id: str) -> Optional[TaskOperation]:
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {_COLUMNS} FROM task_operations WHERE operation_id = ?",
+                (operation_id,),
+            ).fetchone()
+            return _to_operation(row) if row is not None else None
+
+
+@lru_cache
+def get_task_operation_store() -> SqliteTaskOperationStore:
+    return SqliteTaskOperationStore(get_settings().task_completion_queue_path)
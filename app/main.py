@@ -1,17 +1,70 @@
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from .api.auth import router as auth_router
-from .api.routers.contratos import router as contratos_router
+from .api.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    TracingMiddleware,
+)
+from .api.routers.contratos import notify_task_completed, router as contratos_router
+from .api.routers.monitoring import metrics_router, router as monitoring_router
+from .config import get_settings
+from .core.session_cache import get_session_store
+from .core.tracing import build_span_exporter, configure_tracing
+from .dependencies import get_task_completion_queue, get_task_inbox_hub
+from .infrastructure.bonita.transport import get_shared_async_transport
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    configure_tracing(
+        build_span_exporter(
+            settings.tracing_exporter, max_spans=settings.tracing_max_spans
+        )
+    )
+    store = get_session_store()
+    reaper = asyncio.create_task(
+        store.run_reaper(settings.session_store_reap_interval_seconds)
+    )
+    completion_queue = get_task_completion_queue()
+    completion_worker = None
+    if completion_queue is not None:
+        completion_queue.on_completed = notify_task_completed
+        completion_worker = asyncio.create_task(completion_queue.run())
+    try:
+        yield
+    finally:
+        reaper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await reaper
+        if completion_worker is not None:
+            completion_worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await completion_worker
+        await get_task_inbox_hub().close()
+        await store.reap(force=True)
+        await get_shared_async_transport().close_pool()
 
 
 app = FastAPI(
     title="Integración Python-Bonita",
     description="API de referencia para interactuar con Bonita BPM desde una aplicación FastAPI.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 templates = Jinja2Templates(directory="templates")
 
 
@@ -22,5 +75,7 @@ async def index(request: Request) -> HTMLResponse:
 
 app.include_router(auth_router, prefix="/api")
 app.include_router(contratos_router, prefix="/api")
+app.include_router(monitoring_router, prefix="/api")
+app.include_router(metrics_router)
 
 
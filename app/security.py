@@ -69,3 +69,25 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
         raise credentials_exception
     return username
 
+
+def get_admin_user(current_user: str = Depends(get_current_user)) -> str:
+    """
+    Como `get_current_user`, pero sólo admite a los usuarios de `ADMIN_USERS`;
+    para operaciones que afectan a todos los usuarios.
+    """
+    if current_user not in get_settings().admin_users:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="La operación requiere permisos de administración.",
+        )
+    return current_user
+
+
+def get_token_expiry(token: str = Depends(oauth2_scheme)) -> float | None:
+    """
+    Instante (epoch) en que caduca el JWT de la petición, para respuestas de
+    larga duración. Se usa junto a `get_current_user`, que ya lo ha validado.
+    """
+    expires_at = jwt.get_unverified_claims(token).get("exp")
+    return float(expires_at) if expires_at is not None else None
+
@@ -0,0 +1,101 @@
+"""
+Mide el rendimiento de las operaciones masivas de tareas (`asignar_tareas` y
+`completar_tareas`) contra un Bonita simulado con latencia configurable.
+
+Uso:
+    python -m benchmarks.bulk_tasks --tasks 200 --latency-ms 50 --concurrency 1 5 10 25 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+from app.domain.contratos.entities import TaskAssignment, TaskCompletion
+from app.domain.contratos.services import AsyncContratosService
+from app.infrastructure.bonita.async_client import AsyncBonitaClient
+from app.infrastructure.bonita.async_contratos_repository import (
+    AsyncBonitaContratosRepository,
+)
+
+BASE_URL = "http://bonita.mock/bonita"
+
+
+def build_mock_transport(latency_seconds: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/loginservice"):
+            return httpx.Response(
+                204,
+                headers=[
+                    ("set-cookie", "JSESSIONID=bench; Path=/bonita"),
+                    ("set-cookie", "X-Bonita-API-Token=bench-token; Path=/bonita"),
+                ],
+            )
+        await asyncio.sleep(latency_seconds)
+        if "/API/bpm/humanTask/" in request.url.path:
+            return httpx.Response(200)
+        if request.url.path.endswith("/execution"):
+            return httpx.Response(204)
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+async def build_service(latency_seconds: float) -> AsyncContratosService:
+    client = AsyncBonitaClient(
+        base_url=BASE_URL,
+        username="bench",
+        password="bench",
+        http_client=httpx.AsyncClient(transport=build_mock_transport(latency_seconds)),
+    )
+    await client.login()
+    return AsyncContratosService(AsyncBonitaContratosRepository(client=client))
+
+
+async def run_case(
+    service: AsyncContratosService, operation: str, tasks: int, concurrency: int
+) -> float:
+    started = time.perf_counter()
+    if operation == "assign":
+        results = service.asignar_tareas(
+            [TaskAssignment(task_id=str(i), user_id="1") for i in range(tasks)],
+            max_concurrency=concurrency,
+        )
+    else:
+        results = service.completar_tareas(
+            [TaskCompletion(task_id=str(i)) for i in range(tasks)],
+            max_concurrency=concurrency,
+        )
+    failures = 0
+    async for result in results:
+        failures += 0 if result.ok else 1
+    if failures:
+        raise RuntimeError(f"{failures} operaciones fallaron durante el benchmark.")
+    return time.perf_counter() - started
+
+
+async def main(tasks: int, latency_ms: float, concurrencies: List[int]) -> None:
+    service = await build_service(latency_ms / 1000)
+    print(f"{tasks} tareas, latencia simulada de Bonita {latency_ms:.0f} ms")
+    print(f"{'operación':<10} {'concurrencia':>12} {'segundos':>10} {'tareas/s':>10}")
+    for operation in ("assign", "complete"):
+        for concurrency in concurrencies:
+            elapsed = await run_case(service, operation, tasks, concurrency)
+            print(
+                f"{operation:<10} {concurrency:>12} {elapsed:>10.3f} "
+                f"{tasks / elapsed:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 5, 10, 25, 50]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.latency_ms, args.concurrency))
@@ -0,0 +1,366 @@
+"""
+Servidor Bonita simulado para benchmarks y pruebas locales sin una instancia real.
+
+Implementa el subconjunto de la API REST que usa la aplicación: `loginservice` /
+`logoutservice` con las cookies `JSESSIONID` y `X-Bonita-API-Token` (exigida como
+cabecera CSRF en las escrituras), `/API/system/session`, `/API/bpm/process`,
+`/API/bpm/userTask`, `/API/bpm/humanTask`, `/API/bpm/case` y
+`/API/bpm/caseVariable`, con paginación `p`/`c`, orden `o`, filtros `f` y
+`Content-Range`. Permite añadir latencia y respuestas de error aleatorias a las
+llamadas `/API`.
+
+Uso:
+    python -m benchmarks.fake_bonita --port 8081 --latency-ms 20 --error-rate 0.01
+    BONITA_URL=http://127.0.0.1:8081/bonita uvicorn app.main:app
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S.000"
+
+
+@dataclass(frozen=True)
+class FakeBonitaConfig:
+    processes: int = 20
+    tasks: int = 500
+    cases: int = 200
+    variables_per_case: int = 40
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: int = 0
+
+
+class FakeBonitaState:
+    """
+    Datos en memoria generados de forma determinista a partir de `seed`.
+    """
+
+    def __init__(self, config: FakeBonitaConfig) -> None:
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.sessions: Dict[str, Tuple[str, str]] = {}
+        self.users: Dict[str, str] = {}
+        base_date = datetime(2024, 1, 1)
+
+        self.processes: List[Dict[str, Any]] = [
+            {
+                "id": str(5000 + i),
+                "name": f"Contrato{i}",
+                "displayName": f"Contrato {i}",
+                "version": "1.0",
+                "activationState": "ENABLED",
+                "configurationState": "RESOLVED",
+                "deploymentDate": base_date.strftime(_DATE_FORMAT),
+                "description": f"Proceso de contratos número {i}",
+            }
+            for i in range(max(1, config.processes))
+        ]
+        self.cases: Dict[str, Dict[str, Any]] = {}
+        for i in range(config.cases):
+            self._add_case(str(1000 + i), self.processes[i % len(self.processes)]["id"])
+        self.tasks: List[Dict[str, Any]] = []
+        for i in range(config.tasks):
+            case_id = str(1000 + i % max(1, config.cases))
+            process_id = self.processes[i % len(self.processes)]["id"]
+            updated = base_date + timedelta(minutes=i)
+            self.tasks.append(
+                {
+                    "id": str(20000 + i),
+                    "name": f"Revisar contrato {i}",
+                    "displayName": f"Revisar contrato {i}",
+                    "description": "",
+                    "state": "ready",
+                    "type": "USER_TASK",
+                    "priority": "normal",
+                    "assigned_id": "",
+                    "assigned_date": "",
+                    "caseId": case_id,
+                    "rootCaseId": case_id,
+                    "parentCaseId": case_id,
+                    "processId": process_id,
+                    "rootContainerId": case_id,
+                    "executedBy": "0",
+                    "dueDate": (updated + timedelta(days=7)).strftime(_DATE_FORMAT),
+                    "reached_state_date": updated.strftime(_DATE_FORMAT),
+                    "last_update_date": updated.strftime(_DATE_FORMAT),
+                }
+            )
+        self.tasks_by_id = {task["id"]: task for task in self.tasks}
+
+    def _add_case(self, case_id: str, process_id: str) -> Dict[str, Any]:
+        now = datetime(2024, 1, 1).strftime(_DATE_FORMAT)
+        case = {
+            "id": case_id,
+            "processDefinitionId": process_id,
+            "rootCaseId": case_id,
+            "state": "started",
+            "started_by": "4",
+            "startedBySubstitute": "4",
+            "start": now,
+            "last_update_date": now,
+            "end_date": "",
+        }
+        self.cases[case_id] = case
+        return case
+
+    def new_case(self, process_id: str) -> Dict[str, Any]:
+        case_id = str(1000 + len(self.cases))
+        return self._add_case(case_id, process_id)
+
+    def variables(self, case_id: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                "case_id": case_id,
+                "name": f"variable{i}",
+                "description": "",
+                "type": "java.lang.String",
+                "value": f"valor {i} del caso {case_id}",
+            }
+            for i in range(self.config.variables_per_case)
+        ]
+
+
+def _touch(task: Dict[str, Any]) -> None:
+    task["last_update_date"] = datetime.now().strftime(_DATE_FORMAT)
+
+
+def _filters(request: Request) -> Dict[str, str]:
+    filters = {}
+    for value in request.query_params.getlist("f"):
+        name, _, expected = value.partition("=")
+        filters[name] = expected
+    return filters
+
+
+def _sorted(request: Request, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    order = request.query_params.get("o")
+    if not order:
+        return items
+    name, _, direction = order.partition(" ")
+    return sorted(
+        items,
+        key=lambda item: str(item.get(name, "")),
+        reverse=direction.strip().upper() == "DESC",
+    )
+
+
+def _page(request: Request, items: List[Dict[str, Any]]) -> JSONResponse:
+    page = int(request.query_params.get("p", 0))
+    count = int(request.query_params.get("c", 10))
+    start = page * count
+    chunk = items[start : start + count]
+    return JSONResponse(
+        chunk, headers={"Content-Range": f"{start}-{start + len(chunk)}/{len(items)}"}
+    )
+
+
+def create_app(config: Optional[FakeBonitaConfig] = None) -> Starlette:
+    """
+    Crea la aplicación ASGI del Bonita simulado, servida bajo `/bonita`.
+    """
+    state = FakeBonitaState(config or FakeBonitaConfig())
+
+    async def simulate(request: Request) -> Optional[Response]:
+        """
+        Aplica latencia, errores inyectados, sesión y CSRF a una llamada `/API`.
+        """
+        cfg = state.config
+        if cfg.latency_ms or cfg.jitter_ms:
+            jitter = state.random.uniform(0, cfg.jitter_ms)
+            await asyncio.sleep((cfg.latency_ms + jitter) / 1000)
+        if cfg.error_rate and state.random.random() < cfg.error_rate:
+            return Response(status_code=cfg.error_status)
+        session = state.sessions.get(request.cookies.get("JSESSIONID", ""))
+        if session is None:
+            return Response(status_code=401)
+        if request.method != "GET":
+            if request.headers.get("X-Bonita-API-Token") != session[1]:
+                return Response(status_code=401)
+        request.state.username = session[0]
+        return None
+
+    async def login(request: Request) -> Response:
+        form = await request.form()
+        username = str(form.get("username") or "")
+        if not username or not form.get("password"):
+            return Response(status_code=401)
+        session_id, token = secrets.token_hex(16), secrets.token_hex(16)
+        state.sessions[session_id] = (username, token)
+        state.users.setdefault(username, str(len(state.users) + 1))
+        response = Response(status_code=204)
+        response.set_cookie("JSESSIONID", session_id, path="/bonita", httponly=True)
+        response.set_cookie("X-Bonita-API-Token", token, path="/bonita")
+        return response
+
+    async def logout(request: Request) -> Response:
+        state.sessions.pop(request.cookies.get("JSESSIONID", ""), None)
+        return Response(status_code=200)
+
+    async def session_info(request: Request) -> Response:
+        return await simulate(request) or JSONResponse(
+            {
+                "user_id": state.users.get(request.state.username, "0"),
+                "user_name": request.state.username,
+                "is_technical_user": "false",
+            }
+        )
+
+    async def processes(request: Request) -> Response:
+        return await simulate(request) or _page(
+            request, _sorted(request, state.processes)
+        )
+
+    async def instantiate(request: Request) -> Response:
+        error = await simulate(request)
+        if error is not None:
+            return error
+        process_id = request.path_params["process_id"]
+        if not any(proc["id"] == process_id for proc in state.processes):
+            return JSONResponse({"message": "process not found"}, status_code=404)
+        case = state.new_case(process_id)
+        return JSONResponse({"caseId": int(case["id"])})
+
+    async def user_tasks(request: Request) -> Response:
+        error = await simulate(request)
+        if error is not None:
+            return error
+        filters = _filters(request)
+        tasks = [
+            task
+            for task in state.tasks
+            if all(str(task.get(name, "")) == value for name, value in filters.items())
+        ]
+        return _page(request, _sorted(request, tasks))
+
+    async def assign(request: Request) -> Response:
+        error = await simulate(request)
+        if error is not None:
+            return error
+        task = state.tasks_by_id.get(request.path_params["task_id"])
+        if task is None:
+            return JSONResponse({"message": "task not found"}, status_code=404)
+        payload = await request.json()
+        task["assigned_id"] = str(payload.get("assigned_id") or "")
+        _touch(task)
+        return Response(status_code=200)
+
+    async def execute(request: Request) -> Response:
+        error = await simulate(request)
+        if error is not None:
+            return error
+        task = state.tasks_by_id.get(request.path_params["task_id"])
+        if task is None:
+            return JSONResponse({"message": "task not found"}, status_code=404)
+        task["state"] = "completed"
+        _touch(task)
+        return Response(status_code=204)
+
+    async def archived_tasks(request: Request) -> Response:
+        error = await simulate(request)
+        if error is not None:
+            return error
+        source_id = _filters(request).get("sourceObjectId")
+        archived = [
+            {**task, "id": f"9{task['id']}", "sourceObjectId": task["id"]}
+            for task in state.tasks
+            if task["state"] == "completed"
+            and (source_id is None or task["id"] == source_id)
+        ]
+        return _page(request, archived)
+
+    async def case(request: Request) -> Response:
+        error = await simulate(request)
+        if error is not None:
+            return error
+        found = state.cases.get(request.path_params["case_id"])
+        if found is None:
+            return JSONResponse({"message": "case not found"}, status_code=404)
+        return JSONResponse(found)
+
+    async def case_variables(request: Request) -> Response:
+        error = await simulate(request)
+        if error is not None:
+            return error
+        case_id = _filters(request).get("case_id", "")
+        if case_id not in state.cases:
+            return _page(request, [])
+        return _page(request, state.variables(case_id))
+
+    routes = [
+        Route("/bonita/loginservice", login, methods=["POST"]),
+        Route("/bonita/logoutservice", logout, methods=["GET", "POST"]),
+        Route("/bonita/API/system/session/{session_id}", session_info),
+        Route("/bonita/API/bpm/process", processes),
+        Route(
+            "/bonita/API/bpm/process/{process_id}/instantiation",
+            instantiate,
+            methods=["POST"],
+        ),
+        Route("/bonita/API/bpm/userTask", user_tasks),
+        Route(
+            "/bonita/API/bpm/userTask/{task_id}/execution", execute, methods=["POST"]
+        ),
+        Route("/bonita/API/bpm/humanTask/{task_id}", assign, methods=["PUT"]),
+        Route("/bonita/API/bpm/archivedHumanTask", archived_tasks),
+        Route("/bonita/API/bpm/case/{case_id}", case),
+        Route("/bonita/API/bpm/caseVariable", case_variables),
+    ]
+    app = Starlette(routes=routes)
+    app.state.bonita = state
+    return app
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--processes", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--variables-per-case", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeBonitaConfig:
+    return FakeBonitaConfig(
+        processes=args.processes,
+        tasks=args.tasks,
+        cases=args.cases,
+        variables_per_case=args.variables_per_case,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(config_from_args(args)),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
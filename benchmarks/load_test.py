@@ -0,0 +1,258 @@
+"""
+Prueba de carga de extremo a extremo: arranca el Bonita simulado
+(`benchmarks.fake_bonita`) en un proceso aparte, apunta la aplicación a él y la
+recorre en proceso con `httpx.ASGITransport` a concurrencias crecientes. Para
+cada endpoint informa peticiones/s y latencias p50/p95/p99.
+
+Uso:
+    python -m benchmarks.load_test --concurrency 1 10 50 --requests 300
+    python -m benchmarks.load_test --scenarios tasks case --max-p95-ms 250
+
+Con `--max-p95-ms` termina con código 1 si algún p95 supera el umbral, para
+detectar regresiones antes de desplegar. La caché de respuestas
+(`API_RESPONSE_CACHE_TTL_SECONDS`) se desactiva salvo que se exporte la variable,
+para medir el camino completo hasta Bonita.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import logging
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+from .fake_bonita import add_config_arguments
+
+# Escenario -> (método, ruta en función del número de petición).
+SCENARIOS: Dict[str, tuple[str, Callable[[int], str]]] = {
+    "processes": ("GET", lambda i: "/api/bonita/processes?count=20"),
+    "tasks": ("GET", lambda i: f"/api/bonita/tasks?count=50&page={i % 10}"),
+    "tasks_lean": (
+        "GET",
+        lambda i: f"/api/bonita/tasks?count=50&page={i % 10}&include_metadata=false",
+    ),
+    "tasks_stream": ("GET", lambda i: "/api/bonita/tasks:stream"),
+    "case": ("GET", lambda i: f"/api/bonita/cases/{1000 + i % 200}"),
+    "assign": ("POST", lambda i: f"/api/bonita/tasks/{20000 + i % 500}/assign"),
+}
+
+
+@dataclass
+class LevelResult:
+    scenario: str
+    concurrency: int
+    elapsed_seconds: float
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def requests_per_second(self) -> float:
+        total = len(self.latencies) + sum(self.errors.values())
+        return total / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def percentile_ms(self, percentile: float) -> float:
+        """
+        Percentil por rango más cercano de las peticiones correctas, en ms.
+        """
+        if not self.latencies:
+            return math.nan
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[rank - 1] * 1000
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError):
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"El Bonita simulado no respondió en el puerto {port}.")
+
+
+@contextlib.contextmanager
+def run_fake_bonita(args: argparse.Namespace) -> Iterator[str]:
+    """
+    Arranca `benchmarks.fake_bonita` en un subproceso y devuelve su `BONITA_URL`.
+    """
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.fake_bonita",
+        "--port",
+        str(port),
+        "--processes",
+        str(args.processes),
+        "--tasks",
+        str(args.tasks),
+        "--cases",
+        str(args.cases),
+        "--variables-per-case",
+        str(args.variables_per_case),
+        "--latency-ms",
+        str(args.latency_ms),
+        "--jitter-ms",
+        str(args.jitter_ms),
+        "--error-rate",
+        str(args.error_rate),
+        "--error-status",
+        str(args.error_status),
+        "--seed",
+        str(args.seed),
+    ]
+    process = subprocess.Popen(command)
+    try:
+        _wait_for_port(port)
+        yield f"http://127.0.0.1:{port}/bonita"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def run_level(
+    api: httpx.AsyncClient,
+    tokens: List[str],
+    scenario: str,
+    concurrency: int,
+    requests: int,
+) -> LevelResult:
+    method, path_for = SCENARIOS[scenario]
+    counter = itertools.count()
+    result = LevelResult(scenario, concurrency, 0.0)
+
+    async def worker() -> None:
+        while (i := next(counter)) < requests:
+            headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+            body = {"user_id": "1"} if method == "POST" else None
+            started = time.perf_counter()
+            response = await api.request(
+                method, path_for(i), headers=headers, json=body
+            )
+            await response.aread()
+            elapsed = time.perf_counter() - started
+            if response.status_code < 400:
+                result.latencies.append(elapsed)
+            else:
+                result.errors[response.status_code] = (
+                    result.errors.get(response.status_code, 0) + 1
+                )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+async def main(args: argparse.Namespace) -> int:
+    # La aplicación lee la configuración al importarse: se importa tras fijarla.
+    from app.main import app
+
+    # Los avisos de reintentos con `--error-rate` ocultarían la tabla.
+    logging.disable(logging.WARNING)
+
+    results: List[LevelResult] = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://api", timeout=60
+        ) as api:
+            tokens = []
+            for n in range(args.users):
+                response = await api.post(
+                    "/api/auth/token",
+                    data={"username": f"bench{n}", "password": "bench"},
+                )
+                response.raise_for_status()
+                tokens.append(response.json()["access_token"])
+
+            print(
+                f"{'escenario':<13} {'conc.':>5} {'pet/s':>9} {'p50 ms':>8} "
+                f"{'p95 ms':>8} {'p99 ms':>8} {'errores':>8}"
+            )
+            for scenario in args.scenarios:
+                for concurrency in args.concurrency:
+                    result = await run_level(
+                        api, tokens, scenario, concurrency, args.requests
+                    )
+                    results.append(result)
+                    errors = ",".join(
+                        f"{code}x{count}"
+                        for code, count in sorted(result.errors.items())
+                    )
+                    print(
+                        f"{scenario:<13} {concurrency:>5} "
+                        f"{result.requests_per_second:>9.1f} "
+                        f"{result.percentile_ms(50):>8.1f} "
+                        f"{result.percentile_ms(95):>8.1f} "
+                        f"{result.percentile_ms(99):>8.1f} {errors or '-':>8}"
+                    )
+
+    if args.max_p95_ms is not None:
+        slow = [r for r in results if r.percentile_ms(95) > args.max_p95_ms]
+        for r in slow:
+            print(
+                f"REGRESIÓN: {r.scenario} con concurrencia {r.concurrency} tiene "
+                f"p95 {r.percentile_ms(95):.1f} ms > {args.max_p95_ms:.1f} ms",
+                file=sys.stderr,
+            )
+        if slow:
+            return 1
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument(
+        "--requests", type=int, default=300, help="Peticiones por escenario y nivel"
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=["processes", "tasks", "tasks_lean", "case", "assign"],
+    )
+    parser.add_argument(
+        "--users", type=int, default=4, help="Usuarios distintos que reparten la carga"
+    )
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    parser.add_argument(
+        "--bonita-url",
+        default=None,
+        help="Usa un Bonita (real o simulado) ya en marcha en lugar de arrancar uno",
+    )
+    add_config_arguments(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("API_RESPONSE_CACHE_TTL_SECONDS", "0")
+    if args.bonita_url:
+        os.environ["BONITA_URL"] = args.bonita_url
+        sys.exit(asyncio.run(main(args)))
+    with run_fake_bonita(args) as bonita_url:
+        os.environ["BONITA_URL"] = bonita_url
+        exit_code = asyncio.run(main(args))
+    sys.exit(exit_code)
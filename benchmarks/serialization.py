@@ -0,0 +1,153 @@
+"""
+Compara el coste de serializar respuestas con los DTO de Pydantic (validación en
+`to_*_dto` y de nuevo con `response_model`, como hace FastAPI) frente a la ruta
+rápida de `API_FAST_SERIALIZATION` (diccionarios con alias y `FastJSONResponse`).
+
+Uso:
+    python -m benchmarks.serialization --items 10 100 1000 --repeat 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.dto.contratos import (
+    ContractCaseWithVariablesDTO,
+    ContractTaskDTO,
+    to_contract_case_with_variables_dto,
+    to_contract_case_with_variables_payload,
+    to_contract_task_dto,
+    to_contract_task_payload,
+)
+from app.api.serialization import FastJSONResponse
+from app.domain.contratos.entities import (
+    ContractCase,
+    ContractCaseVariable,
+    ContractCaseWithVariables,
+    ContractTask,
+)
+
+
+def build_tasks(items: int) -> List[ContractTask]:
+    return [
+        ContractTask(
+            id=str(i),
+            name=f"Revisar contrato {i}",
+            display_name=f"Revisar contrato {i}",
+            state="ready",
+            assigned_id=str(i % 7) if i % 2 else None,
+            last_update_date="2024-04-24 10:00:00.000",
+            case_id=str(1000 + i),
+            process_id="5001",
+            due_date="2024-05-01 10:00:00.000",
+            metadata={
+                "id": str(i),
+                "caseId": str(1000 + i),
+                "processId": "5001",
+                "priority": "normal",
+                "dueDate": "2024-05-01 10:00:00.000",
+            },
+        )
+        for i in range(items)
+    ]
+
+
+def build_case(items: int) -> ContractCaseWithVariables:
+    return ContractCaseWithVariables(
+        case=ContractCase(
+            id="1001",
+            process_definition_id="5001",
+            state="started",
+            started_by="4",
+            metadata={"id": "1001", "processDefinitionId": "5001"},
+        ),
+        variables=[
+            ContractCaseVariable(
+                name=f"var{i}",
+                value={"importe": i * 10.5, "moneda": "EUR"},
+                id=str(i),
+                case_id="1001",
+                metadata={"type": "java.util.Map"},
+            )
+            for i in range(items)
+        ],
+    )
+
+
+def dto_path(
+    response_type: Any, build: Callable[[], Any]
+) -> Callable[[], Awaitable[bytes]]:
+    field = create_response_field(name="response", type_=response_type)
+
+    async def run() -> bytes:
+        content = await serialize_response(field=field, response_content=build())
+        return JSONResponse(content).body
+
+    return run
+
+
+def fast_path(build: Callable[[], Any]) -> Callable[[], Awaitable[bytes]]:
+    async def run() -> bytes:
+        return FastJSONResponse(build()).body
+
+    return run
+
+
+async def measure(run: Callable[[], Awaitable[bytes]], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await run()
+    return (time.perf_counter() - started) / repeat
+
+
+async def main(sizes: List[int], repeat: int) -> None:
+    print(
+        f"{'respuesta':<10} {'elementos':>9} {'dto ms':>9} "
+        f"{'rápida ms':>10} {'mejora':>7}"
+    )
+    for items in sizes:
+        tasks = build_tasks(items)
+        case = build_case(items)
+        scenarios = (
+            (
+                "tasks",
+                dto_path(
+                    List[ContractTaskDTO],
+                    lambda: [to_contract_task_dto(task) for task in tasks],
+                ),
+                fast_path(lambda: [to_contract_task_payload(task) for task in tasks]),
+            ),
+            (
+                "case",
+                dto_path(
+                    ContractCaseWithVariablesDTO,
+                    lambda: to_contract_case_with_variables_dto(case),
+                ),
+                fast_path(lambda: to_contract_case_with_variables_payload(case)),
+            ),
+        )
+        for name, slow, fast in scenarios:
+            if await slow() != await fast():
+                raise RuntimeError(
+                    f"Las dos rutas generan JSON distinto para '{name}'."
+                )
+            slow_seconds = await measure(slow, repeat)
+            fast_seconds = await measure(fast, repeat)
+            print(
+                f"{name:<10} {items:>9} {slow_seconds * 1000:>9.3f} "
+                f"{fast_seconds * 1000:>10.3f} {slow_seconds / fast_seconds:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.repeat))
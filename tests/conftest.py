@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+# La configuración se lee una sola vez (`get_settings` está cacheada): se fija
+# antes de importar la aplicación en cualquier módulo de pruebas.
+_STATE_DIR = tempfile.mkdtemp(prefix="bonita-tests-")
+os.environ.setdefault("BONITA_URL", "http://bonita/bonita")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ADMIN_USERS", "admin")
+os.environ.setdefault("API_RESPONSE_CACHE_TTL_SECONDS", "0")
+os.environ.setdefault("TASK_COMPLETION_MODE", "prefer")
+os.environ.setdefault("TASK_COMPLETION_RETRY_BASE_SECONDS", "0.01")
+os.environ.setdefault(
+    "TASK_COMPLETION_QUEUE_PATH", os.path.join(_STATE_DIR, "operations.sqlite3")
+)
+os.environ.setdefault(
+    "BULK_CHECKPOINT_PATH", os.path.join(_STATE_DIR, "imports.sqlite3")
+)
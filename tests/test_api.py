@@ -0,0 +1,119 @@
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import conditional
+from app.api.routers import contratos
+from app.core.ttl_cache import TTLCache
+from app.infrastructure.bonita.transport import get_shared_async_transport
+from app.infrastructure.persistence import sqlite_operations
+from app.main import app
+from benchmarks.fake_bonita import FakeBonitaConfig, create_app
+
+
+@pytest.fixture(scope="module")
+def client():
+    transport = get_shared_async_transport()
+    original = transport._inner
+    transport._inner = httpx.ASGITransport(
+        app=create_app(FakeBonitaConfig(tasks=50, processes=5, cases=20))
+    )
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        transport._inner = original
+
+
+@pytest.fixture(scope="module")
+def headers(client):
+    response = client.post(
+        "/api/auth/token", data={"username": "ana", "password": "secreto"}
+    )
+    assert response.status_code == 200
+    return {"Authorization": "Bearer " + response.json()["access_token"]}
+
+
+@pytest.mark.parametrize("path", ["/api/monitoring/stats", "/api/monitoring/traces"])
+def test_monitoring_requires_authentication(client, headers, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers=headers).status_code == 200
+
+
+def test_health_stays_public(client):
+    assert client.get("/api/monitoring/health").status_code == 200
+
+
+def test_cases_batch_reports_errors_per_item(client, headers):
+    response = client.post(
+        "/api/bonita/cases:batch",
+        headers=headers,
+        json={"case_ids": ["1001", "1001", "999999"], "include_variables": False},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["succeeded"] == 1
+    assert body["failed"] == 1
+
+
+def test_async_completion_is_tracked_as_an_operation(client, headers):
+    response = client.post(
+        "/api/bonita/tasks/20001/complete",
+        headers={**headers, "Prefer": "respond-async"},
+        json={},
+    )
+    assert response.status_code == 202
+    operation_id = response.json()["operationId"]
+
+    status = None
+    for _ in range(100):
+        status = client.get(f"/api/bonita/operations/{operation_id}", headers=headers)
+        if status.json()["status"] not in ("pending", "running"):
+            break
+        time.sleep(0.02)
+
+    assert status.json()["status"] == "succeeded"
+    assert client.get("/api/bonita/operations/nope", headers=headers).status_code == 404
+
+
+def test_process_cache_invalidation_requires_an_admin(client, headers):
+    response = client.post("/api/bonita/processes/cache/invalidate", headers=headers)
+    assert response.status_code == 403
+
+    token = client.post(
+        "/api/auth/token", data={"username": "admin", "password": "secreto"}
+    ).json()["access_token"]
+    response = client.post(
+        "/api/bonita/processes/cache/invalidate",
+        headers={"Authorization": "Bearer " + token},
+    )
+    assert response.status_code == 204
+
+
+def test_path_invalidation_clears_every_user(monkeypatch):
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(conditional, "get_response_cache", lambda: cache)
+    for scope in ("ana", "luis"):
+        cache.set((scope, "/api/bonita/processes", ()), "procesos")
+        cache.set((scope, "/api/bonita/tasks", ()), "tareas")
+
+    conditional.invalidate_path_responses("/api/bonita/processes")
+
+    assert cache.get(("ana", "/api/bonita/processes", ())) is None
+    assert cache.get(("luis", "/api/bonita/processes", ())) is None
+    assert cache.get(("luis", "/api/bonita/tasks", ())) == "tareas"
+
+
+def test_operations_are_not_found_without_the_queue(client, headers, monkeypatch):
+    def fail():
+        raise AssertionError("No debe abrirse la cola.")
+
+    monkeypatch.setattr(contratos, "get_task_completion_queue", lambda: None)
+    monkeypatch.setattr(sqlite_operations, "get_task_operation_store", fail)
+
+    response = client.get("/api/bonita/operations/cualquiera", headers=headers)
+
+    assert response.status_code == 404
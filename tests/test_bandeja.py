@@ -0,0 +1,134 @@
+import asyncio
+from typing import List
+
+from app.domain.contratos.bandeja import (
+    CHANGES_EVENT,
+    ERROR_EVENT,
+    SNAPSHOT_EVENT,
+    TaskInboxHub,
+    diff_tasks,
+)
+from app.domain.contratos.entities import ContractTask
+
+
+def _task(task_id: str, state: str = "ready") -> ContractTask:
+    return ContractTask(id=task_id, name="tarea", display_name="Tarea", state=state)
+
+
+class FakeFetch:
+    def __init__(self, tasks: List[ContractTask]) -> None:
+        self.tasks = tasks
+        self.calls = 0
+        self.error: Exception | None = None
+
+    async def __call__(self) -> List[ContractTask]:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return list(self.tasks)
+
+
+def test_diff_tasks_detects_added_changed_and_removed():
+    previous = {"1": _task("1"), "2": _task("2")}
+
+    diff, snapshot = diff_tasks(previous, [_task("1", state="executing"), _task("3")])
+
+    assert [task.id for task in diff.added] == ["3"]
+    assert [task.id for task in diff.changed] == ["1"]
+    assert diff.removed == ["2"]
+    assert set(snapshot) == {"1", "3"}
+
+
+def test_hub_shares_one_poller_between_subscribers():
+    fetch = FakeFetch([_task("1")])
+
+    async def scenario():
+        hub = TaskInboxHub(poll_seconds=60)
+        async with hub.subscribe(("ana", "ready"), fetch) as first:
+            async with hub.subscribe(("ana", "ready"), fetch) as second:
+                events = [
+                    await asyncio.wait_for(first.get(), 1),
+                    await asyncio.wait_for(second.get(), 1),
+                ]
+                stats = hub.stats()
+        return events, stats, hub.stats()
+
+    events, stats, after = asyncio.run(scenario())
+
+    assert [event.kind for event in events] == [SNAPSHOT_EVENT, SNAPSHOT_EVENT]
+    assert fetch.calls == 1
+    assert stats["pollers"] == 1 and stats["subscribers"] == 2
+    assert after["pollers"] == 0 and after["polls"] == 1
+
+
+def test_hub_refresh_publishes_only_the_changes():
+    fetch = FakeFetch([_task("1")])
+
+    async def scenario():
+        hub = TaskInboxHub(poll_seconds=60)
+        async with hub.subscribe(("ana", "ready"), fetch) as queue:
+            snapshot = await asyncio.wait_for(queue.get(), 1)
+            fetch.tasks = [_task("1"), _task("2")]
+            hub.refresh("ana")
+            changes = await asyncio.wait_for(queue.get(), 1)
+        return snapshot, changes
+
+    snapshot, changes = asyncio.run(scenario())
+
+    assert [task.id for task in snapshot.tasks] == ["1"]
+    assert changes.kind == CHANGES_EVENT
+    assert [task.id for task in changes.diff.added] == ["2"]
+
+
+def test_hub_publishes_fetch_errors():
+    fetch = FakeFetch([])
+    fetch.error = RuntimeError("Bonita caída")
+
+    async def scenario():
+        hub = TaskInboxHub(poll_seconds=60)
+        async with hub.subscribe(("ana",), fetch) as queue:
+            return await asyncio.wait_for(queue.get(), 1)
+
+    event = asyncio.run(scenario())
+
+    assert event.kind == ERROR_EVENT
+    assert str(event.error) == "Bonita caída"
+
+
+def test_hub_resyncs_subscribers_that_fall_behind():
+    fetch = FakeFetch([_task("1")])
+
+    async def scenario():
+        hub = TaskInboxHub(poll_seconds=60, queue_size=1)
+        async with hub.subscribe(("ana",), fetch) as queue:
+            await asyncio.sleep(0.01)
+            # No se consume el snapshot: el cambio no cabe en la cola.
+            fetch.tasks = [_task("1"), _task("2")]
+            hub.refresh("ana")
+            await asyncio.sleep(0.01)
+            event = queue.get_nowait()
+            stats = hub.stats()
+        return event, stats
+
+    event, stats = asyncio.run(scenario())
+
+    assert event.kind == SNAPSHOT_EVENT
+    assert {task.id for task in event.tasks} == {"1", "2"}
+    assert stats["resyncs"] == 1
+
+
+def test_hub_close_stops_a_poller_woken_at_the_same_time():
+    fetch = FakeFetch([_task("1")])
+
+    async def scenario():
+        hub = TaskInboxHub(poll_seconds=60)
+        async with hub.subscribe(("ana",), fetch) as queue:
+            await asyncio.wait_for(queue.get(), 1)
+            # La cancelación de `close()` llega con el bucle ya despierto.
+            hub.refresh("ana")
+            await asyncio.sleep(0)
+            closing = asyncio.ensure_future(hub.close())
+            done, _ = await asyncio.wait({closing}, timeout=1)
+            return closing in done
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,102 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.domain.contratos.entities import StartProcessResult
+from app.domain.contratos.importacion import (
+    ImportacionMasivaService,
+    ImportJobConflictError,
+    ImportJobRunningError,
+)
+from app.infrastructure.persistence.sqlite_checkpoints import (
+    SqliteImportCheckpointStore,
+)
+
+
+class FakeService:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.started = 0
+
+    async def iniciar_proceso(self, process_id, contract_inputs=None):
+        self.started += 1
+        await asyncio.sleep(self.delay)
+        return StartProcessResult(
+            case_id=str(self.started), process_definition_id=process_id
+        )
+
+
+async def _records(count: int):
+    for line_no in range(1, count + 1):
+        yield line_no, {"linea": line_no}
+
+
+@pytest.fixture
+def store(tmp_path) -> SqliteImportCheckpointStore:
+    return SqliteImportCheckpointStore(str(tmp_path / "imports.sqlite3"))
+
+
+def test_concurrent_run_of_the_same_job_is_rejected(store):
+    service = FakeService(delay=0.05)
+    importacion = ImportacionMasivaService(service, store)
+
+    async def scenario():
+        first = asyncio.create_task(
+            importacion.importar("job", "p1", "ana", _records(3))
+        )
+        await asyncio.sleep(0.01)
+        with pytest.raises(ImportJobRunningError):
+            await importacion.importar("job", "p1", "ana", _records(3))
+        return await first
+
+    report = asyncio.run(scenario())
+
+    assert report.started == 3
+    assert service.started == 3
+
+
+def test_finished_job_can_be_resumed_without_repeating_lines(store):
+    service = FakeService()
+    importacion = ImportacionMasivaService(service, store)
+    asyncio.run(importacion.importar("job", "p1", "ana", _records(2)))
+
+    report = asyncio.run(importacion.importar("job", "p1", "ana", _records(3)))
+
+    assert (report.skipped, report.started) == (2, 1)
+    assert service.started == 3
+
+
+def test_expired_lease_lets_another_run_take_over(store):
+    asyncio.run(store.start_job("job", "p1", "ana", "muerta", time.time() - 1))
+
+    report = asyncio.run(
+        ImportacionMasivaService(FakeService(), store).importar(
+            "job", "p1", "ana", _records(1)
+        )
+    )
+
+    assert report.started == 1
+
+
+def test_job_of_another_owner_is_a_conflict(store):
+    importacion = ImportacionMasivaService(FakeService(), store)
+    asyncio.run(importacion.importar("job", "p1", "ana", _records(1)))
+
+    with pytest.raises(ImportJobConflictError):
+        asyncio.run(importacion.importar("job", "p1", "luis", _records(1)))
+
+
+def test_store_adds_the_lease_columns_to_older_files(tmp_path):
+    path = str(tmp_path / "imports.sqlite3")
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE import_jobs (job_id TEXT PRIMARY KEY, process_id TEXT "
+            "NOT NULL, owner TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+    connection.close()
+
+    store = SqliteImportCheckpointStore(path)
+
+    asyncio.run(store.start_job("job", "p1", "ana", "run", time.time() + 60))
@@ -0,0 +1,173 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.domain.contratos.entities import ContractTask
+from app.domain.contratos.indice import (
+    TaskIndex,
+    TaskIndexRegistry,
+    TaskQuery,
+    parse_task_sort,
+)
+
+
+def _task(task_id: str, **fields) -> ContractTask:
+    values = {
+        "name": f"tarea {task_id}",
+        "display_name": f"Tarea {task_id}",
+        "state": "ready",
+    }
+    values.update(fields)
+    return ContractTask(id=task_id, **values)
+
+
+@pytest.fixture
+def index() -> TaskIndex:
+    index = TaskIndex()
+    index.replace_all(
+        [
+            _task("1", process_id="p1", due_date="2026-01-03", display_name="Revisar"),
+            _task("2", process_id="p1", due_date="2026-01-01", state="failed"),
+            _task("3", process_id="p2", due_date="2026-01-02"),
+            _task("4", process_id="p1"),
+        ]
+    )
+    return index
+
+
+def _ids(result) -> List[str]:
+    return [task.id for task in result[1]]
+
+
+def test_index_filters_by_secondary_indexes(index):
+    ready_p1 = TaskQuery(process_id="p1", states=frozenset({"ready"}))
+    assert _ids(index.query(ready_p1)) == ["1", "4"]
+    assert _ids(index.query(TaskQuery(text="revis"))) == ["1"]
+    assert _ids(
+        index.query(TaskQuery(due_after="2026-01-02", due_before="2026-01-03"))
+    ) == ["3"]
+
+
+def test_index_sorts_by_due_date_with_missing_dates_last(index):
+    assert _ids(index.query(TaskQuery())) == ["2", "3", "1", "4"]
+    assert _ids(index.query(TaskQuery(sort="dueDate DESC"))) == ["1", "3", "2", "4"]
+    assert _ids(index.query(TaskQuery(sort="id DESC"))) == ["4", "3", "2", "1"]
+
+
+def test_index_paginates_and_reports_the_total(index):
+    total, page = index.query(TaskQuery(page=1, count=3))
+
+    assert total == 4
+    assert [task.id for task in page] == ["4"]
+
+
+def test_index_upsert_reindexes_changed_tasks(index):
+    index.upsert(_task("2", process_id="p2", due_date="2026-01-05"))
+
+    assert _ids(index.query(TaskQuery(process_id="p1"))) == ["1", "4"]
+    assert _ids(index.query(TaskQuery(process_id="p2"))) == ["3", "2"]
+    assert not index.upsert(_task("2", process_id="p2", due_date="2026-01-05"))
+
+
+def test_parse_task_sort_rejects_unknown_fields():
+    assert parse_task_sort("caseId DESC") == ("case_id", True)
+    with pytest.raises(ValueError):
+        parse_task_sort("priority ASC")
+
+
+class FakeService:
+    def __init__(self, tasks: List[ContractTask]) -> None:
+        self.tasks = tasks
+        self.sorts: List[str] = []
+
+    async def iterar_tareas(
+        self, *, state=None, sort=None, page_size=100, include_metadata=True
+    ):
+        self.sorts.append(sort)
+        tasks = self.tasks
+        if sort == "last_update_date DESC":
+            tasks = sorted(tasks, key=lambda task: task.last_update_date, reverse=True)
+        for task in tasks:
+            yield task
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_registry_refreshes_incrementally_from_the_watermark():
+    clock = FakeClock()
+    registry = TaskIndexRegistry(refresh_seconds=10, full_sync_seconds=300, clock=clock)
+    service = FakeService(
+        [_task("1", last_update_date="10"), _task("2", last_update_date="20")]
+    )
+
+    index = asyncio.run(registry.get("ana", service))
+    assert len(index) == 2
+    assert index.watermark == "20"
+
+    # Dentro del intervalo no se consulta Bonita.
+    asyncio.run(registry.get("ana", service))
+    assert len(service.sorts) == 1
+
+    service.tasks = [
+        _task("1", last_update_date="10"),
+        _task("2", last_update_date="30", state="executing"),
+        _task("3", last_update_date="25"),
+    ]
+    clock.now = 10
+    index = asyncio.run(registry.get("ana", service))
+
+    assert service.sorts[-1] == "last_update_date DESC"
+    assert index.get("2").state == "executing"
+    assert index.get("3") is not None
+    assert registry.stats()["full_syncs"] == 1
+    assert registry.stats()["incremental_refreshes"] == 1
+
+
+def test_registry_full_sync_drops_tasks_that_no_longer_exist():
+    clock = FakeClock()
+    registry = TaskIndexRegistry(refresh_seconds=10, full_sync_seconds=300, clock=clock)
+    service = FakeService(
+        [_task("1", last_update_date="10"), _task("2", last_update_date="20")]
+    )
+    asyncio.run(registry.get("ana", service))
+
+    service.tasks = [_task("2", last_update_date="20")]
+    clock.now = 300
+    index = asyncio.run(registry.get("ana", service))
+
+    assert index.get("1") is None
+    assert registry.stats()["full_syncs"] == 2
+
+
+def test_registry_mark_stale_and_forget_task():
+    registry = TaskIndexRegistry(refresh_seconds=10, clock=FakeClock())
+    service = FakeService([_task("1", last_update_date="10")])
+    asyncio.run(registry.get("ana", service))
+
+    registry.forget_task("ana", "1")
+    registry.mark_stale("ana")
+    service.tasks = [
+        _task("1", last_update_date="10"),
+        _task("2", last_update_date="15"),
+    ]
+    index = asyncio.run(registry.get("ana", service))
+
+    assert registry.stats()["incremental_refreshes"] == 1
+    assert index.get("2") is not None
+
+
+def test_registry_evicts_least_recently_used_users():
+    registry = TaskIndexRegistry(max_users=1, clock=FakeClock())
+    service = FakeService([])
+    asyncio.run(registry.get("ana", service))
+    asyncio.run(registry.get("luis", service))
+
+    assert registry.stats()["users"] == 1
+    assert registry.stats()["evictions"] == 1
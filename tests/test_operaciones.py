@@ -0,0 +1,300 @@
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from app.domain.contratos.entities import TaskCompletion
+from app.domain.contratos.operaciones import (
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    WAITING_SESSION,
+    TaskCompletionQueue,
+    TaskOperation,
+)
+from app.infrastructure.bonita.client import (
+    BonitaAuthenticationError,
+    BonitaClientError,
+    is_bonita_session_error,
+    is_transient_bonita_error,
+    is_unsent_bonita_error,
+)
+from app.infrastructure.persistence.sqlite_operations import SqliteTaskOperationStore
+
+
+def _operation(
+    operation_id: str, task_id: str = "1", owner: str = "ana"
+) -> TaskOperation:
+    return TaskOperation(
+        operation_id=operation_id,
+        kind="complete_task",
+        owner=owner,
+        task_id=task_id,
+        payload={"contract_inputs": {"ok": True}},
+    )
+
+
+@pytest.fixture
+def store(tmp_path) -> SqliteTaskOperationStore:
+    return SqliteTaskOperationStore(str(tmp_path / "operations.sqlite3"))
+
+
+def test_enqueue_returns_the_unfinished_operation_for_the_same_task(store):
+    first = asyncio.run(store.enqueue(_operation("a")))
+    again = asyncio.run(store.enqueue(_operation("b")))
+
+    assert again.operation_id == first.operation_id == "a"
+
+
+def test_claim_leases_operations_to_one_worker(store):
+    asyncio.run(store.enqueue(_operation("a", task_id="1")))
+    asyncio.run(store.enqueue(_operation("b", task_id="2")))
+
+    claimed = asyncio.run(store.claim("w1", 10, now=1, lease_until=61))
+    assert [op.operation_id for op in claimed] == ["a", "b"]
+    assert all(op.status == RUNNING for op in claimed)
+
+    # Otro worker no ve las operaciones mientras el arrendamiento siga vigente.
+    assert asyncio.run(store.claim("w2", 10, now=30, lease_until=90)) == []
+
+
+def test_expired_lease_is_reclaimed_counting_the_interrupted_attempt(store):
+    asyncio.run(store.enqueue(_operation("a")))
+    asyncio.run(store.claim("w1", 10, now=1, lease_until=61))
+
+    reclaimed = asyncio.run(store.claim("w2", 10, now=61, lease_until=121))
+
+    assert [op.operation_id for op in reclaimed] == ["a"]
+    assert reclaimed[0].attempts == 1
+
+    # El worker original ya no puede cambiar el estado.
+    asyncio.run(store.mark_succeeded("w1", "a"))
+    assert asyncio.run(store.get("a")).status == RUNNING
+
+
+def test_renew_keeps_the_lease_alive(store):
+    asyncio.run(store.enqueue(_operation("a")))
+    asyncio.run(store.claim("w1", 10, now=1, lease_until=61))
+
+    asyncio.run(store.renew("w1", ["a"], lease_until=200))
+    asyncio.run(store.renew("w2", ["a"], lease_until=70))
+
+    assert asyncio.run(store.claim("w2", 10, now=100, lease_until=160)) == []
+
+
+def test_release_returns_operations_to_pending(store):
+    asyncio.run(store.enqueue(_operation("a")))
+    asyncio.run(store.claim("w1", 10, now=1, lease_until=61))
+
+    asyncio.run(store.release("w1", ["a"]))
+
+    operation = asyncio.run(store.get("a"))
+    assert operation.status == PENDING
+    assert operation.attempts == 1
+
+
+def test_retry_waits_until_next_attempt(store):
+    asyncio.run(store.enqueue(_operation("a")))
+    asyncio.run(store.claim("w1", 10, now=1, lease_until=61))
+
+    asyncio.run(store.mark_retry("w1", "a", "503", next_attempt_at=10))
+
+    assert asyncio.run(store.claim("w1", 10, now=5, lease_until=65)) == []
+    claimed = asyncio.run(store.claim("w1", 10, now=10, lease_until=70))
+    assert claimed[0].attempts == 1
+
+
+def test_waiting_session_is_resumed_for_its_owner_only(store):
+    asyncio.run(store.enqueue(_operation("a", owner="ana")))
+    asyncio.run(store.enqueue(_operation("b", owner="luis")))
+    asyncio.run(store.claim("w1", 10, now=1, lease_until=61))
+    asyncio.run(store.mark_waiting_session("w1", "a", "sin sesión"))
+    asyncio.run(store.mark_waiting_session("w1", "b", "sin sesión"))
+
+    assert asyncio.run(store.resume_waiting("ana", now=2)) == 1
+
+    resumed = asyncio.run(store.get("a"))
+    assert resumed.status == PENDING
+    assert resumed.attempts == 0
+    assert asyncio.run(store.get("b")).status == WAITING_SESSION
+
+
+class FakeService:
+    """Servicio que falla con los errores indicados antes de completar la tarea."""
+
+    def __init__(
+        self,
+        errors: List[Exception],
+        *,
+        completes_on_error: bool = False,
+    ) -> None:
+        self.errors = list(errors)
+        self.completes_on_error = completes_on_error
+        self.completed = False
+        self.calls = 0
+
+    async def completar_tarea(self, task_id, *, contract_inputs=None, variables=None):
+        self.calls += 1
+        if self.errors:
+            if self.completes_on_error:
+                self.completed = True
+            raise self.errors.pop(0)
+        self.completed = True
+
+    async def tarea_completada(self, task_id) -> bool:
+        return self.completed
+
+
+def _run_queue(store, service: Optional[FakeService], factory_error=None):
+    async def factory(owner):
+        if factory_error is not None:
+            raise factory_error
+        return service
+
+    async def scenario():
+        queue = TaskCompletionQueue(
+            store,
+            factory,
+            is_retryable=is_transient_bonita_error,
+            is_unsent=is_unsent_bonita_error,
+            is_session_error=is_bonita_session_error,
+            max_attempts=3,
+            retry_base_seconds=0.01,
+            poll_seconds=0.01,
+        )
+        operation = await queue.encolar("ana", TaskCompletion(task_id="7"))
+        worker = asyncio.create_task(queue.run())
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            current = await queue.obtener(operation.operation_id)
+            if current.status not in (PENDING, RUNNING):
+                break
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        return await queue.obtener(operation.operation_id), queue
+
+    return asyncio.run(scenario())
+
+
+def test_queue_completes_the_task(store):
+    service = FakeService([])
+
+    operation, queue = _run_queue(store, service)
+
+    assert operation.status == SUCCEEDED
+    assert service.calls == 1
+    assert queue.stats()["succeeded"] == 1
+
+
+def test_queue_retries_errors_that_never_reached_bonita(store):
+    service = FakeService(
+        [BonitaClientError("sin conexión", details={"error_type": "ConnectError"})]
+    )
+
+    operation, queue = _run_queue(store, service)
+
+    assert operation.status == SUCCEEDED
+    assert service.calls == 2
+    assert queue.stats()["retries"] == 1
+
+
+def test_queue_does_not_repeat_a_completion_that_reached_bonita(store):
+    service = FakeService(
+        [BonitaClientError("timeout", details={"error_type": "ReadTimeout"})],
+        completes_on_error=True,
+    )
+
+    operation, _ = _run_queue(store, service)
+
+    assert operation.status == SUCCEEDED
+    assert service.calls == 1
+
+
+def test_queue_gives_up_after_max_attempts(store):
+    service = FakeService(
+        [BonitaClientError("no disponible", details={"status_code": 503})] * 5
+    )
+
+    operation, queue = _run_queue(store, service)
+
+    assert operation.status == FAILED
+    assert operation.attempts == 3
+    assert queue.stats()["failed"] == 1
+
+
+def test_queue_fails_definitive_errors_without_retrying(store):
+    service = FakeService(
+        [BonitaClientError("contrato inválido", details={"status_code": 400})]
+    )
+
+    operation, queue = _run_queue(store, service)
+
+    assert operation.status == FAILED
+    assert service.calls == 1
+    assert queue.stats()["retries"] == 0
+
+
+def test_queue_parks_operations_without_a_session(store):
+    error = BonitaAuthenticationError(
+        "sin sesión", details={"status_code": 401, "reason": "session_not_found"}
+    )
+
+    operation, queue = _run_queue(store, None, factory_error=error)
+
+    assert operation.status == WAITING_SESSION
+    assert operation.attempts == 0
+    assert queue.stats()["waiting_session"] == 1
+
+
+class EmptyStore:
+    async def claim(self, worker_id, limit, now, lease_until):
+        return []
+
+    async def renew(self, worker_id, operation_ids, lease_until):
+        pass
+
+    async def release(self, worker_id, operation_ids):
+        pass
+
+
+def test_queue_stops_when_cancelled_while_being_woken():
+    async def factory(owner):
+        raise AssertionError("no hay operaciones")
+
+    async def scenario():
+        queue = TaskCompletionQueue(
+            EmptyStore(),
+            factory,
+            is_retryable=lambda exc: False,
+            is_unsent=lambda exc: False,
+            is_session_error=lambda exc: False,
+            poll_seconds=10,
+        )
+        worker = asyncio.create_task(queue.run())
+        await asyncio.sleep(0.01)
+        # La cancelación llega en el mismo ciclo en que se despierta el bucle.
+        queue._wake.set()
+        await asyncio.sleep(0)
+        worker.cancel()
+        done, _ = await asyncio.wait({worker}, timeout=1)
+        return worker in done
+
+    assert asyncio.run(scenario())
+
+
+def test_concurrent_enqueues_keep_a_single_operation(tmp_path):
+    path = str(tmp_path / "operations.sqlite3")
+    stores = [SqliteTaskOperationStore(path) for _ in range(8)]
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                store.enqueue(_operation(f"op{index}"))
+                for index, store in enumerate(stores)
+            )
+        )
+
+    operations = asyncio.run(scenario())
+
+    assert len({operation.operation_id for operation in operations}) == 1
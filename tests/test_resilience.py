@@ -0,0 +1,176 @@
+from app.core.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+)
+from app.infrastructure.bonita.guards import (
+    ConcurrencyLimiterRegistry,
+    endpoint_family,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=3, recovery_seconds=10, half_open_max_calls=1, clock=clock
+    )
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = _breaker(FakeClock())
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejections"] == 1
+
+
+def test_breaker_success_resets_the_failure_count():
+    breaker = _breaker(FakeClock())
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_admits_one_trial_and_closes_on_success():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == 10
+
+
+def test_breaker_late_success_does_not_close_an_open_breaker():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    # Respuesta de una llamada admitida antes de abrirse el circuito.
+    breaker.record_success()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["successes"] == 1
+
+
+def test_breaker_ignored_call_frees_the_trial_slot():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.record_ignored()
+
+    assert breaker.allow()
+
+
+def _limiter() -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        min_limit=2, max_limit=10, latency_target_seconds=1.0
+    )
+
+
+def test_limiter_starts_at_max_and_sheds_beyond_it():
+    limiter = _limiter()
+
+    assert all(limiter.try_acquire() for _ in range(10))
+    assert not limiter.try_acquire()
+    assert limiter.stats()["shed"] == 1
+
+
+def test_limiter_only_decreases_on_slow_responses():
+    limiter = _limiter()
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release(0.1)
+    assert limiter.limit == 10
+
+    limiter.try_acquire()
+    limiter.release(5.0)
+
+    assert limiter.limit == 9
+    assert limiter.stats()["decreases"] == 1
+
+
+def test_limiter_never_goes_below_min_and_recovers():
+    limiter = _limiter()
+    for _ in range(50):
+        limiter.try_acquire()
+        limiter.release(5.0)
+    assert limiter.limit == 2
+
+    for _ in range(50):
+        limiter.try_acquire()
+        limiter.release(0.1)
+
+    assert limiter.limit > 2
+
+
+def test_slow_writes_do_not_lower_the_read_limit():
+    limiters = ConcurrencyLimiterRegistry(
+        min_limit=2, max_limit=10, latency_target_seconds=1.0
+    )
+    writes = limiters.get(endpoint_family("/API/bpm/userTask/1/execution", "POST"))
+    for _ in range(50):
+        writes.try_acquire()
+        writes.release(5.0)
+
+    reads = limiters.get(endpoint_family("/API/bpm/userTask"))
+
+    assert writes.limit == 2
+    assert reads.limit == 10
+    assert reads is limiters.get("bpm/userTask")
+
+
+def test_endpoint_family_separates_reads_from_writes_and_actions():
+    assert endpoint_family("/API/bpm/userTask") == "bpm/userTask"
+    assert endpoint_family("/API/bpm/case/12") == "bpm/case"
+    assert (
+        endpoint_family("/API/bpm/userTask/12/execution", "post")
+        == "POST bpm/userTask/execution"
+    )
+    assert endpoint_family("/API/bpm/humanTask/12", "PUT") == "PUT bpm/humanTask"
+    assert endpoint_family("/API/bpm/userTask/12/execution", "POST") != (
+        endpoint_family("/API/bpm/userTask")
+    )
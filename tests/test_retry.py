@@ -0,0 +1,25 @@
+from app.core.retry import RetryBudget
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_retry_budget_allows_minimum_plus_ratio_per_window():
+    clock = FakeClock()
+    budget = RetryBudget(
+        ratio=0.5, min_retries_per_second=0.1, window_seconds=10, clock=clock
+    )
+    for _ in range(4):
+        budget.record_request()
+
+    # 0.1 * 10 + 0.5 * 4 = 3 reintentos en la ventana.
+    assert [budget.try_withdraw("503") for _ in range(4)] == [True, True, True, False]
+    assert budget.stats()["budget_rejections"] == 1
+
+    clock.now = 11
+    assert budget.try_withdraw("503")
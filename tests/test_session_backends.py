@@ -0,0 +1,126 @@
+import dataclasses
+import os
+import sqlite3
+import stat
+from typing import Dict, Optional, Tuple
+
+import pytest
+
+from app.config import get_settings
+from app.core.session_backends import (
+    RedisSessionBackend,
+    SessionRecord,
+    SqliteSessionBackend,
+    build_session_backend,
+)
+
+
+class FakeRedis:
+    """Sustituto en memoria de `redis.Redis` con la interfaz que usa el backend."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.data.get(key)
+        if value is None:
+            return None
+        payload, expires_at = value
+        if expires_at is not None and expires_at <= self.now:
+            del self.data[key]
+            return None
+        return payload
+
+    def set(self, key: str, value: str, ex: Optional[float] = None) -> None:
+        expires_at = self.now + ex if ex is not None else None
+        self.data[key] = (value.encode(), expires_at)
+
+    def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+
+def _record(username: str = "ana") -> SessionRecord:
+    return SessionRecord(
+        username=username,
+        base_url="http://bonita/bonita",
+        state={"cookies": {"JSESSIONID": "abc"}, "csrf_token": "tok"},
+    )
+
+
+def test_redis_backend_round_trip_with_stand_in():
+    redis = FakeRedis()
+    backend = RedisSessionBackend(client=redis)
+
+    backend.save(_record(), ttl_seconds=60)
+    loaded = backend.load("ana")
+
+    assert loaded is not None
+    assert loaded.state == _record().state
+    assert backend.load("otro") is None
+
+    backend.delete("ana")
+    assert backend.load("ana") is None
+
+
+def test_redis_backend_expires_with_ttl():
+    redis = FakeRedis()
+    backend = RedisSessionBackend(client=redis)
+    backend.save(_record(), ttl_seconds=60)
+
+    redis.now = 61
+
+    assert backend.load("ana") is None
+
+
+def test_sqlite_backend_round_trip_and_expiry(tmp_path):
+    backend = SqliteSessionBackend(str(tmp_path / "sessions.sqlite3"))
+
+    backend.save(_record(), ttl_seconds=60)
+    assert backend.load("ana").state == _record().state
+
+    backend.save(_record(), ttl_seconds=-1)
+    assert backend.load("ana") is None
+
+
+def test_sqlite_backend_closes_its_connections(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        connection = connect(*args, **kwargs)
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    backend = SqliteSessionBackend(str(tmp_path / "sessions.sqlite3"))
+    backend.save(_record(), ttl_seconds=60)
+    backend.load("ana")
+
+    for connection in opened:
+        try:
+            connection.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            continue
+        raise AssertionError("La conexión sigue abierta.")
+
+
+def test_sqlite_backend_requires_an_explicit_path():
+    settings = dataclasses.replace(
+        get_settings(), session_backend="sqlite", session_backend_url=None
+    )
+
+    with pytest.raises(RuntimeError, match="SESSION_BACKEND_URL"):
+        build_session_backend(settings)
+
+
+def test_sqlite_backend_file_is_only_readable_by_its_owner(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    settings = dataclasses.replace(
+        get_settings(), session_backend="sqlite", session_backend_url=path
+    )
+
+    backend = build_session_backend(settings)
+    backend.save(_record(), ttl_seconds=60)
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
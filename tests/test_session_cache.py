@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from app.core.session_cache import SessionStore
+from app.infrastructure.bonita.async_client import AsyncBonitaClient
+
+
+def _client(username: str = "ana") -> AsyncBonitaClient:
+    return AsyncBonitaClient("http://bonita/bonita", username, "secreto")
+
+
+def test_session_store_evicts_least_recently_used():
+    store = SessionStore(max_size=2, idle_ttl_seconds=60)
+    first, second, third = _client("a"), _client("b"), _client("c")
+    store.set("a", first)
+    store.set("b", second)
+    store.get("a")
+    store.set("c", third)
+
+    assert store.get("b") is None
+    assert store.get("a") is first
+    assert store.stats()["evictions"] == 1
+
+
+def test_session_store_expires_idle_sessions():
+    now = [0.0]
+    store = SessionStore(max_size=10, idle_ttl_seconds=30, clock=lambda: now[0])
+    store.set("ana", _client())
+
+    now[0] = 31
+
+    assert store.purge_expired() == 1
+    assert store.get("ana") is None
+
+
+def test_session_store_remove_only_deletes_the_expected_client():
+    store = SessionStore(max_size=10, idle_ttl_seconds=60)
+    old, new = _client(), _client()
+    store.set("ana", old)
+    store.set("ana", new)
+
+    assert store.remove("ana", client=old) is None
+    assert store.get("ana") is new
+    assert store.remove("ana", client=new) is new
+    assert store.get("ana") is None
+
+
+def test_session_store_reap_closes_replaced_clients():
+    store = SessionStore(max_size=10, idle_ttl_seconds=60, logout_on_evict=False)
+    old = _client()
+    store.set("ana", old)
+    store.set("ana", _client())
+
+    asyncio.run(store.reap())
+
+    assert old.http.is_closed
+    assert store.stats()["logouts"] == 1
+
+
+def test_session_store_reap_waits_until_replaced_clients_are_unused():
+    store = SessionStore(
+        max_size=10, idle_ttl_seconds=60, logout_on_evict=False, close_grace_seconds=120
+    )
+    old = _client()
+    store.set("ana", old)
+    # Una petición iniciada antes del nuevo login sigue usando el cliente.
+    old.active_requests = 1
+    old.last_used_at -= 300
+    store.set("ana", _client())
+
+    asyncio.run(store.reap())
+    assert not old.http.is_closed
+
+    old.active_requests = 0
+    old.last_used_at = time.monotonic()
+    asyncio.run(store.reap())
+    assert not old.http.is_closed
+    assert store.stats()["pending_logouts"] == 1
+
+    old.last_used_at -= 120
+    asyncio.run(store.reap())
+    assert old.http.is_closed
+    assert store.stats()["pending_logouts"] == 0
+
+
+def test_session_store_forced_reap_closes_clients_in_use():
+    store = SessionStore(
+        max_size=10, idle_ttl_seconds=60, logout_on_evict=False, close_grace_seconds=120
+    )
+    old = _client()
+    store.set("ana", old)
+    old.active_requests = 1
+    store.set("ana", _client())
+
+    asyncio.run(store.reap(force=True))
+
+    assert old.http.is_closed
@@ -0,0 +1,45 @@
+from app.domain.contratos.entities import ContractTask
+from app.domain.contratos.sincronizacion import take_task_snapshot, tasks_changed_since
+
+
+def _task(task_id: str, updated: str = "1", state: str = "ready") -> ContractTask:
+    return ContractTask(
+        id=task_id,
+        name="tarea",
+        display_name="Tarea",
+        state=state,
+        last_update_date=updated,
+    )
+
+
+QUERY = ("ana", "ready", None)
+
+
+def test_token_is_deterministic_for_the_same_query_and_tasks():
+    first = take_task_snapshot(QUERY, [_task("1"), _task("2")])
+    second = take_task_snapshot(QUERY, [_task("2"), _task("1")])
+
+    assert first.token == second.token
+    other_user = take_task_snapshot(("luis", "ready", None), [_task("1"), _task("2")])
+    assert other_user.token != first.token
+    assert take_task_snapshot(QUERY, [_task("1", updated="2"), _task("2")]).token != (
+        first.token
+    )
+
+
+def test_changes_since_reports_new_modified_and_removed_tasks():
+    previous = take_task_snapshot(QUERY, [_task("1"), _task("2"), _task("3")])
+
+    changed, removed = tasks_changed_since(
+        previous,
+        [_task("1"), _task("2", state="executing"), _task("4")],
+    )
+
+    assert [task.id for task in changed] == ["2", "4"]
+    assert removed == ["3"]
+
+
+def test_changes_since_is_empty_without_changes():
+    tasks = [_task("1"), _task("2")]
+
+    assert tasks_changed_since(take_task_snapshot(QUERY, tasks), tasks) == ([], [])
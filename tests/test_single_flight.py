@@ -0,0 +1,24 @@
+import asyncio
+
+from app.core.single_flight import SingleFlight
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    calls = []
+
+    async def scenario():
+        flight: SingleFlight[int] = SingleFlight()
+
+        async def factory() -> int:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flight.do("k", factory) for _ in range(5)))
+        return results, flight.stats()
+
+    results, stats = asyncio.run(scenario())
+
+    assert results == [42] * 5
+    assert len(calls) == 1
+    assert stats == {"leaders": 1, "coalesced": 4, "in_flight": 0}